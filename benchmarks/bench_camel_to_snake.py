@@ -0,0 +1,71 @@
+"""
+Microbenchmark of the camelCase to snake_case conversion of response keys.
+
+Compares the per-key cost of 'types._camel_to_snake' with the original
+implementation (three uncompiled re.sub passes per key), over the keys of
+typical Smartcar responses.
+
+    python -m benchmarks.bench_camel_to_snake
+"""
+
+import re
+import timeit
+
+import smartcar.types as types
+
+# Keys of typical responses, and of a brand-specific payload
+KEYS = [
+    "distance",
+    "percentRemaining",
+    "range",
+    "isPluggedIn",
+    "state",
+    "latitude",
+    "longitude",
+    "frontLeft",
+    "frontRight",
+    "backLeft",
+    "backRight",
+    "lifeRemaining",
+    "amountRemaining",
+    "capacity",
+    "vehicleId",
+    "connectedAt",
+    "odometerDistance",
+    "serviceDate",
+    "tire2Pressure",
+    "evChargingKWhDelivered",
+]
+
+NUMBER = 20000
+
+
+def original_camel_to_snake(camel_string: str) -> str:
+    result = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", camel_string)
+    result = re.sub("(.)([0-9]+)", r"\1_\2", result)
+    result = re.sub("([a-z0-9])([A-Z])", r"\1_\2", result)
+    return result.lower()
+
+
+def per_key_ns(convert) -> float:
+    def run():
+        for key in KEYS:
+            convert(key)
+
+    best = min(timeit.repeat(run, number=NUMBER, repeat=5))
+    return best / (NUMBER * len(KEYS)) * 1e9
+
+
+def main():
+    for key in KEYS:
+        assert types._camel_to_snake(key) == original_camel_to_snake(key), key
+
+    before = per_key_ns(original_camel_to_snake)
+    after = per_key_ns(types._camel_to_snake)
+    print(f"keys: {len(KEYS)}, conversions per run: {NUMBER * len(KEYS)}")
+    print(f"before: {before:8.1f} ns/key")
+    print(f"after:  {after:8.1f} ns/key ({before / after:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Memory benchmark of 'smartcar.compact' records.
+
+Measures the memory held by the latest Battery, Charge, Location, Odometer,
+TirePressure and LockStatus of many vehicles, kept as the NamedTuples returned
+by the SDK and as compact records.
+
+    python -m benchmarks.bench_compact_memory [vehicles]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+import requests.structures as rs
+
+import smartcar.compact as compact
+import smartcar.types as types
+
+VEHICLES = 20000
+
+OPENINGS = ["frontLeft", "frontRight", "backLeft", "backRight"]
+
+
+def response_headers(i: int, path: str) -> rs.CaseInsensitiveDict:
+    # Every response has its own request id, so metas are not shared
+    return rs.CaseInsensitiveDict(
+        {
+            "Content-Type": "application/json; charset=utf-8",
+            "Date": "Thu, 04 May 2023 07:20:51 GMT",
+            "sc-request-id": f"36ab27d0-fd9d-4455-{path[:4]}-{i:012d}",
+            "sc-unit-system": "metric",
+            "sc-data-age": "2023-05-04T07:20:50.844Z",
+            "sc-fetched-at": "2023-05-04T07:20:51.844Z",
+        }
+    )
+
+
+def decode(path: str, body: dict, i: int):
+    # Decoded per response, as the SDK does, so no strings are shared up front
+    body = {key: value for key, value in body.items()}
+    return types.select_named_tuple(
+        path, {"body": body, "headers": dict(response_headers(i, path))}
+    )
+
+
+def fleet_state(i: int) -> list:
+    openings = [
+        {"type": "".join(opening), "status": "".join(["CLO", "SED"])}
+        for opening in OPENINGS
+    ]
+    return [
+        decode("battery", {"percentRemaining": 0.5 + i % 50 / 100, "range": 300.5}, i),
+        decode(
+            "charge", {"isPluggedIn": i % 2 == 0, "state": "".join(["CHAR", "GING"])}, i
+        ),
+        decode("location", {"latitude": 37.4 + i / 1e6, "longitude": -122.1}, i),
+        decode("odometer", {"distance": 10000.0 + i}, i),
+        decode(
+            "tires/pressure",
+            {
+                "frontLeft": 219.3,
+                "frontRight": 219.3,
+                "backLeft": 219.3,
+                "backRight": 219.3,
+            },
+            i,
+        ),
+        decode(
+            "security",
+            {
+                "isLocked": True,
+                "doors": openings,
+                "windows": [dict(opening) for opening in openings],
+                "sunroof": [],
+                "storage": [],
+                "chargingPort": [],
+            },
+            i,
+        ),
+    ]
+
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    state = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del state
+    return size
+
+
+def main():
+    vehicles = int(sys.argv[1]) if len(sys.argv) > 1 else VEHICLES
+
+    def named_tuples():
+        return [fleet_state(i) for i in range(vehicles)]
+
+    def compact_records():
+        pool = compact.CompactPool()
+        return [
+            [compact.to_compact(result, pool) for result in fleet_state(i)]
+            for i in range(vehicles)
+        ]
+
+    before = measure(named_tuples)
+    after = measure(compact_records)
+    print(f"vehicles: {vehicles}, results per vehicle: 6")
+    print(f"named tuples: {before / vehicles:8.0f} bytes/vehicle")
+    print(
+        f"compact:      {after / vehicles:8.0f} bytes/vehicle "
+        f"({before / after:.1f}x smaller)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -36,8 +36,11 @@ setup(
         "requests",
     ],
     extras_require={
+        "http2": ["httpx[http2]"],
+        "fast-json": ["orjson"],
         "dev": [
             "black",
+            "httpx[http2]",
             "ipdb",
             "mock",
             "responses",
@@ -46,6 +49,6 @@ setup(
             "selenium",
             "retrying",
             "wheel",
-        ]
+        ],
     },
 )
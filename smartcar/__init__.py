@@ -2,18 +2,79 @@ __version__ = "0.0.0"
 
 from smartcar.auth_client import AuthClient
 
-from smartcar.exception import SmartcarException
+from smartcar.exception import (
+    SmartcarException,
+    SmartcarTimeoutException,
+    SmartcarRateLimitException,
+    AuthenticationError,
+    PermissionDeniedError,
+    ResourceNotFoundError,
+    VehicleStateError,
+    RateLimitError,
+    BillingError,
+    ServerError,
+    CompatibilityError,
+    UpstreamError,
+)
+
+from smartcar.session import configure_session
+
+from smartcar.codec import JsonCodec, get_json_codec, set_json_codec
+
+from smartcar.coalesce import get_coalescing, set_coalescing
+
+from smartcar.cache import CacheStats, ResponseCache, max_age
+
+from smartcar.autobatch import AutoBatcher
+
+from smartcar.retry import RetryPolicy, get_retry_policy, set_retry_policy
+
+from smartcar.ratelimit import RateLimiter, get_rate_limiter, set_rate_limiter
+
+from smartcar.timeouts import deadline, get_default_timeout, set_default_timeout
+
+from smartcar.transport import (
+    Transport,
+    TransportResponse,
+    RequestsTransport,
+    HttpxTransport,
+    get_transport,
+    set_transport,
+    AsyncTransport,
+    HttpxAsyncTransport,
+    get_async_transport,
+    set_async_transport,
+    aclose_default_transports,
+)
 
 from smartcar.smartcar import (
     get_user,
     get_vehicles,
+    iter_vehicles,
     get_compatibility,
     hash_challenge,
     get_api_version,
     set_api_version,
     verify_payload,
     get_connections,
+    iter_connections,
     delete_connections,
 )
 
+from smartcar.types import BatchResult, RawResponse, field_decoder, register_decoder
+
+from smartcar.tokens import TokenManager
+
 from smartcar.vehicle import Vehicle
+
+from smartcar.aio import AsyncVehicle, AsyncAuthClient
+
+from smartcar.fleet import Fleet, FleetProgress, FleetResult, FleetRun
+
+from smartcar.compatibility import (
+    CompatibilityChecker,
+    CompatibilityResult,
+    VinPrefixCache,
+)
+
+from smartcar.compact import CompactPool, to_compact
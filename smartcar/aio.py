@@ -0,0 +1,697 @@
+import operator
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Union
+
+import smartcar.coalesce as coalesce
+import smartcar.config as config
+import smartcar.helpers as helpers
+import smartcar.pagination as pagination
+import smartcar.ratelimit as ratelimit
+import smartcar.smartcar
+import smartcar.types as types
+from smartcar.auth_client import AuthClient, _format_access, _token_params
+from smartcar.vehicle import Vehicle
+
+# asyncio versions of the Smartcar API methods.
+#
+# Everything in this module mirrors its synchronous counterpart (same
+# arguments, same NamedTuples, same SmartcarExceptions), but is a coroutine
+# sent with the active AsyncTransport. Requests are decoded with the same
+# 'types.select_named_tuple' as the synchronous SDK.
+#
+# Requires the optional dependencies: pip install "smartcar[http2]"
+
+
+class AsyncVehicle(Vehicle):
+    """
+    asyncio version of `smartcar.Vehicle`. Takes the same arguments, and every
+    request method is a coroutine returning the same NamedTuple.
+    """
+
+    async def vin(self, raw: bool = None) -> types.Vin:
+        """
+        GET Vehicle.vin
+
+        Returns:
+            Vin
+        """
+        return await self._get("vin", raw=raw)
+
+    async def charge(self, raw: bool = None) -> types.Charge:
+        """
+        GET Vehicle.charge
+
+        Returns:
+            Charge
+        """
+        return await self._get("charge", raw=raw)
+
+    async def battery(self, raw: bool = None) -> types.Battery:
+        """
+        GET Vehicle.battery
+
+        Returns:
+            Battery
+        """
+        return await self._get("battery", raw=raw)
+
+    async def battery_capacity(self, raw: bool = None) -> types.BatteryCapacity:
+        """
+        GET Vehicle.battery_capacity
+
+        Returns:
+            BatteryCapacity
+        """
+        return await self._get("battery/capacity", raw=raw)
+
+    async def nominal_capacity(self, raw: bool = None) -> types.NominalCapcity:
+        """
+        GET Vehicle.nominal_capacity
+
+        Returns:
+            NominalCapcity
+        """
+        return await self._get("battery/nominal_capacity", raw=raw)
+
+    async def fuel(self, raw: bool = None) -> types.Fuel:
+        """
+        GET Vehicle.fuel
+
+        Returns:
+            Fuel
+        """
+        return await self._get("fuel", raw=raw)
+
+    async def tire_pressure(self, raw: bool = None) -> types.TirePressure:
+        """
+        GET Vehicle.tire_pressure
+
+        Returns:
+            TirePressure
+        """
+        return await self._get("tires/pressure", raw=raw)
+
+    async def engine_oil(self, raw: bool = None) -> types.EngineOil:
+        """
+        GET Vehicle.engine_oil
+
+        Returns:
+            EngineOil
+        """
+        return await self._get("engine/oil", raw=raw)
+
+    async def odometer(self, raw: bool = None) -> types.Odometer:
+        """
+        GET Vehicle.odometer
+
+        Returns:
+            Odometer
+        """
+        return await self._get("odometer", raw=raw)
+
+    async def service_history(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        raw: bool = None,
+    ) -> types.ServiceHistory:
+        """
+        GET Vehicle.service_history
+
+        Args:
+            start_date (Optional[str]): 'YYYY-MM-DD' or 'YYYY-MM-DDTHH:MM:SS.SSSZ'
+            end_date (Optional[str]): similar format to start_date.
+
+        Returns:
+            ServiceHistory
+        """
+        params = {}
+        if start_date:
+            params["startDate"] = start_date
+        if end_date:
+            params["endDate"] = end_date
+
+        return await self._get("service/history", params, raw=raw)
+
+    def iter_service_history(
+        self,
+        start_date: str,
+        end_date: Optional[str] = None,
+        window_days: int = 365,
+    ) -> AsyncIterator[types.ServiceRecord]:
+        """
+        asyncio version of `Vehicle.iter_service_history`
+
+        Returns:
+            AsyncIterator[ServiceRecord]
+        """
+        windows = self._service_history_windows(start_date, end_date, window_days)
+        return self._iter_service_history(windows)
+
+    async def _iter_service_history(
+        self, windows: list
+    ) -> AsyncIterator[types.ServiceRecord]:
+        for window_start, window_end in windows:
+            history = await self.service_history(window_start, window_end)
+            for record in history.items:
+                yield record
+
+    async def diagnostic_system_status(
+        self, raw: bool = None
+    ) -> types.DiagnosticSystemStatus:
+        """
+        GET Vehicle.diagnostic_system_status
+
+        Returns:
+            DiagnosticSystemStatus
+        """
+        return await self._get("diagnostics/system_status", raw=raw)
+
+    async def diagnostic_trouble_codes(
+        self, raw: bool = None
+    ) -> types.DiagnosticTroubleCodes:
+        """
+        GET Vehicle.diagnostic_trouble_codes
+
+        Returns:
+            DiagnosticTroubleCodes
+        """
+        return await self._get("diagnostics/dtcs", raw=raw)
+
+    async def location(self, raw: bool = None) -> types.Location:
+        """
+        GET Vehicle.location
+
+        Returns:
+            Location
+        """
+        return await self._get("location", raw=raw)
+
+    async def permissions(
+        self,
+        paging: dict = None,
+        raw: bool = None,
+        fetch_all: bool = False,
+        max_concurrency: int = pagination._FETCH_ALL_CONCURRENCY,
+    ) -> types.Permissions:
+        """
+        GET Vehicle.permissions
+
+        Args:
+            paging (dict, optional): Can contain "limit" or "offset"
+
+            fetch_all (bool, optional): see `Vehicle.permissions`
+
+            max_concurrency (int, optional): see `Vehicle.permissions`
+
+        Returns:
+            Permissions
+        """
+        if fetch_all:
+            first, permissions = await pagination.afetch_all(
+                lambda page_paging: self.permissions(page_paging, raw=False),
+                operator.attrgetter("permissions"),
+                paging or {},
+                max_concurrency,
+            )
+            return first._replace(permissions=permissions)
+
+        return await self._get("permissions", self._permissions_params(paging), raw=raw)
+
+    def iter_permissions(
+        self, limit: int = 25, prefetch: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        asyncio version of `Vehicle.iter_permissions`
+
+        Returns:
+            AsyncIterator[str]
+        """
+        return pagination.aiter_items(
+            lambda paging: self.permissions(paging, raw=False),
+            operator.attrgetter("permissions"),
+            pagination.next_offset,
+            {"limit": limit, "offset": 0},
+            prefetch,
+        )
+
+    async def attributes(self, raw: bool = None) -> types.Attributes:
+        """
+        GET Vehicle.attributes
+
+        Returns:
+            Attributes
+        """
+        return await self._get("", raw=raw)
+
+    async def get_charge_limit(self, raw: bool = None) -> types.ChargeLimit:
+        """
+        GET Vehicle.get_charge_limit
+
+        Returns:
+            ChargeLimit
+        """
+        return await self._get("charge/limit", raw=raw)
+
+    async def lock_status(self, raw: bool = None) -> types.LockStatus:
+        """
+        GET Vehicle.lock_status
+
+        Returns:
+            LockStatus
+        """
+        return await self._get("security", raw=raw)
+
+    # ===========================================
+    # Action (POST) Requests
+    # ===========================================
+
+    async def lock(self) -> types.Action:
+        """
+        POST Vehicle.lock
+
+        Returns:
+            Action
+        """
+        return await self._action("security", {"action": "LOCK"}, "lock")
+
+    async def unlock(self) -> types.Action:
+        """
+        POST Vehicle.unlock
+
+        Returns:
+            Action
+        """
+        return await self._action("security", {"action": "UNLOCK"}, "unlock")
+
+    async def start_charge(self) -> types.Action:
+        """
+        POST Vehicle.start_charge
+
+        Returns:
+            Action
+        """
+        return await self._action("charge", {"action": "START"}, "start_charge")
+
+    async def stop_charge(self) -> types.Action:
+        """
+        POST Vehicle.stop_charge
+
+        Returns:
+            Action
+        """
+        return await self._action("charge", {"action": "STOP"}, "stop_charge")
+
+    async def set_charge_limit(self, limit) -> types.Action:
+        """
+        POST Vehicle.set_charge_limit
+
+        Returns:
+            Action
+        """
+        return await self._action("charge/limit", {"limit": limit}, "set_charge_limit")
+
+    async def send_destination(self, latitude, longitude) -> types.Action:
+        """
+        POST Vehicle.send_destination
+
+        Returns:
+            Action
+        """
+        return await self._action(
+            "navigation/destination",
+            {"latitude": latitude, "longitude": longitude},
+            "send_destination",
+        )
+
+    async def batch(self, paths: List[str], raw: bool = None) -> types.BatchResult:
+        """
+        POST Vehicle.batch
+
+        Args:
+            paths (str[]): an array of paths to make the batch request to
+
+        Returns:
+            BatchResult: the same result as `Vehicle.batch`
+        """
+        await self._refresh_access_token()
+        url = self._format_url("batch")
+        headers = self._get_headers()
+        json_body = self._batch_body(paths)
+        response = await helpers.async_requester(
+            "POST",
+            url,
+            headers=headers,
+            json=json_body,
+            idempotent=True,
+            **self._request_options("batch"),
+        )
+        if self._raw_mode(raw):
+            return types.raw_response(response)
+        return Vehicle._batch_result(response)
+
+    # ===========================================
+    # DELETE requests
+    # ===========================================
+
+    async def disconnect(self) -> types.Status:
+        """
+        Disconnect this vehicle from the connected application.
+
+        Returns:
+            Status
+        """
+        await self._refresh_access_token()
+        url = self._format_url("application")
+        headers = self._get_headers(need_unit_system=False)
+        response = await helpers.async_requester(
+            "DELETE",
+            url,
+            headers=headers,
+            **self._request_options("application"),
+        )
+        return types.select_named_tuple("disconnect", response)
+
+    # ===========================================
+    # Webhook requests
+    # ===========================================
+
+    async def subscribe(self, webhook_id: str) -> types.Subscribe:
+        """
+        Subscribe a vehicle to a webhook
+
+        Returns:
+            Subscribe
+        """
+        return await self._action(f"webhooks/{webhook_id}", None, "subscribe")
+
+    async def unsubscribe(self, amt: str, webhook_id: str) -> types.Status:
+        """
+        Unsubscribe a vehicle from a webhook
+
+        Returns:
+            Status
+        """
+        url = self._format_url(f"webhooks/{webhook_id}")
+        headers = {"Authorization": f"Bearer {amt}"}
+        response = await helpers.async_requester(
+            "DELETE",
+            url,
+            headers=headers,
+            **self._request_options(f"webhooks/{webhook_id}"),
+        )
+        return types.select_named_tuple("unsubscribe", response)
+
+    # ===========================================
+    # General Purpose Request Method
+    # ===========================================
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        body: dict = {},
+        headers: dict = {},
+        raw: bool = None,
+    ) -> types.Response:
+        """
+        Make a request to any Smartcar endpoint, e.g. brand specific endpoints.
+
+        Returns:
+            Response
+        """
+        await self._refresh_access_token()
+        url = self._format_url(path)
+        headers = self._request_headers(headers)
+        response = await helpers.async_requester(
+            method,
+            url,
+            headers=headers,
+            json=body,
+            **self._request_options(path),
+        )
+        if self._raw_mode(raw):
+            return types.raw_response(response)
+        return types.select_named_tuple(types.request_path(path), response)
+
+    # ===========================================
+    # Private methods
+    # ===========================================
+
+    async def _get(
+        self, path: str, params: dict = None, raw: bool = None
+    ) -> NamedTuple:
+        await self._refresh_access_token()
+        raw = self._raw_mode(raw)
+        if self._cache is not None and not raw:
+            key = (self.vehicle_id,) + self._request_key("GET", path, params)
+            return await self._cache.async_get_or_load(
+                key, lambda: self._load(path, params)
+            )
+        return await self._load(path, params, raw)
+
+    async def _load(
+        self, path: str, params: dict = None, raw: bool = False
+    ) -> NamedTuple:
+        if self._coalescing():
+            key = self._request_key("GET", path, params) + (raw,)
+            return await coalesce.async_single_flight.do(
+                key, lambda: self._fetch(path, params, raw)
+            )
+        return await self._fetch(path, params, raw)
+
+    async def _fetch(
+        self, path: str, params: dict = None, raw: bool = False
+    ) -> NamedTuple:
+        if self._auto_batch is not None and params is None and not raw:
+            return await self._auto_batch.async_get(self, path)
+        return await self._send_get(path, params, raw)
+
+    async def _send_get(
+        self, path: str, params: dict = None, raw: bool = False
+    ) -> NamedTuple:
+        url = self._format_url(path)
+        headers = self._get_headers()
+        response = await helpers.async_requester(
+            "GET",
+            url,
+            headers=headers,
+            params=params,
+            **self._request_options(path),
+        )
+        if raw:
+            return types.raw_response(response)
+        return types.select_named_tuple(path, response)
+
+    async def _refresh_access_token(self) -> None:
+        # Refresh on the event loop, so that reading `access_token` afterwards
+        # never refreshes it synchronously
+        if self._token_manager is not None:
+            await self._token_manager.async_get(self._token_key)
+
+    async def _action(
+        self, path: str, body: Optional[dict], result_path: str
+    ) -> NamedTuple:
+        await self._refresh_access_token()
+        url = self._format_url(path)
+        headers = self._get_headers(need_unit_system=False)
+        response = await helpers.async_requester(
+            "POST",
+            url,
+            headers=headers,
+            json=body,
+            **self._request_options(path),
+        )
+        self._invalidate_cache()
+        return types.select_named_tuple(result_path, response)
+
+
+class AsyncAuthClient(AuthClient):
+    """
+    asyncio version of `smartcar.AuthClient`. Takes the same arguments;
+    `exchange_code` and `exchange_refresh_token` are coroutines.
+    """
+
+    async def exchange_code(self, code: str, options: dict = None) -> types.Access:
+        """
+        Exchange an authentication code for an access dictionary
+
+        Returns:
+            Access
+        """
+        data = {
+            "grant_type": "authorization_code",
+            "code": code,
+            "redirect_uri": self.redirect_uri,
+        }
+        response = await helpers.async_requester(
+            "POST",
+            config.AUTH_URL,
+            data=data,
+            auth=self.auth,
+            params=_token_params(options),
+            timeout=self.timeout,
+            rate_limit_keys=(ratelimit.app_key(self.client_id),),
+        )
+        return _format_access(response)
+
+    async def exchange_refresh_token(
+        self, refresh_token: str, options: dict = None
+    ) -> types.Access:
+        """
+        Exchange a refresh token for a new access dictionary
+
+        Returns:
+            Access
+        """
+        data = {"grant_type": "refresh_token", "refresh_token": refresh_token}
+        response = await helpers.async_requester(
+            "POST",
+            config.AUTH_URL,
+            data=data,
+            auth=self.auth,
+            params=_token_params(options),
+            timeout=self.timeout,
+            rate_limit_keys=(ratelimit.app_key(self.client_id),),
+        )
+        return _format_access(response)
+
+
+# ===========================================
+# Static methods
+# ===========================================
+
+
+async def get_user(access_token: str) -> types.User:
+    """
+    asyncio version of `smartcar.get_user`
+
+    Returns:
+        User
+    """
+    url = f"{config.API_URL}/v{smartcar.smartcar.get_api_version()}/user"
+    headers = {"Authorization": f"Bearer {access_token}"}
+    response = await helpers.async_requester(
+        "GET", url, headers=headers, rate_limit_keys=(ratelimit.app_key(),)
+    )
+
+    return types.select_named_tuple("user", response)
+
+
+async def get_vehicles(
+    access_token: str,
+    paging: dict = None,
+    fetch_all: bool = False,
+    max_concurrency: int = pagination._FETCH_ALL_CONCURRENCY,
+) -> types.Vehicles:
+    """
+    asyncio version of `smartcar.get_vehicles`
+
+    Returns:
+        Vehicles
+    """
+    if fetch_all:
+        first, vehicles = await pagination.afetch_all(
+            lambda page_paging: get_vehicles(access_token, page_paging),
+            operator.attrgetter("vehicles"),
+            paging or {},
+            max_concurrency,
+        )
+        return first._replace(vehicles=vehicles)
+
+    url = f"{config.API_URL}/v{smartcar.smartcar.get_api_version()}/vehicles"
+    headers = {"Authorization": f"Bearer {access_token}"}
+    response = await helpers.async_requester(
+        "GET",
+        url,
+        headers=headers,
+        params=paging,
+        rate_limit_keys=(ratelimit.app_key(),),
+    )
+
+    return types.select_named_tuple("vehicles", response)
+
+
+def iter_vehicles(
+    access_token: str, limit: int = 50, prefetch: bool = True
+) -> AsyncIterator[str]:
+    """
+    asyncio version of `smartcar.iter_vehicles`
+
+    Returns:
+        AsyncIterator[str]
+    """
+    return pagination.aiter_items(
+        lambda paging: get_vehicles(access_token, paging),
+        operator.attrgetter("vehicles"),
+        pagination.next_offset,
+        {"limit": limit, "offset": 0},
+        prefetch,
+    )
+
+
+async def get_compatibility(
+    vin: str, scope: List[str], country: str = "US", options: dict = None
+) -> Union[types.CompatibilityV1, types.CompatibilityV2]:
+    """
+    asyncio version of `smartcar.get_compatibility`
+
+    Returns:
+        CompatibilityV1 OR CompatibilityV2
+    """
+    request = smartcar.smartcar._compatibility_request(vin, scope, country, options)
+    url, headers, params, api_version, client_id = request
+    response = await helpers.async_requester(
+        "GET",
+        url,
+        headers=headers,
+        params=params,
+        rate_limit_keys=(ratelimit.app_key(client_id),),
+    )
+
+    return types.select_named_tuple(
+        smartcar.smartcar._compatibility_path(api_version), response
+    )
+
+
+async def get_connections(
+    amt: str,
+    filter: Optional[Dict[str, str]] = None,
+    paging: Optional[Dict[str, Optional[int]]] = None,
+) -> types.GetConnections:
+    """
+    asyncio version of `smartcar.get_connections`
+
+    Returns:
+        GetConnections
+    """
+    url, headers, params = smartcar.smartcar._connections_request(amt, filter, paging)
+    response = await helpers.async_requester(
+        "GET",
+        url,
+        headers=headers,
+        params=params,
+        rate_limit_keys=(ratelimit.app_key(),),
+    )
+
+    return smartcar.smartcar._format_connections(response)
+
+
+def iter_connections(
+    amt: str,
+    filter: Optional[Dict[str, str]] = None,
+    limit: Optional[int] = None,
+    prefetch: bool = True,
+) -> AsyncIterator[types.Connection]:
+    """
+    asyncio version of `smartcar.iter_connections`
+
+    Returns:
+        AsyncIterator[Connection]
+    """
+    return pagination.aiter_items(
+        lambda paging: get_connections(amt, filter, paging),
+        operator.attrgetter("connections"),
+        pagination.next_cursor,
+        {} if limit is None else {"limit": limit},
+        prefetch,
+    )
@@ -6,6 +6,7 @@ from warnings import warn
 
 import smartcar.config as config
 import smartcar.helpers as helpers
+import smartcar.ratelimit as ratelimit
 import smartcar.types as types
 
 
@@ -17,6 +18,7 @@ class AuthClient(object):
         redirect_uri=None,
         test_mode=None,
         mode="live",
+        timeout=None,
     ):
         """
         A client for accessing the Smartcar API.
@@ -45,11 +47,15 @@ class AuthClient(object):
 
             mode (str, optional): Determine what mode Smartcar Connect should be launched in.
                 Should be one of test, live or simulated. Defaults to live.
+
+            timeout (float | (float, float), optional): Connect and read timeout, in seconds,
+                of token requests. Defaults to the timeout set with `smartcar.set_default_timeout`.
         """
         self.client_id = client_id or os.environ.get("SMARTCAR_CLIENT_ID")
         self.client_secret = client_secret or os.environ.get("SMARTCAR_CLIENT_SECRET")
         self.redirect_uri = redirect_uri or os.environ.get("SMARTCAR_REDIRECT_URI")
         self.mode = mode.lower()
+        self.timeout = timeout
 
         if test_mode is not None:
             warn(
@@ -179,25 +185,21 @@ class AuthClient(object):
         Raises:
             SmartcarException
         """
-        method = "POST"
-        url = config.AUTH_URL
         data = {
             "grant_type": "authorization_code",
             "code": code,
             "redirect_uri": self.redirect_uri,
         }
-        params = {}
-
-        if options:
-            if options.get("flags"):
-                flags_str = helpers.format_flag_query(options["flags"])
-                params["flags"] = flags_str
-
         response = helpers.requester(
-            method, url, data=data, auth=self.auth, params=params
+            "POST",
+            config.AUTH_URL,
+            data=data,
+            auth=self.auth,
+            params=_token_params(options),
+            timeout=self.timeout,
+            rate_limit_keys=(ratelimit.app_key(self.client_id),),
         )
-        data = response.json()
-        return types.make_access_object(_set_expiration(data))
+        return _format_access(response)
 
     def exchange_refresh_token(
         self, refresh_token: str, options: dict = None
@@ -220,26 +222,38 @@ class AuthClient(object):
         Raises:
             SmartcarException
         """
-        method = "POST"
-        url = config.AUTH_URL
         data = {"grant_type": "refresh_token", "refresh_token": refresh_token}
-        params = {}
-
-        if options:
-            if options.get("flags"):
-                flags_str = helpers.format_flag_query(options["flags"])
-                params["flags"] = flags_str
-
         response = helpers.requester(
-            method, url, data=data, auth=self.auth, params=params
+            "POST",
+            config.AUTH_URL,
+            data=data,
+            auth=self.auth,
+            params=_token_params(options),
+            timeout=self.timeout,
+            rate_limit_keys=(ratelimit.app_key(self.client_id),),
         )
-        data = response.json()
-        return types.make_access_object(_set_expiration(data))
+        return _format_access(response)
 
 
 # Static helpers for AuthClient
 
 
+def _token_params(options: dict = None) -> dict:
+    params = {}
+
+    if options:
+        if options.get("flags"):
+            flags_str = helpers.format_flag_query(options["flags"])
+            params["flags"] = flags_str
+
+    return params
+
+
+def _format_access(response) -> types.Access:
+    data = response.json()
+    return types.make_access_object(_set_expiration(data))
+
+
 def _set_expiration(access: dict) -> dict:
     expire_date = datetime.utcnow() + timedelta(seconds=access["expires_in"])
     refresh_expire_date = datetime.utcnow() + timedelta(days=60)
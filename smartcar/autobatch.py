@@ -0,0 +1,200 @@
+import asyncio
+import threading
+import weakref
+from typing import Callable, Dict, NamedTuple, Optional
+
+import smartcar.coalesce as coalesce
+import smartcar.helpers as helpers
+import smartcar.timeouts as timeouts
+
+# Automatic batching of vehicle GETs.
+#
+# With an AutoBatcher, a getter (e.g. `odometer()`) does not send its request
+# right away: it waits up to `window` seconds for other getters of the same
+# vehicle (same vehicle id, access token, unit system, version and flags), and
+# all of them are then sent as a single POST /batch. Each caller receives the
+# NamedTuple of its own path, or the SmartcarException of its own path, as if it
+# had sent its request alone. A batch of a single path is sent as a plain GET.
+#
+# Threads wait for the window with the first caller's thread sending the batch;
+# asyncio tasks of the same event loop are batched by a callback scheduled on
+# the loop, so a window of 0 batches the getters called in the same tick.
+
+
+class AutoBatcher(object):
+    def __init__(self, window: float = 0.005, max_batch_size: Optional[int] = None):
+        """
+        Combines the getters called on a vehicle within a short window into one
+        batch request. Share one AutoBatcher between vehicles with the
+        `auto_batch` option of `smartcar.Vehicle`.
+
+        Args:
+            window (float, optional): Seconds to wait for other getters after the
+                first one
+
+            max_batch_size (int, optional): Send a batch as soon as it has this
+                many paths. None for no limit.
+        """
+        if window < 0:
+            raise ValueError("'window' must not be negative")
+        if max_batch_size is not None and max_batch_size < 1:
+            raise ValueError("'max_batch_size' must be at least 1")
+
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending = {}
+        self._pending_by_loop = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, vehicle, path: str) -> NamedTuple:
+        """
+        Args:
+            vehicle (Vehicle): the vehicle to send the GET to
+
+            path (str): path of the getter, e.g. "odometer"
+
+        Returns:
+            NamedTuple: the decoded response of `path`
+
+        Raises:
+            SmartcarException
+        """
+        key = vehicle._request_key("POST", "batch")
+        with self._lock:
+            batch = self._pending.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._pending[key] = _Batch()
+            self._add(key, batch, path, self._pending)
+
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._pending.get(key) is batch:
+                    del self._pending[key]
+            try:
+                batch.outcomes = self._send(vehicle, list(batch.paths))
+            except Exception as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+
+        elif not batch.done.wait(timeouts.remaining()):
+            raise timeouts.deadline_exceeded()
+
+        return batch.result(vehicle, path)
+
+    async def async_get(self, vehicle, path: str) -> NamedTuple:
+        """
+        asyncio version of `get`, for an AsyncVehicle
+        """
+        loop = asyncio.get_running_loop()
+        pending = self._pending_by_loop.setdefault(loop, {})
+        key = vehicle._request_key("POST", "batch")
+
+        batch = pending.get(key)
+        if batch is None:
+            batch = pending[key] = _Batch(loop.create_future())
+            batch.timer = loop.call_later(
+                self.window, self._async_flush, vehicle, key, batch, pending
+            )
+        if self._add(key, batch, path, pending):
+            batch.timer.cancel()
+            self._async_flush(vehicle, key, batch, pending)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(batch.future), timeouts.remaining())
+        except asyncio.TimeoutError:
+            raise timeouts.deadline_exceeded() from None
+
+        return await batch.async_result(vehicle, path)
+
+    def _add(self, key: tuple, batch: "_Batch", path: str, pending: dict) -> bool:
+        """
+        Add `path` to an open batch.
+
+        Returns (bool): True if the batch became full, and was closed
+        """
+        batch.paths[path] = None
+        if self.max_batch_size is None or len(batch.paths) < self.max_batch_size:
+            return False
+
+        del pending[key]
+        batch.full.set()
+        return True
+
+    def _async_flush(self, vehicle, key: tuple, batch: "_Batch", pending: dict):
+        if pending.get(key) is batch:
+            del pending[key]
+        asyncio.ensure_future(self._async_send(vehicle, batch))
+
+    @staticmethod
+    def _send(vehicle, paths: list) -> Dict[str, Callable]:
+        if len(paths) == 1:
+            value = vehicle._send_get(paths[0])
+            return {paths[0]: lambda: value}
+        return _split(paths, vehicle.batch([f"/{path}" for path in paths]))
+
+    @staticmethod
+    async def _async_send(vehicle, batch: "_Batch") -> None:
+        paths = list(batch.paths)
+        try:
+            if len(paths) == 1:
+                value = await vehicle._send_get(paths[0])
+                outcomes = {paths[0]: lambda: value}
+            else:
+                response = await vehicle.batch([f"/{path}" for path in paths])
+                outcomes = _split(paths, response)
+        except Exception as e:
+            batch.future.set_exception(e)
+        else:
+            batch.future.set_result(outcomes)
+
+
+class _Batch(object):
+    __slots__ = ("paths", "full", "done", "outcomes", "error", "future", "timer")
+
+    def __init__(self, future: asyncio.Future = None):
+        # Paths in the order they were requested, without duplicates
+        self.paths = {}
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.outcomes = None
+        self.error = None
+        self.future = future
+        self.timer = None
+
+    # Every caller raises its own copy of the error of the batch
+    def result(self, vehicle, path: str) -> NamedTuple:
+        if self.error is not None:
+            raise coalesce._copy_error(self.error) from self.error.__cause__
+        outcome = self.outcomes.get(path)
+        if outcome is None:
+            return vehicle._send_get(path)
+        return outcome()
+
+    async def async_result(self, vehicle, path: str) -> NamedTuple:
+        try:
+            outcomes = self.future.result()
+        except Exception as e:
+            raise coalesce._copy_error(e) from e.__cause__
+        outcome = outcomes.get(path)
+        if outcome is None:
+            return await vehicle._send_get(path)
+        return outcome()
+
+
+def _split(paths: list, response: NamedTuple) -> Dict[str, Callable]:
+    """
+    Returns (dict): for each path of a batch response, the function returning
+        its NamedTuple or raising its SmartcarException (see
+        `types.BatchResult`). Paths missing from the response are left out, and
+        fetched on their own.
+    """
+    outcomes = {}
+    for path in paths:
+        _, attribute = helpers.format_path_and_attribute_for_batch(f"/{path}")
+        outcome = getattr(response, attribute, None)
+        if outcome is not None:
+            outcomes[path] = outcome
+    return outcomes
@@ -0,0 +1,292 @@
+import asyncio
+import contextlib
+import contextvars
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable, NamedTuple, Optional
+
+# Freshness-aware cache of vehicle GET responses.
+#
+# A ResponseCache stores the decoded NamedTuples of a vehicle's getters, keyed
+# by vehicle and request. An entry is fresh while the data it holds is younger
+# than `max_age`, where the age of the data is measured from its `sc-data-age`
+# header (when the vehicle recorded it), falling back to `sc-fetched-at` (when
+# Smartcar fetched it) and then to when the response was received.
+#
+# Fresh entries are returned without a request. With `stale_while_revalidate`,
+# entries that are at most that many seconds past `max_age` are returned too,
+# while a single request refreshes them in the background. Anything older is
+# fetched again. Failed requests are never cached, and a vehicle's entries are
+# dropped when an action (e.g. `lock()`) is sent to it.
+
+CacheStats = NamedTuple(
+    "CacheStats",
+    [
+        ("hits", int),
+        ("stale_hits", int),
+        ("misses", int),
+        ("evictions", int),
+        ("size", int),
+    ],
+)
+
+# Freshness required by the requests sent inside a 'max_age' block
+_max_age = contextvars.ContextVar("smartcar_max_age", default=None)
+
+_MISS, _FRESH, _STALE = range(3)
+
+
+@contextlib.contextmanager
+def max_age(seconds: float):
+    """
+    Accept cached data up to `seconds` old for the requests sent inside the
+    block, instead of the `max_age` of their cache. 0 always sends the request.
+
+    Args:
+        seconds (float): maximum age of the data
+    """
+    token = _max_age.set(seconds)
+    try:
+        yield
+    finally:
+        _max_age.reset(token)
+
+
+class ResponseCache(object):
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_age: float = 60.0,
+        stale_while_revalidate: float = 0.0,
+    ):
+        """
+        Args:
+            max_entries (int, optional): Entries kept before the least recently
+                used ones are evicted
+
+            max_age (float, optional): Maximum age, in seconds, of the data
+                returned from the cache. Overridden by `smartcar.max_age`.
+
+            stale_while_revalidate (float, optional): Return entries that are up
+                to this many seconds past `max_age` while refreshing them in the
+                background. 0 to always wait for fresh data.
+        """
+        if max_entries < 1:
+            raise ValueError("'max_entries' must be at least 1")
+
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._tasks = set()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_load(
+        self,
+        key: tuple,
+        load: Callable[[], NamedTuple],
+        refresh: bool = False,
+        max_age: Optional[float] = None,
+    ) -> NamedTuple:
+        """
+        Args:
+            key (tuple): identity of the request, starting with its vehicle id
+
+            load: sends the request
+
+            refresh (bool, optional): Skip the lookup: always send the request,
+                and cache its response
+
+            max_age (float, optional): Maximum age of the data returned from
+                the cache for this request, instead of `smartcar.max_age` or
+                the `max_age` of the cache
+
+        Returns:
+            NamedTuple: the cached response if it is fresh enough, otherwise the
+                response of `load`
+        """
+        if refresh:
+            return self._store(key, load())
+
+        state, value = self._lookup(key, max_age)
+        if state == _FRESH:
+            return value
+
+        if state == _STALE:
+            stale = self._start_refresh(key)
+            if stale is not None:
+                # The refresh sees the deadline, max_age... of the caller
+                context = contextvars.copy_context()
+                threading.Thread(
+                    target=context.run,
+                    args=(self._refresh, key, stale, load),
+                    daemon=True,
+                ).start()
+            return value
+
+        return self._store(key, load())
+
+    async def async_get_or_load(
+        self,
+        key: tuple,
+        load: Callable[[], Awaitable[NamedTuple]],
+        refresh: bool = False,
+        max_age: Optional[float] = None,
+    ) -> NamedTuple:
+        """
+        asyncio version of `get_or_load`: `load` returns a coroutine
+        """
+        if refresh:
+            return self._store(key, await load())
+
+        state, value = self._lookup(key, max_age)
+        if state == _FRESH:
+            return value
+
+        if state == _STALE:
+            stale = self._start_refresh(key)
+            if stale is not None:
+                task = asyncio.ensure_future(self._async_refresh(key, stale, load))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return value
+
+        return self._store(key, await load())
+
+    def invalidate(self, vehicle_id: Optional[str] = None) -> None:
+        """
+        Drop the entries of `vehicle_id`, or every entry if None.
+        """
+        with self._lock:
+            if vehicle_id is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == vehicle_id]:
+                del self._entries[key]
+
+    def stats(self) -> CacheStats:
+        """
+        Returns:
+            CacheStats: counters since the cache was created
+        """
+        with self._lock:
+            return CacheStats(
+                self._hits,
+                self._stale_hits,
+                self._misses,
+                self._evictions,
+                len(self._entries),
+            )
+
+    def _lookup(self, key: Hashable, limit: Optional[float] = None) -> tuple:
+        """
+        Returns (tuple): (state, cached value) of `key`
+        """
+        if limit is None:
+            limit = _max_age.get()
+        if limit is None:
+            limit = self.max_age
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.time() - entry.data_time
+                if age <= limit:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return _FRESH, entry.value
+
+                if age <= limit + self.stale_while_revalidate:
+                    self._entries.move_to_end(key)
+                    self._stale_hits += 1
+                    return _STALE, entry.value
+
+            self._misses += 1
+            return _MISS, None
+
+    def _store(self, key: Hashable, value: NamedTuple) -> NamedTuple:
+        entry = _Entry(value, _data_time(value))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return value
+
+    def _store_refreshed(
+        self, key: Hashable, stale: "_Entry", value: NamedTuple
+    ) -> None:
+        """
+        Replace the stale entry of `key` with a refreshed value, unless the
+        entry was invalidated or replaced while the refresh was in flight.
+        """
+        entry = _Entry(value, _data_time(value))
+        with self._lock:
+            if self._entries.get(key) is stale:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+
+    def _start_refresh(self, key: Hashable) -> Optional["_Entry"]:
+        """
+        Returns (_Entry): the entry to refresh, or None if `key` is already
+            being refreshed (or is no longer cached)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or key in self._refreshing:
+                return None
+            self._refreshing.add(key)
+            return entry
+
+    def _refresh(
+        self, key: Hashable, stale: "_Entry", load: Callable[[], NamedTuple]
+    ) -> None:
+        # A failed refresh leaves the stale entry in place, to expire normally
+        try:
+            self._store_refreshed(key, stale, load())
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    async def _async_refresh(
+        self,
+        key: Hashable,
+        stale: "_Entry",
+        load: Callable[[], Awaitable[NamedTuple]],
+    ) -> None:
+        try:
+            self._store_refreshed(key, stale, await load())
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+
+class _Entry(object):
+    __slots__ = ("value", "data_time")
+
+    def __init__(self, value: NamedTuple, data_time: float):
+        self.value = value
+        self.data_time = data_time
+
+
+def _data_time(value: NamedTuple) -> float:
+    """
+    Returns (float): POSIX time at which the data of a response was recorded
+    """
+    meta = getattr(value, "meta", None)
+    for header in ("data_age_datetime", "fetched_at_datetime"):
+        recorded_at = getattr(meta, header, None)
+        if recorded_at is not None:
+            return recorded_at.timestamp()
+    return time.time()
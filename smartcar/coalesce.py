@@ -0,0 +1,186 @@
+import asyncio
+import copy
+import threading
+import weakref
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+import smartcar.exception as sce
+import smartcar.timeouts as timeouts
+
+# In-flight request coalescing ("singleflight").
+#
+# When coalescing is enabled, identical vehicle GETs sent while one of them is
+# still in flight do not reach Smartcar: they wait for the request in flight
+# and share its decoded NamedTuple (or its SmartcarException). Requests are
+# identical when they have the same method, URL (vehicle, endpoint, version,
+# flags and query), unit system and access token.
+#
+# Only concurrent requests are coalesced: once a request completes, the next
+# identical one is sent again. Use a 'smartcar.ResponseCache' to reuse
+# completed responses.
+
+T = TypeVar("T")
+
+
+class SingleFlight(object):
+    """
+    Runs at most one call per key at a time; threads calling `do` with a key
+    that is already running wait for that call and share its outcome.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Args:
+            key: identity of the call
+
+            fn: makes the call when no identical one is in flight
+
+        Returns:
+            the result of `fn`, or of the identical call in flight
+
+        Raises:
+            the exception of `fn`, or of the identical call in flight
+            SmartcarTimeoutException: if the current deadline runs out while
+                waiting for the identical call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            return call.wait()
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def in_flight(self) -> int:
+        """
+        Returns (int): number of calls running
+        """
+        with self._lock:
+            return len(self._calls)
+
+
+class _Call(object):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        if not self.done.wait(timeouts.remaining()):
+            raise timeouts.deadline_exceeded()
+        if self.error is not None:
+            raise _copy_error(self.error)
+        return self.result
+
+
+class AsyncSingleFlight(object):
+    """
+    asyncio version of `SingleFlight`. Calls are only shared between tasks of
+    the same event loop.
+    """
+
+    def __init__(self):
+        self._calls_by_loop = weakref.WeakKeyDictionary()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Args:
+            key: identity of the call
+
+            fn: returns the coroutine making the call when no identical one is
+                in flight
+
+        Returns:
+            the result of `fn`, or of the identical call in flight
+        """
+        calls = self._calls_by_loop.setdefault(asyncio.get_running_loop(), {})
+        task = calls.get(key)
+        if task is None:
+            # The call runs in its own task, so that cancelling one of the
+            # callers waiting for it does not cancel it for the others
+            task = calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda t: _forget(calls, key, t))
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeouts.remaining())
+        except asyncio.TimeoutError:
+            raise timeouts.deadline_exceeded() from None
+        except sce.SmartcarException as e:
+            raise _copy_error(e) from e.__cause__
+
+    def in_flight(self) -> int:
+        """
+        Returns (int): number of calls running in the current event loop
+        """
+        return len(self._calls_by_loop.get(asyncio.get_running_loop(), ()))
+
+
+def _copy_error(error: BaseException) -> BaseException:
+    """
+    Returns: a copy of the error of a shared call for one of its callers, so
+        that callers do not share (and modify) one exception, e.g. its
+        traceback or `retry_count`
+    """
+    if isinstance(error, sce.SmartcarException):
+        return error._clone()
+    try:
+        return copy.copy(error)
+    except Exception:
+        return error
+
+
+def _forget(calls: dict, key: Hashable, task: asyncio.Future) -> None:
+    if calls.get(key) is task:
+        del calls[key]
+
+    # Mark the outcome as retrieved even if every caller stopped waiting
+    if not task.cancelled():
+        task.exception()
+
+
+# Shared by every Vehicle and AsyncVehicle
+
+single_flight = SingleFlight()
+async_single_flight = AsyncSingleFlight()
+
+_coalescing = False
+
+
+def get_coalescing() -> bool:
+    """
+    Returns:
+        bool: whether vehicles that do not set the `coalesce` option coalesce
+            their identical concurrent GETs
+    """
+    return _coalescing
+
+
+def set_coalescing(enabled: bool) -> None:
+    """
+    Enable or disable coalescing of identical concurrent vehicle GETs, for
+    vehicles that do not set the `coalesce` option.
+
+    Args:
+        enabled (bool)
+    """
+    global _coalescing
+    _coalescing = bool(enabled)
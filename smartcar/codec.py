@@ -0,0 +1,147 @@
+import importlib
+import json as _json
+from typing import Any, Callable, Union
+
+# JSON encoding and decoding of request and response bodies.
+#
+# Every JSON body the SDK sends or parses goes through the active JsonCodec:
+# TransportResponse.json(), error bodies in 'exception_factory', batch
+# responses, and the bodies of POST requests (batch, actions, compatibility...).
+#
+# The stdlib 'json' module is always available. When orjson is installed (e.g.
+# with `pip install "smartcar[fast-json]"`), it is used instead. ujson parses
+# some documents differently from the stdlib (e.g. the precision of floats), so
+# it is only used when chosen by name with `set_json_codec`.
+
+
+class JsonCodec(object):
+    def __init__(
+        self,
+        name: str,
+        loads: Callable[[Union[bytes, str]], Any],
+        dumps: Callable[[Any], bytes],
+    ):
+        """
+        A pair of JSON functions.
+
+        Args:
+            name (str): name of the codec, e.g. "orjson"
+
+            loads: parses a JSON document from bytes or str
+
+            dumps: serializes an object to UTF-8 encoded JSON bytes
+        """
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self) -> str:
+        return f"JsonCodec({self.name!r})"
+
+
+def _stdlib_codec() -> JsonCodec:
+    return JsonCodec(
+        "json",
+        _json.loads,
+        lambda obj: _json.dumps(obj, separators=(",", ":")).encode("utf-8"),
+    )
+
+
+def _orjson_codec() -> JsonCodec:
+    orjson = importlib.import_module("orjson")
+    return JsonCodec("orjson", orjson.loads, orjson.dumps)
+
+
+def _ujson_codec() -> JsonCodec:
+    ujson = importlib.import_module("ujson")
+    return JsonCodec(
+        "ujson",
+        ujson.loads,
+        lambda obj: ujson.dumps(obj, ensure_ascii=False).encode("utf-8"),
+    )
+
+
+_CODECS = {"json": _stdlib_codec, "orjson": _orjson_codec, "ujson": _ujson_codec}
+
+# Tried in order by "auto", which only picks codecs that decode like the stdlib
+_FAST_CODECS = ("orjson",)
+
+
+def json_codec(name: str) -> JsonCodec:
+    """
+    Args:
+        name (str): "json", "orjson", "ujson", or "auto" for orjson if it is
+            installed and json otherwise
+
+    Returns:
+        JsonCodec
+
+    Raises:
+        ValueError: if `name` is not a known codec
+        ImportError: if the library of `name` is not installed
+    """
+    if name == "auto":
+        for fast in _FAST_CODECS:
+            try:
+                return _CODECS[fast]()
+            except ImportError:
+                continue
+        return _stdlib_codec()
+
+    if name not in _CODECS:
+        raise ValueError(
+            f"Unknown JSON codec '{name}', expected one of: auto, " + ", ".join(_CODECS)
+        )
+
+    try:
+        return _CODECS[name]()
+    except ImportError as e:
+        raise ImportError(
+            f"The '{name}' JSON codec requires {name}. Install it with: pip install {name}"
+        ) from e
+
+
+_codec = json_codec("auto")
+
+
+def get_json_codec() -> JsonCodec:
+    """
+    Returns:
+        JsonCodec: the codec used for every JSON body
+    """
+    return _codec
+
+
+def set_json_codec(codec: Union[str, JsonCodec]) -> None:
+    """
+    Set the codec used for every JSON body.
+
+    Args:
+        codec (str | JsonCodec): "json", "orjson", "ujson", "auto", or a
+            JsonCodec
+
+    Raises:
+        ValueError: if `codec` is not a known codec
+        ImportError: if the library of `codec` is not installed
+        TypeError: if `codec` is neither a str nor a JsonCodec
+    """
+    global _codec
+    if isinstance(codec, str):
+        codec = json_codec(codec)
+    elif not isinstance(codec, JsonCodec):
+        raise TypeError("'codec' must be a str or a JsonCodec")
+    _codec = codec
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document with the active codec.
+    """
+    return _codec.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize `obj` to JSON bytes with the active codec.
+    """
+    return _codec.dumps(obj)
@@ -0,0 +1,234 @@
+import sys
+from typing import NamedTuple, Optional, Tuple
+
+
+import smartcar.types as types
+
+# Compact, memory-resident copies of vehicle results.
+#
+# Applications that keep the latest results of many vehicles in memory (e.g.
+# the battery and location of a whole fleet) can convert them with 'to_compact'.
+# A compact record has __slots__ instead of a tuple of fields, and:
+#
+# - the status strings (e.g. a charge "state", or a door's type and status) are
+#   interned, so every record shares one copy of each;
+# - the doors, windows... of a LockStatus are shared Opening records instead of
+#   dicts, and identical lists of them are stored once;
+# - meta keeps the same fields as 'types.Meta' (the Smartcar headers and the
+#   retry count) in slots, with the unit system interned. Request ids and
+#   timestamps differ between responses, so metas are not shared.
+#
+# Sharing is done through a CompactPool; records converted with the same pool
+# share their strings and openings. `to_named_tuple` converts a record
+# back to the NamedTuple of 'smartcar.types'.
+
+
+class CompactRecord(object):
+    """
+    Base class of compact records. Like a NamedTuple, a record has `_fields`,
+    `_asdict` and value equality.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    # The 'smartcar.types' NamedTuple of the record
+    _named_tuple = None
+
+    def __init__(self, *values):
+        if len(values) != len(self._fields):
+            raise TypeError(
+                f"{type(self).__name__} takes {len(self._fields)} values, got {len(values)}"
+            )
+        for field, value in zip(self._fields, values):
+            setattr(self, field, value)
+
+    def _asdict(self) -> dict:
+        return {field: getattr(self, field) for field in self._fields}
+
+    def __iter__(self):
+        return (getattr(self, field) for field in self._fields)
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v!r}" for k, v in self._asdict().items())
+        return f"{type(self).__name__}({fields})"
+
+    def __getstate__(self) -> tuple:
+        return tuple(self)
+
+    def __setstate__(self, state: tuple) -> None:
+        CompactRecord.__init__(self, *state)
+
+    def to_named_tuple(self) -> NamedTuple:
+        """
+        Returns:
+            NamedTuple: the 'smartcar.types' NamedTuple of the record
+        """
+        return self._named_tuple(*(_expand(value) for value in self))
+
+
+def _record_class(named_tuple: type) -> type:
+    """
+    Returns (type): a CompactRecord subclass with the fields of `named_tuple`
+    """
+    return type(
+        f"Compact{named_tuple.__name__}",
+        (CompactRecord,),
+        {
+            "__slots__": named_tuple._fields,
+            "_fields": named_tuple._fields,
+            "_named_tuple": named_tuple,
+            "__module__": __name__,
+        },
+    )
+
+
+class CompactMeta(CompactRecord):
+    """
+    The Smartcar headers and retry count of a response (see `types.Meta`).
+    A field missing from the Meta is None.
+    """
+
+    __slots__ = ("data_age", "unit_system", "request_id", "fetched_at", "retry_count")
+    _fields = ("data_age", "unit_system", "request_id", "fetched_at", "retry_count")
+
+    def to_named_tuple(self) -> types.Meta:
+        return types.build_meta(
+            {
+                header: getattr(self, attribute)
+                for header, attribute in types.Meta._HEADERS.items()
+                if getattr(self, attribute) is not None
+            },
+            self.retry_count,
+        )
+
+
+class CompactOpening(CompactRecord):
+    """
+    A door, window, sunroof, storage or charging port of a LockStatus.
+    """
+
+    __slots__ = ("type", "status")
+    _fields = ("type", "status")
+
+    def to_named_tuple(self) -> dict:
+        # LockStatus holds the openings as the dicts of the response
+        return {"type": self.type, "status": self.status}
+
+
+CompactBattery = _record_class(types.Battery)
+CompactCharge = _record_class(types.Charge)
+CompactLocation = _record_class(types.Location)
+CompactOdometer = _record_class(types.Odometer)
+CompactTirePressure = _record_class(types.TirePressure)
+CompactLockStatus = _record_class(types.LockStatus)
+
+_COMPACT_CLASSES = {
+    record._named_tuple: record
+    for record in (
+        CompactBattery,
+        CompactCharge,
+        CompactLocation,
+        CompactOdometer,
+        CompactTirePressure,
+        CompactLockStatus,
+    )
+}
+
+# Fields of LockStatus holding lists of openings
+_OPENINGS = frozenset(["doors", "windows", "sunroof", "storage", "charging_port"])
+
+
+class CompactPool(object):
+    def __init__(self):
+        """
+        Shares the strings and openings of the records it converts.
+        """
+        self._openings = {}
+        self._opening_lists = {}
+
+    def string(self, value: Optional[str]) -> Optional[str]:
+        return sys.intern(value) if type(value) is str else value
+
+    def meta(self, meta) -> Optional[CompactMeta]:
+        if meta is None:
+            return None
+        return CompactMeta(
+            getattr(meta, "data_age", None),
+            self.string(getattr(meta, "unit_system", None)),
+            getattr(meta, "request_id", None),
+            getattr(meta, "fetched_at", None),
+            getattr(meta, "retry_count", None),
+        )
+
+    def openings(self, openings) -> Optional[Tuple[CompactOpening, ...]]:
+        if openings is None:
+            return None
+        shared = tuple(self._opening(opening) for opening in openings)
+        return self._opening_lists.setdefault(shared, shared)
+
+    def _opening(self, opening) -> CompactOpening:
+        if isinstance(opening, dict):
+            key = (opening.get("type"), opening.get("status"))
+        else:
+            key = (opening.type, opening.status)
+        compact_opening = self._openings.get(key)
+        if compact_opening is None:
+            compact_opening = CompactOpening(*(self.string(value) for value in key))
+            self._openings[key] = compact_opening
+        return compact_opening
+
+
+_default_pool = CompactPool()
+
+
+def to_compact(result: NamedTuple, pool: CompactPool = None) -> CompactRecord:
+    """
+    Convert a result to its compact record.
+
+    Args:
+        result (NamedTuple): a Battery, Charge, Location, Odometer,
+            TirePressure or LockStatus
+
+        pool (CompactPool, optional): Pool sharing the strings and openings of
+            the records. Defaults to a pool shared by the whole SDK.
+
+    Returns:
+        CompactRecord: e.g. a CompactBattery for a Battery
+
+    Raises:
+        TypeError: if `result` has no compact record
+    """
+    record = _COMPACT_CLASSES.get(type(result))
+    if record is None:
+        raise TypeError(f"{type(result).__name__} has no compact record")
+
+    pool = pool or _default_pool
+    values = []
+    for field, value in zip(result._fields, result):
+        if field == "meta":
+            value = pool.meta(value)
+        elif field in _OPENINGS:
+            value = pool.openings(value)
+        else:
+            value = pool.string(value)
+        values.append(value)
+    return record(*values)
+
+
+def _expand(value):
+    """
+    Returns: `value` as it is in the 'smartcar.types' NamedTuples
+    """
+    if isinstance(value, CompactRecord):
+        return value.to_named_tuple()
+    if isinstance(value, tuple):
+        return [_expand(item) for item in value]
+    return value
@@ -0,0 +1,382 @@
+import asyncio
+import contextvars
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import AsyncIterator, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+import smartcar.exception as sce
+import smartcar.helpers as helpers
+import smartcar.ratelimit as ratelimit
+import smartcar.smartcar
+import smartcar.types as types
+from smartcar.cache import ResponseCache
+
+# Compatibility checks of many VINs.
+#
+# A CompatibilityChecker validates the credentials and builds the compatibility
+# request of a scope once, then checks any number of VINs with a bounded number
+# of requests in flight (on a thread pool with 'check_many', or on the event
+# loop with 'async_check_many'). Requests go through the rate limiter of the
+# application like `smartcar.get_compatibility`.
+#
+# Results are cached by (VIN, scope, country, API version, other parameters)
+# for `ttl` seconds, whatever the `smartcar.max_age` of the caller, so screening
+# the same inventory again only requests the VINs that are new or expired.
+# Failed checks are not cached.
+#
+# Compatibility mostly depends on the make, model and year of a vehicle, which
+# are encoded in the first characters of its VIN. A VinPrefixCache, opt-in with
+# `CompatibilityChecker(prefix_cache=...)`, learns the results of VIN prefixes
+# and answers the other VINs of a prefix without a request, once enough VINs of
+# it agreed. By default it only answers for known-incompatible prefixes, i.e. it
+# pre-filters VINs that cannot be compatible.
+
+CompatibilityResult = NamedTuple(
+    "CompatibilityResult",
+    [
+        ("vin", str),
+        (
+            "result",
+            Union[types.CompatibilityV1, types.CompatibilityV2, sce.SmartcarException],
+        ),
+    ],
+)
+
+
+class VinPrefixCache(object):
+    def __init__(
+        self,
+        min_observations: int = 3,
+        answer: str = "incompatible",
+        ttl: float = 7 * 24 * 60 * 60,
+        max_prefixes: int = 100000,
+    ):
+        """
+        Args:
+            min_observations (int, optional): Number of VINs of a prefix that must
+                have had the same result before it answers for the prefix
+
+            answer (str, optional): Results answered from a prefix:
+                "incompatible" to only skip the VINs of incompatible prefixes,
+                or "all" to also answer for compatible ones
+
+            ttl (float, optional): Seconds a prefix is trusted for after its last
+                observation
+
+            max_prefixes (int, optional): Prefixes kept before the least
+                recently used ones are forgotten
+        """
+        if min_observations < 1:
+            raise ValueError("'min_observations' must be at least 1")
+        if answer not in ("incompatible", "all"):
+            raise ValueError("'answer' must be one of: incompatible, all")
+        if max_prefixes < 1:
+            raise ValueError("'max_prefixes' must be at least 1")
+
+        self.min_observations = min_observations
+        self.answer = answer
+        self.ttl = ttl
+        self.max_prefixes = max_prefixes
+        self._prefixes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, vin: str, key: tuple = ()):
+        """
+        Args:
+            vin (str)
+
+            key (tuple, optional): scope, country... the results are for
+
+        Returns:
+            Compatibility: the result shared by the VINs of the prefix of `vin`,
+                with a None meta, or None if it is not known with enough
+                confidence
+        """
+        prefix = vin_prefix(vin)
+        if prefix is None:
+            return None
+
+        with self._lock:
+            entry = self._prefixes.get((prefix,) + key)
+            if entry is not None:
+                self._prefixes.move_to_end((prefix,) + key)
+            if (
+                entry is None
+                or entry.result is None
+                or entry.count < self.min_observations
+                or time.monotonic() - entry.observed_at > self.ttl
+            ):
+                return None
+            result = entry.result
+
+        if result.compatible and self.answer != "all":
+            return None
+        return result._replace(meta=None)
+
+    def record(self, vin: str, result, key: tuple = ()) -> None:
+        """
+        Learn the result of a VIN. A prefix whose VINs had different results
+        is never answered for, until `forget`.
+        """
+        prefix = vin_prefix(vin)
+        if prefix is None:
+            return
+
+        signature = result._replace(meta=None)
+        now = time.monotonic()
+        key = (prefix,) + key
+        with self._lock:
+            entry = self._prefixes.get(key)
+            if entry is None or now - entry.observed_at > self.ttl:
+                self._prefixes[key] = _PrefixEntry(signature, now)
+            elif entry.result is not None:
+                if entry.result == signature:
+                    entry.count += 1
+                else:
+                    entry.result = None
+                entry.observed_at = now
+            self._prefixes.move_to_end(key)
+            while len(self._prefixes) > self.max_prefixes:
+                self._prefixes.popitem(last=False)
+
+    def forget(self, vin: str = None) -> None:
+        """
+        Drop what was learned of the prefix of `vin`, or of every prefix if None.
+        """
+        with self._lock:
+            if vin is None:
+                self._prefixes.clear()
+                return
+            prefix = vin_prefix(vin)
+            for key in [key for key in self._prefixes if key[0] == prefix]:
+                del self._prefixes[key]
+
+    def __len__(self) -> int:
+        return len(self._prefixes)
+
+
+class _PrefixEntry(object):
+    __slots__ = ("result", "count", "observed_at")
+
+    def __init__(self, result, observed_at: float):
+        # None once the VINs of the prefix disagreed
+        self.result = result
+        self.count = 1
+        self.observed_at = observed_at
+
+
+def vin_prefix(vin: str) -> Optional[str]:
+    """
+    Returns (str): the characters of a VIN identifying its manufacturer, model
+        and model year (WMI, VDS and year, without the check digit), or None if
+        `vin` is not 17 characters long
+    """
+    if len(vin) != 17:
+        return None
+    vin = vin.upper()
+    return vin[:8] + vin[9]
+
+
+class CompatibilityChecker(object):
+    def __init__(
+        self,
+        scope: List[str],
+        country: str = "US",
+        options: dict = None,
+        max_concurrency: int = 8,
+        ttl: float = 24 * 60 * 60,
+        cache: ResponseCache = None,
+        prefix_cache: VinPrefixCache = None,
+    ):
+        """
+        Args:
+            scope (List[str]): permissions to check every VIN for
+
+            country (str, optional)
+
+            options (dict, optional): see `smartcar.get_compatibility`
+
+            max_concurrency (int, optional): Maximum number of requests in flight
+
+            ttl (float, optional): Seconds a result is reused for, regardless of
+                the `max_age` of `cache` or of an enclosing `smartcar.max_age`
+
+            cache (ResponseCache, optional): Cache of the results, e.g. to share
+                them between checkers. Defaults to a cache of 100,000 results.
+
+            prefix_cache (VinPrefixCache, optional): Answer VINs from the results
+                of other VINs of the same model. Disabled by default.
+
+        Raises:
+            Exception: if the client id and secret are missing
+        """
+        if max_concurrency < 1:
+            raise ValueError("'max_concurrency' must be at least 1")
+
+        request = smartcar.smartcar._compatibility_request("", scope, country, options)
+        self._url, self._headers, self._params, api_version, client_id = request
+        self._path = smartcar.smartcar._compatibility_path(api_version)
+        self._rate_limit_keys = (ratelimit.app_key(client_id),)
+        # Scopes are compared as a set, in any order. The other parameters
+        # (mode, flags...) change the result too.
+        params = sorted(
+            (name, value)
+            for name, value in self._params.items()
+            if name not in ("vin", "scope", "country")
+        )
+        self._key = (frozenset(scope), country, api_version, tuple(params))
+
+        self.max_concurrency = max_concurrency
+        self.ttl = ttl
+        self.cache = cache or ResponseCache(max_entries=100000, max_age=ttl)
+        self.prefix_cache = prefix_cache
+
+    def check(
+        self, vin: str, refresh: bool = False
+    ) -> Union[types.CompatibilityV1, types.CompatibilityV2]:
+        """
+        Check the compatibility of one VIN, from the caches if possible.
+
+        Args:
+            vin (str)
+
+            refresh (bool, optional): Send the request even if the result is
+                cached, and cache the new result
+
+        Returns:
+            CompatibilityV1 OR CompatibilityV2
+
+        Raises:
+            SmartcarException
+        """
+        if not refresh:
+            answer = self._prefix_answer(vin)
+            if answer is not None:
+                return answer
+        return self.cache.get_or_load(
+            self._cache_key(vin), lambda: self._fetch(vin), refresh, self.ttl
+        )
+
+    async def async_check(
+        self, vin: str, refresh: bool = False
+    ) -> Union[types.CompatibilityV1, types.CompatibilityV2]:
+        """
+        asyncio version of `check`
+        """
+        if not refresh:
+            answer = self._prefix_answer(vin)
+            if answer is not None:
+                return answer
+        return await self.cache.async_get_or_load(
+            self._cache_key(vin), lambda: self._async_fetch(vin), refresh, self.ttl
+        )
+
+    def check_many(
+        self, vins: Iterable[str], refresh: bool = False
+    ) -> Iterator[CompatibilityResult]:
+        """
+        Check every VIN from a thread pool.
+
+        Args:
+            vins (iterable): VINs, read as requests complete
+
+            refresh (bool, optional): see `check`
+
+        Returns:
+            Iterator[CompatibilityResult]: (vin, Compatibility | SmartcarException),
+                in completion order
+        """
+        vins = iter(vins)
+
+        with ThreadPoolExecutor(
+            self.max_concurrency, "smartcar-compatibility"
+        ) as executor:
+            pending = {}
+
+            def submit(count):
+                for vin in itertools.islice(vins, count):
+                    context = contextvars.copy_context()
+                    future = executor.submit(context.run, self._capture, vin, refresh)
+                    pending[future] = vin
+
+            try:
+                submit(self.max_concurrency)
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield CompatibilityResult(pending.pop(future), future.result())
+                    submit(len(done))
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    async def async_check_many(
+        self, vins: Iterable[str], refresh: bool = False
+    ) -> AsyncIterator[CompatibilityResult]:
+        """
+        asyncio version of `check_many`
+        """
+        vins = iter(vins)
+        pending = {}
+
+        async def capture(vin):
+            try:
+                return await self.async_check(vin, refresh)
+            except sce.SmartcarException as e:
+                return e
+
+        def submit(count):
+            for vin in itertools.islice(vins, count):
+                pending[asyncio.ensure_future(capture(vin))] = vin
+
+        try:
+            submit(self.max_concurrency)
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield CompatibilityResult(pending.pop(task), task.result())
+                submit(len(done))
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _cache_key(self, vin: str) -> tuple:
+        # The VIN comes first, for `cache.invalidate(vin)`
+        return (vin.upper(),) + self._key
+
+    def _request(self, vin: str) -> dict:
+        # The requester adds to the headers, so each request gets a copy
+        return dict(
+            headers=dict(self._headers),
+            params=dict(self._params, vin=vin),
+            rate_limit_keys=self._rate_limit_keys,
+        )
+
+    def _prefix_answer(self, vin: str):
+        if self.prefix_cache is None:
+            return None
+        return self.prefix_cache.lookup(vin, self._key)
+
+    def _learn(self, vin: str, result):
+        if self.prefix_cache is not None:
+            self.prefix_cache.record(vin, result, self._key)
+        return result
+
+    def _fetch(self, vin: str):
+        response = helpers.requester("GET", self._url, **self._request(vin))
+        return self._learn(vin, types.select_named_tuple(self._path, response))
+
+    async def _async_fetch(self, vin: str):
+        response = await helpers.async_requester("GET", self._url, **self._request(vin))
+        return self._learn(vin, types.select_named_tuple(self._path, response))
+
+    def _capture(self, vin: str, refresh: bool):
+        try:
+            return self.check(vin, refresh)
+        except sce.SmartcarException as e:
+            return e
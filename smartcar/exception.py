@@ -1,4 +1,10 @@
-import json
+import threading
+
+import smartcar.codec as codec
+
+# Serializes the parsing of lazy exceptions, which are often shared by threads
+# (coalesced requests, auto-batched getters...)
+_parse_lock = threading.Lock()
 
 
 class SmartcarException(Exception):
@@ -6,6 +12,11 @@ class SmartcarException(Exception):
     All exceptions with this SDK will be a Smartcar Exception. v1.0 errors and
     v2.0 errors are distinguished by the response body. "General" exceptions will
     be raised as "SDK ERRORS".
+
+    The `status_code` of an exception built from an error body is the
+    `statusCode` of the body (None if the body has none), as it always was;
+    `http_status` is the HTTP status code of the response, and is read without
+    parsing the body.
     """
 
     def __init__(self, **kwargs):
@@ -38,77 +49,309 @@ class SmartcarException(Exception):
 
         super().__init__(self.message)
 
+    def __getattr__(self, name: str):
+        # Only called for attributes that are not set: the fields of an error
+        # body that was not parsed yet (see 'exception_factory')
+        if name not in _BODY_FIELDS:
+            raise AttributeError(name)
+        self._parse()
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __str__(self) -> str:
+        return str(self.message)
+
+    def _parse(self) -> None:
+        if "_response" not in self.__dict__:
+            return
+        with _parse_lock:
+            # Another thread parsed it while this one waited
+            if "_response" not in self.__dict__:
+                return
+            headers, body, check_content_type = self._response
+            fields = _error_fields(self.http_status, headers, body, check_content_type)
+
+            # Build the fields aside, and only publish them all at once: readers
+            # find either the unparsed response or every field
+            parsed = Exception.__new__(type(self))
+            SmartcarException.__init__(parsed, **fields)
+            self.__dict__.update(parsed.__dict__)
+            self.args = parsed.args
+            del self.__dict__["_response"]
+
+    def _clone(self) -> "SmartcarException":
+        """
+        Returns (SmartcarException): a copy of the exception, to raise in
+            another thread than the one that raised it
+        """
+        with _parse_lock:
+            clone = Exception.__new__(type(self))
+            clone.__dict__.update(self.__dict__)
+            clone.args = self.args
+        clone.__cause__ = self.__cause__
+        clone.__suppress_context__ = self.__suppress_context__
+        return clone
+
+    @classmethod
+    def _lazy(
+        cls, status_code: int, headers: dict, body: str, check_content_type: bool
+    ) -> "SmartcarException":
+        """
+        Returns (SmartcarException): an exception of `cls` that only parses
+            `body` when one of its fields is read
+        """
+        exception = cls.__new__(cls)
+        # Shown by logs and tracebacks until the body is parsed
+        exception.args = (f"HTTP {status_code}",)
+        exception.http_status = status_code
+        exception._response = (headers, body, check_content_type)
+        return exception
+
+
+class AuthenticationError(SmartcarException):
+    """
+    Raised for 401 responses, e.g. an invalid or expired access token.
+    """
+
+
+class PermissionDeniedError(SmartcarException):
+    """
+    Raised for 403 responses: the vehicle did not grant the required permission.
+    """
+
+
+class ResourceNotFoundError(SmartcarException):
+    """
+    Raised for 404 responses.
+    """
+
+
+class VehicleStateError(SmartcarException):
+    """
+    Raised for 409 responses: the vehicle cannot handle the request in its
+    current state (e.g. asleep, or out of network coverage).
+    """
+
+
+class RateLimitError(SmartcarException):
+    """
+    Raised for 429 responses: Smartcar rate limited the vehicle or the
+    application. `retry_after` is the Retry-After header, when there is one.
+    """
+
+
+class BillingError(SmartcarException):
+    """
+    Raised for 430 responses, e.g. when the vehicle limit of the plan is reached.
+    """
+
+
+class ServerError(SmartcarException):
+    """
+    Raised for 5xx responses that do not have a more specific subclass.
+    """
+
+
+class CompatibilityError(ServerError):
+    """
+    Raised for 501 responses: the vehicle does not support the request.
+    """
+
+
+class UpstreamError(ServerError):
+    """
+    Raised for 502 responses: the vehicle's manufacturer returned an error.
+    """
+
+
+class SmartcarTimeoutException(SmartcarException):
+    """
+    Raised when a request times out, or when a deadline set with
+    `smartcar.deadline` runs out. `type` is "SDK_TIMEOUT", and `code` is one of
+    "CONNECT_TIMEOUT", "READ_TIMEOUT" or "DEADLINE_EXCEEDED".
+    """
+
+
+class SmartcarRateLimitException(SmartcarException):
+    """
+    Raised by a `smartcar.RateLimiter` instead of waiting for the client-side
+    rate limit. `type` is "SDK_RATE_LIMIT", and `retry_after` is the number of
+    seconds to wait before the request can be sent.
+    """
+
 
 def exception_factory(
     status_code: int, headers: dict, body: str, check_content_type=True
-):
+) -> SmartcarException:
+    """
+    Build the exception of an error response. Its class is picked from the
+    status code and headers (see `exception_class`), and its body is only
+    parsed when one of the fields it holds (e.g. `type` or `description`) is
+    read.
+
+    Args:
+        status_code (int): HTTP status code of the response
+
+        headers (dict): headers of the response
+
+        body (str): the error body
+
+        check_content_type (bool, optional): Treat bodies that are not
+            "application/json" as a plain message
+
+    Returns:
+        SmartcarException
+    """
+    cls = exception_class(status_code, headers)
+    return cls._lazy(status_code, headers, body, check_content_type)
+
+
+def exception_from_json(
+    status_code: int, headers: dict, response: dict, body: str = None
+) -> SmartcarException:
+    """
+    Build the exception of an error body that was already parsed, e.g. one
+    response of a batch request.
+
+    Args:
+        status_code (int): HTTP status code of the response
+
+        headers (dict): headers of the response
+
+        response (dict): the parsed error body
+
+        body (str, optional): the raw error body, used as the message of errors
+            that do not match a known format. Serialized from `response` if None.
+
+    Returns:
+        SmartcarException
+    """
+    cls = exception_class(status_code, headers)
+    exception = cls(**_json_error_fields(status_code, headers, response, body))
+    exception.http_status = status_code
+    return exception
+
+
+def exception_class(status_code: int, headers: dict = None) -> type:
+    """
+    Returns (type): the SmartcarException subclass of errors with `status_code`.
+        A Retry-After header marks the client errors that have no subclass of
+        their own as rate limits.
+    """
+    cls = _STATUS_EXCEPTIONS.get(status_code)
+    if cls is not None:
+        return cls
+    if status_code is not None and status_code >= 500:
+        return ServerError
+    if headers and headers.get("Retry-After") is not None:
+        return RateLimitError
+    return SmartcarException
+
+
+_STATUS_EXCEPTIONS = {
+    401: AuthenticationError,
+    403: PermissionDeniedError,
+    404: ResourceNotFoundError,
+    409: VehicleStateError,
+    429: RateLimitError,
+    430: BillingError,
+    501: CompatibilityError,
+    502: UpstreamError,
+}
+
+# Attributes that are read from the body of an error response
+_BODY_FIELDS = frozenset(
+    [
+        "status_code",
+        "request_id",
+        "type",
+        "message",
+        "description",
+        "code",
+        "doc_url",
+        "resolution",
+        "detail",
+        "retry_after",
+        "suggested_user_message",
+    ]
+)
+
+
+def _error_fields(
+    status_code: int, headers: dict, body: str, check_content_type: bool
+) -> dict:
+    """
+    Returns (dict): the SmartcarException fields of an error response
+    """
     # v1.0 Exception: Content type other than application/json
-    if check_content_type and "application/json" not in headers["Content-Type"]:
-        return SmartcarException(status_code=status_code, message=body)
+    if check_content_type and "application/json" not in headers.get("Content-Type", ""):
+        return {"status_code": status_code, "message": body}
 
     # Parse body into JSON. Throw SDK error if this fails.
     try:
-        response = json.loads(body)
+        response = codec.loads(body)
     except Exception:
-        return SmartcarException(
-            status_code=status_code,
-            request_id=headers.get("SC-Request-Id"),
-            type="SDK_ERROR",
-            message=body,
-        )
+        return {
+            "status_code": status_code,
+            "request_id": headers.get("SC-Request-Id"),
+            "type": "SDK_ERROR",
+            "message": body,
+        }
+
+    return _json_error_fields(status_code, headers, response, body)
 
+
+def _json_error_fields(
+    status_code: int, headers: dict, response: dict, body: str = None
+) -> dict:
+    """
+    Returns (dict): the SmartcarException fields of a parsed error body
+    """
     # v1.0 with code or OAuth error
-    if response.get("error"):
-        if response.get("message"):
-            # smartcar v1
-            return SmartcarException(
-                status_code=response.get("statusCode"),
-                request_id=response.get("requestId"),
-                type=response.get("error"),
-                message=response.get("message"),
-                code=response.get("code"),
-            )
-        elif response.get("error_description"):
-            # OAuth error
-            return SmartcarException(
-                status_code=status_code,
-                type=response.get("error"),
-                message=response.get("error_description"),
-            )
+    if response.get("error") and response.get("message"):
+        # smartcar v1
+        return {
+            "status_code": response.get("statusCode"),
+            "request_id": response.get("requestId"),
+            "type": response.get("error"),
+            "message": response.get("message"),
+            "code": response.get("code"),
+        }
+
+    elif response.get("error") and response.get("error_description"):
+        # OAuth error
+        return {
+            "status_code": status_code,
+            "type": response.get("error"),
+            "message": response.get("error_description"),
+        }
 
     # v2.0
     elif response.get("type"):
+        fields = {
+            "status_code": response.get("statusCode"),
+            "request_id": response.get("requestId"),
+            "type": response.get("type"),
+            "description": response.get("description"),
+            "code": response.get("code"),
+            "doc_url": response.get("docURL"),
+            "resolution": response.get("resolution"),
+            "detail": response.get("detail"),
+            "suggested_user_message": response.get("suggestedUserMessage"),
+        }
         # Set retry_after only for Vehicle Rate Limit errors
         if headers.get("Retry-After") is not None:
-            return SmartcarException(
-                status_code=response.get("statusCode"),
-                request_id=response.get("requestId"),
-                type=response.get("type"),
-                description=response.get("description"),
-                code=response.get("code"),
-                doc_url=response.get("docURL"),
-                resolution=response.get("resolution"),
-                detail=response.get("detail"),
-                retry_after=headers.get("Retry-After"),
-                suggested_user_message=response.get("suggestedUserMessage"),
-            )
-        else:
-            return SmartcarException(
-                status_code=response.get("statusCode"),
-                request_id=response.get("requestId"),
-                type=response.get("type"),
-                description=response.get("description"),
-                code=response.get("code"),
-                doc_url=response.get("docURL"),
-                resolution=response.get("resolution"),
-                detail=response.get("detail"),
-                suggested_user_message=response.get("suggestedUserMessage"),
-            )
+            fields["retry_after"] = headers.get("Retry-After")
+        return fields
 
     else:
-        return SmartcarException(
-            status_code=status_code,
-            request_id=headers["SC-Request-Id"],
-            type="SDK_ERROR",
-            message=body,
-        )
+        return {
+            "status_code": status_code,
+            "request_id": headers.get("SC-Request-Id"),
+            "type": "SDK_ERROR",
+            "message": (
+                body if body is not None else codec.dumps(response).decode("utf-8")
+            ),
+        }
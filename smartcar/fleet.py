@@ -0,0 +1,268 @@
+import asyncio
+import contextvars
+import itertools
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import smartcar.exception as sce
+from smartcar.aio import AsyncVehicle
+from smartcar.vehicle import Vehicle
+
+# Fan-out of one Vehicle method across many vehicles.
+#
+# A Fleet takes (vehicle_id, access_token) pairs and calls the same method (e.g.
+# "battery") or batch request on every vehicle, with a bounded number of
+# requests in flight: on a thread pool with 'run', or on the event loop with
+# 'async_run'. Results are yielded in completion order as FleetResults, and a
+# SmartcarException raised for one vehicle is yielded as its result instead of
+# stopping the others.
+#
+# Vehicles are read from the iterable as requests complete, so it can be a
+# generator over any number of vehicles.
+#
+# Each run returns a FleetRun: the iterator of its results, which also counts
+# them for `progress()`. Runs of the same Fleet (e.g. on several threads) have
+# their own counters.
+
+FleetResult = NamedTuple(
+    "FleetResult",
+    [("vehicle_id", str), ("result", Union[NamedTuple, sce.SmartcarException])],
+)
+
+FleetProgress = NamedTuple(
+    "FleetProgress",
+    [
+        ("total", Optional[int]),
+        ("completed", int),
+        ("succeeded", int),
+        ("failed", int),
+        ("elapsed", float),
+        ("throughput", float),
+    ],
+)
+
+
+class FleetRun(object):
+    def __init__(self, total: Optional[int]):
+        """
+        The results of one `Fleet.run` (an iterator) or `Fleet.async_run` (an
+        async iterator), and the progress of the run.
+
+        Args:
+            total (int, optional): number of vehicles, if known
+        """
+        # Generator (or async generator) of the results, set by the Fleet
+        self._results = None
+        self.total = total
+        self.succeeded = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
+
+    def progress(self) -> FleetProgress:
+        """
+        Returns:
+            FleetProgress: progress of the run. `total` is None if the vehicles
+                have no length.
+        """
+        elapsed = time.monotonic() - self.started_at
+        completed = self.succeeded + self.failed
+        return FleetProgress(
+            self.total,
+            completed,
+            self.succeeded,
+            self.failed,
+            elapsed,
+            completed / elapsed if elapsed > 0 else 0.0,
+        )
+
+    def __iter__(self) -> Iterator[FleetResult]:
+        return self
+
+    def __next__(self) -> FleetResult:
+        return next(self._results)
+
+    def close(self) -> None:
+        """
+        Stop the run: calls that did not start are dropped.
+        """
+        self._results.close()
+
+    def __aiter__(self) -> AsyncIterator[FleetResult]:
+        return self
+
+    def __anext__(self) -> Awaitable[FleetResult]:
+        return self._results.__anext__()
+
+    async def aclose(self) -> None:
+        """
+        asyncio version of `close`
+        """
+        await self._results.aclose()
+
+    def _record(self, vehicle_id: str, result) -> FleetResult:
+        if isinstance(result, sce.SmartcarException):
+            self.failed += 1
+        else:
+            self.succeeded += 1
+        return FleetResult(vehicle_id, result)
+
+
+class Fleet(object):
+    def __init__(
+        self,
+        vehicles: Iterable[Tuple[str, str]],
+        options: dict = None,
+        max_concurrency: int = 16,
+    ):
+        """
+        Args:
+            vehicles (iterable): (vehicle_id, access_token) pairs
+
+            options (dict, optional): options of every Vehicle, see
+                `smartcar.Vehicle`
+
+            max_concurrency (int, optional): Maximum number of requests in flight
+        """
+        if max_concurrency < 1:
+            raise ValueError("'max_concurrency' must be at least 1")
+
+        self.vehicles = vehicles
+        self.options = options
+        self.max_concurrency = max_concurrency
+        self._last_run = None
+
+    def run(self, method: Union[str, List[str]], *args, **kwargs) -> FleetRun:
+        """
+        Call `method` on every vehicle from a thread pool. The current deadline
+        (see `smartcar.deadline`) applies to every call.
+
+        Args:
+            method (str | [str]): name of a Vehicle method (e.g. "battery"), or
+                paths to request with `Vehicle.batch`
+
+            *args, **kwargs: arguments of `method`
+
+        Returns:
+            FleetRun: iterator of (vehicle_id, NamedTuple | SmartcarException),
+                in completion order, with the `progress()` of the run
+        """
+        call = _call(method, args, kwargs)
+        run = self._last_run = FleetRun(self._total())
+        run._results = self._run(call, run)
+        return run
+
+    def async_run(self, method: Union[str, List[str]], *args, **kwargs) -> FleetRun:
+        """
+        asyncio version of `run`, calling `method` on AsyncVehicles.
+
+        Returns:
+            FleetRun: async iterator of (vehicle_id, NamedTuple | SmartcarException),
+                in completion order, with the `progress()` of the run
+        """
+        call = _call(method, args, kwargs)
+        run = self._last_run = FleetRun(self._total())
+        run._results = self._async_run(call, run)
+        return run
+
+    def progress(self) -> FleetProgress:
+        """
+        Returns:
+            FleetProgress: progress of the run started last. Concurrent runs
+                each have their own, see `FleetRun.progress`.
+        """
+        if self._last_run is None:
+            return FleetRun(self._total()).progress()
+        return self._last_run.progress()
+
+    def _total(self) -> Optional[int]:
+        try:
+            return len(self.vehicles)
+        except TypeError:
+            return None
+
+    def _run(self, call, run: FleetRun) -> Iterator[FleetResult]:
+        vehicles = iter(self.vehicles)
+        run.started_at = time.monotonic()
+
+        with ThreadPoolExecutor(self.max_concurrency, "smartcar-fleet") as executor:
+            pending = {}
+
+            def submit(count):
+                for vehicle_id, access_token in itertools.islice(vehicles, count):
+                    vehicle = Vehicle(vehicle_id, access_token, self.options)
+                    context = contextvars.copy_context()
+                    future = executor.submit(context.run, _capture, call, vehicle)
+                    pending[future] = vehicle_id
+
+            try:
+                submit(self.max_concurrency)
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield run._record(pending.pop(future), future.result())
+                    submit(len(done))
+            finally:
+                # The consumer stopped early: drop the calls that did not start
+                for future in pending:
+                    future.cancel()
+
+    async def _async_run(self, call, run: FleetRun) -> AsyncIterator[FleetResult]:
+        vehicles = iter(self.vehicles)
+        run.started_at = time.monotonic()
+        pending = {}
+
+        async def capture(vehicle):
+            try:
+                return await call(vehicle)
+            except sce.SmartcarException as e:
+                return e
+
+        def submit(count):
+            for vehicle_id, access_token in itertools.islice(vehicles, count):
+                vehicle = AsyncVehicle(vehicle_id, access_token, self.options)
+                pending[asyncio.ensure_future(capture(vehicle))] = vehicle_id
+
+        try:
+            submit(self.max_concurrency)
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield run._record(pending.pop(task), task.result())
+                submit(len(done))
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def _call(method: Union[str, List[str]], args: tuple, kwargs: dict):
+    """
+    Returns: a function calling `method` on a vehicle
+    """
+    if not isinstance(method, str):
+        paths = list(method)
+        return lambda vehicle: vehicle.batch(paths)
+
+    if method.startswith("_") or not callable(getattr(Vehicle, method, None)):
+        raise ValueError(f"'{method}' is not a method of smartcar.Vehicle")
+
+    return lambda vehicle: getattr(vehicle, method)(*args, **kwargs)
+
+
+def _capture(call, vehicle: Vehicle):
+    try:
+        return call(vehicle)
+    except sce.SmartcarException as e:
+        return e
@@ -1,12 +1,32 @@
+import asyncio
 import os
 import platform
-import requests
+import time
 
+import smartcar.codec as codec
 import smartcar.exception as sce
+import smartcar.ratelimit as ratelimit
+import smartcar.retry as retry
+import smartcar.timeouts as timeouts
+import smartcar.transport as transport
 from smartcar import __version__
 
+USER_AGENT = (
+    f"Smartcar/{__version__}({platform.system()}; "
+    f"{platform.machine()}) Python v{platform.python_version()}"
+)
 
-def requester(method: str, url: str, **kwargs) -> requests.models.Response:
+
+def requester(
+    method: str,
+    url: str,
+    retry_policy: retry.RetryPolicy = None,
+    idempotent: bool = None,
+    timeout: timeouts.TimeoutLike = None,
+    rate_limiter: ratelimit.RateLimiter = None,
+    rate_limit_keys: tuple = (),
+    **kwargs,
+) -> transport.TransportResponse:
     """
     Attaches the kwargs into the headers, sends the request to the Smartcar API
         and handles all error cases
@@ -16,35 +36,270 @@ def requester(method: str, url: str, **kwargs) -> requests.models.Response:
 
         url (str): url of the request
 
+        retry_policy (RetryPolicy, optional): Defaults to the policy set with
+            `smartcar.set_retry_policy`
+
+        idempotent (bool, optional): Whether the request is safe to retry after
+            any retryable error. Defaults to deciding from the HTTP method.
+
+        timeout (float | (float, float), optional): connect and read timeout of
+            each attempt. Defaults to the timeout set with `smartcar.set_default_timeout`.
+
+        rate_limiter (RateLimiter, optional): Defaults to the limiter set with
+            `smartcar.set_rate_limiter`
+
+        rate_limit_keys (tuple, optional): buckets the request counts against,
+            see `ratelimit.vehicle_key` and `ratelimit.app_key`
+
         **kwargs: parameters for the request
 
     Returns:
-        requests.models.Response: response from the request to the Smartcar API
+        TransportResponse: response from the request to the Smartcar API
     """
-    if "headers" not in kwargs:
-        kwargs["headers"] = {}
+    _attach_user_agent(kwargs)
+    _encode_json_body(kwargs)
+    policy = retry_policy or retry.get_retry_policy()
+    limiter = rate_limiter or ratelimit.get_rate_limiter()
+    attempt = 0
 
-    kwargs["headers"]["User-Agent"] = (
-        f"Smartcar/{__version__}({platform.system()}; "
-        f"{platform.machine()}) Python v{platform.python_version()}"
-    )
+    while True:
+        try:
+            while True:
+                wait = _rate_limit_wait(limiter, rate_limit_keys)
+                if not wait:
+                    break
+                time.sleep(wait)
+
+            attempt_timeout = timeouts.attempt_timeout(timeout)
+            response = _send(method, url, attempt_timeout, kwargs)
+
+        except sce.SmartcarException as e:
+            _record_rejection(limiter, rate_limit_keys, e)
+            delay = _retry_delay(policy, e, method, attempt, idempotent)
+            time.sleep(delay)
+            attempt += 1
+            continue
+
+        if limiter is not None:
+            limiter.record_success(rate_limit_keys)
+        response.retry_count = attempt
+        return response
+
+
+async def async_requester(
+    method: str,
+    url: str,
+    retry_policy: retry.RetryPolicy = None,
+    idempotent: bool = None,
+    timeout: timeouts.TimeoutLike = None,
+    rate_limiter: ratelimit.RateLimiter = None,
+    rate_limit_keys: tuple = (),
+    **kwargs,
+) -> transport.TransportResponse:
+    """
+    asyncio version of `requester`, sent with the active AsyncTransport.
+
+    Args:
+        method (str): HTTP method
+
+        url (str): url of the request
+
+        retry_policy (RetryPolicy, optional): Defaults to the policy set with
+            `smartcar.set_retry_policy`
 
+        idempotent (bool, optional): Whether the request is safe to retry after
+            any retryable error. Defaults to deciding from the HTTP method.
+
+        timeout (float | (float, float), optional): connect and read timeout of
+            each attempt. Defaults to the timeout set with `smartcar.set_default_timeout`.
+
+        rate_limiter (RateLimiter, optional): Defaults to the limiter set with
+            `smartcar.set_rate_limiter`
+
+        rate_limit_keys (tuple, optional): buckets the request counts against,
+            see `ratelimit.vehicle_key` and `ratelimit.app_key`
+
+        **kwargs: parameters for the request
+
+    Returns:
+        TransportResponse: response from the request to the Smartcar API
+    """
+    _attach_user_agent(kwargs)
+    _encode_json_body(kwargs)
+    policy = retry_policy or retry.get_retry_policy()
+    limiter = rate_limiter or ratelimit.get_rate_limiter()
+    attempt = 0
+
+    while True:
+        try:
+            while True:
+                wait = _rate_limit_wait(limiter, rate_limit_keys)
+                if not wait:
+                    break
+                await asyncio.sleep(wait)
+
+            attempt_timeout = timeouts.attempt_timeout(timeout)
+            response = await _async_send(method, url, attempt_timeout, kwargs)
+
+        except sce.SmartcarException as e:
+            _record_rejection(limiter, rate_limit_keys, e)
+            delay = _retry_delay(policy, e, method, attempt, idempotent)
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+
+        if limiter is not None:
+            limiter.record_success(rate_limit_keys)
+        response.retry_count = attempt
+        return response
+
+
+def _send(
+    method: str, url: str, timeout: timeouts.Timeout, kwargs: dict
+) -> transport.TransportResponse:
     try:
-        response = requests.request(method, url, timeout=310, **kwargs)
-        code = response.status_code
-        headers = response.headers
-        body = response.text
+        response = transport.get_transport().send(
+            method, url, timeout=tuple(timeout), **kwargs
+        )
+        return _check_response(response)
+
+    except sce.SmartcarException:
+        raise
 
-        if response.ok:
-            return response
-        else:
-            raise sce.exception_factory(code, headers, body)
+    except transport.TransportTimeout as e:
+        raise _timeout_exception(e) from e
 
     except Exception as e:
-        if isinstance(e, sce.SmartcarException):
-            raise e
-        else:
-            raise sce.SmartcarException(message="SDK_ERROR") from e
+        raise sce.SmartcarException(message="SDK_ERROR") from e
+
+
+async def _async_send(
+    method: str, url: str, timeout: timeouts.Timeout, kwargs: dict
+) -> transport.TransportResponse:
+    # A missing httpx is raised as is: it is not a failed request, to retry
+    async_transport = transport.get_async_transport()
+    try:
+        response = await async_transport.send(
+            method, url, timeout=tuple(timeout), **kwargs
+        )
+        return _check_response(response)
+
+    except sce.SmartcarException:
+        raise
+
+    except transport.TransportTimeout as e:
+        raise _timeout_exception(e) from e
+
+    except Exception as e:
+        raise sce.SmartcarException(message="SDK_ERROR") from e
+
+
+def _retry_delay(
+    policy: retry.RetryPolicy,
+    e: sce.SmartcarException,
+    method: str,
+    attempt: int,
+    idempotent: bool,
+) -> float:
+    """
+    Returns (float): seconds to wait before the next attempt
+
+    Raises:
+        SmartcarException: `e` if the request must not be retried, or a
+            SmartcarTimeoutException if the retry would run past the deadline
+    """
+    # Checked on the class first, so that error bodies are not parsed for it
+    is_deadline = (
+        isinstance(e, sce.SmartcarTimeoutException) and e.code == "DEADLINE_EXCEEDED"
+    )
+    delay = None if is_deadline else policy.next_delay(e, method, attempt, idempotent)
+    e.retry_count = attempt
+
+    if delay is None:
+        raise e
+
+    if not timeouts.fits_deadline(delay):
+        deadline_error = timeouts.deadline_exceeded()
+        deadline_error.retry_count = attempt
+        raise deadline_error from e
+
+    return delay
+
+
+def _rate_limit_wait(limiter: ratelimit.RateLimiter, keys: tuple) -> float:
+    """
+    Take a rate limit token for the next attempt of a request.
+
+    Returns (float): seconds to wait before trying again, or 0 once the token
+        was taken
+
+    Raises:
+        SmartcarRateLimitException: if the limiter does not block, or the wait
+            is longer than its `max_wait`
+        SmartcarTimeoutException: if the wait would run past the deadline
+    """
+    if limiter is None or not keys:
+        return 0.0
+
+    wait = limiter.try_acquire(keys)
+    if not wait:
+        return 0.0
+
+    if not limiter.block or (limiter.max_wait is not None and wait > limiter.max_wait):
+        raise limiter.exceeded(wait)
+
+    if not timeouts.fits_deadline(wait):
+        raise timeouts.deadline_exceeded()
+
+    return wait
+
+
+def _record_rejection(
+    limiter: ratelimit.RateLimiter, keys: tuple, e: sce.SmartcarException
+) -> None:
+    if limiter is not None and keys and isinstance(e, sce.RateLimitError):
+        limiter.record_rejection(keys, e)
+
+
+def _timeout_exception(e: transport.TransportTimeout) -> sce.SmartcarException:
+    # The attempt was cut short by the deadline rather than by its own timeout
+    left = timeouts.remaining()
+    if left is not None and left <= 0:
+        return timeouts.deadline_exceeded()
+
+    return sce.SmartcarTimeoutException(
+        type="SDK_TIMEOUT",
+        code=f"{e.phase.upper()}_TIMEOUT",
+        description=f"The request timed out while waiting to {e.phase}.",
+    )
+
+
+def _attach_user_agent(kwargs: dict) -> None:
+    if "headers" not in kwargs:
+        kwargs["headers"] = {}
+
+    kwargs["headers"]["User-Agent"] = USER_AGENT
+
+
+def _encode_json_body(kwargs: dict) -> None:
+    # Serialize JSON bodies with the active codec rather than the transport's
+    body = kwargs.pop("json", None)
+    if body is None:
+        return
+
+    kwargs["data"] = codec.dumps(body)
+    kwargs["headers"].setdefault("Content-Type", "application/json")
+
+
+def _check_response(
+    response: transport.TransportResponse,
+) -> transport.TransportResponse:
+    if response.ok:
+        return response
+    else:
+        raise sce.exception_factory(
+            response.status_code, response.headers, response.text
+        )
 
 
 def validate_env(mode: str = "live") -> None:
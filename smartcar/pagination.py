@@ -0,0 +1,277 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+# Iteration over the items of paged endpoints.
+#
+# 'iter_items' and 'aiter_items' yield the items of a paged endpoint one page at
+# a time: while the items of a page are consumed, the next page is already being
+# requested (on a worker thread, or as a task of the event loop). At most two
+# pages are held at once, whatever the number of items.
+#
+# An endpoint is described by a function requesting one page for a paging dict,
+# the items of a page, and the paging dict of the page after it:
+#
+# - 'next_offset' for limit/offset paging (get_vehicles, Vehicle.permissions),
+#   where the Paging of a page has the total count of items;
+# - 'next_cursor' for cursor paging (get_connections).
+#
+# With offset paging the total count of items is known after the first page, so
+# 'fetch_all' and 'afetch_all' request all the remaining pages at once, at most
+# `max_concurrency` (by default _FETCH_ALL_CONCURRENCY) at a time, and return the
+# items in order.
+
+_FETCH_ALL_CONCURRENCY = 4
+
+
+def next_offset(paging: dict, page: NamedTuple, items: list) -> Optional[dict]:
+    """
+    Returns (dict): the paging of the page after `page`, or None if it is the
+        last page
+    """
+    offset = paging.get("offset", 0) + len(items)
+    if not items or offset >= page.paging.count:
+        return None
+    return dict(paging, offset=offset)
+
+
+def next_cursor(paging: dict, page: NamedTuple, items: list) -> Optional[dict]:
+    """
+    Returns (dict): the paging of the page after `page`, or None if it is the
+        last page
+    """
+    cursor = page.paging.cursor
+    if not items or not cursor:
+        return None
+    return dict(paging, cursor=cursor)
+
+
+def remaining_offsets(paging: dict, page: NamedTuple, items: list) -> List[dict]:
+    """
+    Returns (list): the pagings of the pages after `page`, the first page of an
+        offset paged endpoint. Pages are as long as `page`, which is shorter
+        than the requested limit if Smartcar caps the page size.
+    """
+    if not items:
+        return []
+    limit = paging.get("limit") or len(items)
+    step = min(limit, len(items))
+    start = paging.get("offset", 0) + len(items)
+    return [
+        dict(paging, limit=step, offset=offset)
+        for offset in range(start, page.paging.count, step)
+    ]
+
+
+def fetch_all(
+    fetch_page: Callable[[dict], NamedTuple],
+    items_of: Callable[[NamedTuple], list],
+    paging: dict,
+    max_concurrency: int = _FETCH_ALL_CONCURRENCY,
+) -> Tuple[NamedTuple, list]:
+    """
+    Request the first page of `paging`, then every remaining page in parallel.
+    A page that comes back shorter than expected is completed with sequential
+    requests, so that every item up to the count of the first page is returned.
+
+    Args:
+        fetch_page: requests the page of a paging dict
+
+        items_of: returns the items of a page
+
+        paging (dict): paging of the first page
+
+        max_concurrency (int, optional): Maximum number of pages requested at
+            once
+
+    Returns:
+        (first page, items of every page in order)
+    """
+    _check_concurrency(max_concurrency)
+    first = fetch_page(paging)
+    items = list(items_of(first))
+    pagings = remaining_offsets(paging, first, items)
+    if not pagings:
+        return first, items
+
+    workers = min(max_concurrency, len(pagings))
+    with ThreadPoolExecutor(workers, "smartcar-paging") as executor:
+        # Every page runs in a copy of the caller's context
+        futures = [
+            executor.submit(contextvars.copy_context().run, fetch_page, page_paging)
+            for page_paging in pagings
+        ]
+        try:
+            for page_paging, end, future in zip(
+                pagings, _page_ends(pagings, first), futures
+            ):
+                page_items = items_of(future.result())
+                items.extend(page_items)
+                gap = _gap(page_paging, page_items, end)
+                while gap is not None:
+                    page_items = items_of(fetch_page(gap))
+                    items.extend(page_items[: end - gap["offset"]])
+                    gap = _gap(gap, page_items, end)
+        finally:
+            for future in futures:
+                future.cancel()
+    return first, items
+
+
+async def afetch_all(
+    fetch_page: Callable[[dict], Awaitable[NamedTuple]],
+    items_of: Callable[[NamedTuple], list],
+    paging: dict,
+    max_concurrency: int = _FETCH_ALL_CONCURRENCY,
+) -> Tuple[NamedTuple, list]:
+    """
+    asyncio version of `fetch_all`
+    """
+    _check_concurrency(max_concurrency)
+    first = await fetch_page(paging)
+    items = list(items_of(first))
+    pagings = remaining_offsets(paging, first, items)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(page_paging: dict) -> NamedTuple:
+        async with semaphore:
+            return await fetch_page(page_paging)
+
+    tasks = [asyncio.ensure_future(fetch(page_paging)) for page_paging in pagings]
+    try:
+        for page_paging, end, task in zip(pagings, _page_ends(pagings, first), tasks):
+            page_items = items_of(await task)
+            items.extend(page_items)
+            gap = _gap(page_paging, page_items, end)
+            while gap is not None:
+                page_items = items_of(await fetch_page(gap))
+                items.extend(page_items[: end - gap["offset"]])
+                gap = _gap(gap, page_items, end)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return first, items
+
+
+def _page_ends(pagings: List[dict], first: NamedTuple) -> List[int]:
+    """
+    Returns (list): the offset each page of `pagings` is expected to end at
+    """
+    return [paging["offset"] for paging in pagings[1:]] + [first.paging.count]
+
+
+def _gap(paging: dict, items: list, end: int) -> Optional[dict]:
+    """
+    Returns (dict): the paging of the items missing between the page of
+        `paging` and `end`, or None if the page reached it (or was empty, i.e.
+        there are no more items)
+    """
+    offset = paging["offset"] + len(items)
+    if not items or offset >= end:
+        return None
+    return dict(paging, offset=offset)
+
+
+def _check_concurrency(max_concurrency: int) -> None:
+    if max_concurrency < 1:
+        raise ValueError("'max_concurrency' must be at least 1")
+
+
+def iter_items(
+    fetch_page: Callable[[dict], NamedTuple],
+    items_of: Callable[[NamedTuple], list],
+    next_paging: Callable[[dict, NamedTuple, list], Optional[dict]],
+    paging: dict,
+    prefetch: bool = True,
+) -> Iterator[Any]:
+    """
+    Yield the items of every page, starting with the page of `paging`.
+
+    Args:
+        fetch_page: requests the page of a paging dict
+
+        items_of: returns the items of a page
+
+        next_paging: `next_offset` or `next_cursor`
+
+        paging (dict): paging of the first page
+
+        prefetch (bool, optional): Request the next page on a worker thread while
+            the items of a page are consumed
+
+    Returns:
+        Iterator: the items, in the order of the pages
+    """
+    if not prefetch:
+        while paging is not None:
+            page = fetch_page(paging)
+            items = items_of(page)
+            paging = next_paging(paging, page, items)
+            yield from items
+        return
+
+    executor = ThreadPoolExecutor(1, "smartcar-paging")
+    try:
+        # The worker thread sees the deadline, max_age... of the caller
+        context = contextvars.copy_context()
+        future = executor.submit(context.run, fetch_page, paging)
+        while future is not None:
+            page = future.result()
+            items = items_of(page)
+            paging = next_paging(paging, page, items)
+            future = None
+            if paging is not None:
+                future = executor.submit(context.run, fetch_page, paging)
+            yield from items
+    finally:
+        # Closing the iterator early drops a page still being requested
+        if future is not None:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def aiter_items(
+    fetch_page: Callable[[dict], Awaitable[NamedTuple]],
+    items_of: Callable[[NamedTuple], list],
+    next_paging: Callable[[dict, NamedTuple, list], Optional[dict]],
+    paging: dict,
+    prefetch: bool = True,
+) -> AsyncIterator[Any]:
+    """
+    asyncio version of `iter_items`. The next page is requested by a task of
+    the event loop.
+    """
+    if not prefetch:
+        while paging is not None:
+            page = await fetch_page(paging)
+            items = items_of(page)
+            paging = next_paging(paging, page, items)
+            for item in items:
+                yield item
+        return
+
+    task = asyncio.ensure_future(fetch_page(paging))
+    try:
+        while task is not None:
+            page = await task
+            items = items_of(page)
+            paging = next_paging(paging, page, items)
+            task = None
+            if paging is not None:
+                task = asyncio.ensure_future(fetch_page(paging))
+            for item in items:
+                yield item
+    finally:
+        if task is not None:
+            task.cancel()
@@ -0,0 +1,323 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Iterable, List, Optional, Tuple
+
+import smartcar.exception as sce
+import smartcar.retry as retry
+
+# Client-side rate limiting.
+#
+# Smartcar limits the requests made to each vehicle and by each application, and
+# answers requests over a limit with a 429 RATE_LIMIT error. A RateLimiter spaces
+# requests out before they are sent instead: each request takes a token from the
+# bucket of its vehicle (keyed by vehicle id) and from the bucket of its
+# application (keyed by client id). Buckets refill at a steady rate up to a burst
+# size. A bucket that is full again is the same as a new one, so idle buckets are
+# dropped, and at most `max_buckets` are kept.
+#
+# When Smartcar rejects a request anyway, the limiter learns from it: the
+# rejected bucket is paused for the error's Retry-After and, when `adaptive`,
+# its rate is halved and then recovers gradually with every successful request.
+
+VEHICLE = "vehicle"
+APPLICATION = "application"
+
+Key = Tuple[str, Hashable]
+
+# Rate-limit error codes that name the vehicle rather than the application
+VEHICLE_CODES = frozenset(["VEHICLE"])
+
+
+def vehicle_key(vehicle_id: str) -> Key:
+    """
+    Returns: the rate limit key of requests made to `vehicle_id`
+    """
+    return (VEHICLE, vehicle_id)
+
+
+def app_key(client_id: Optional[str] = None) -> Key:
+    """
+    Args:
+        client_id (str, optional): client id of the application. Defaults to the
+            SMARTCAR_CLIENT_ID environment variable, like `smartcar.AuthClient`,
+            for the requests that do not identify their application (e.g. the
+            ones sent with an access token or an Application Management Token).
+
+    Returns: the rate limit key of requests made by the application
+    """
+    return (APPLICATION, client_id or os.environ.get("SMARTCAR_CLIENT_ID"))
+
+
+class TokenBucket(object):
+    def __init__(self, rate: float, burst: float = None, adaptive: bool = True):
+        """
+        Not thread safe: RateLimiter serializes access to its buckets.
+
+        Args:
+            rate (float): tokens added per second
+
+            burst (float, optional): maximum number of tokens. Defaults to one
+                second worth of tokens, and at least 1.
+
+            adaptive (bool, optional): slow down after rejections
+        """
+        self.rate = float(rate)
+        self.burst = float(burst) if burst is not None else max(1.0, self.rate)
+        self.adaptive = adaptive
+        self.current_rate = self.rate
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def wait_time(self, now: float) -> float:
+        """
+        Returns (float): seconds until a token is available
+        """
+        self._refill(now)
+        wait = max(self.updated - now, 0.0)
+        # Tolerate rounding errors, which would otherwise cause a needless wait
+        if self.tokens < 1 - 1e-9:
+            wait += (1 - self.tokens) / self.current_rate
+        return wait
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+    def reject(self, now: float, retry_after: Optional[float]) -> None:
+        """
+        Pause the bucket for `retry_after` seconds (or until the next token if
+        None), after which it holds a single token.
+        """
+        if self.adaptive:
+            self.current_rate = max(self.rate / 16, self.current_rate / 2)
+
+        pause = retry_after if retry_after is not None else 1 / self.current_rate
+        self.tokens = 1.0
+        self.updated = max(self.updated, now + pause)
+
+    def idle(self, now: float) -> bool:
+        """
+        Returns (bool): whether the bucket is full and at its full rate, i.e.
+            the same as a new bucket
+        """
+        self._refill(now)
+        return (
+            self.tokens >= self.burst
+            and self.current_rate >= self.rate
+            and self.updated <= now
+        )
+
+    def succeed(self) -> None:
+        if self.current_rate < self.rate:
+            self.current_rate = min(self.rate, self.current_rate + self.rate / 10)
+
+    def _refill(self, now: float) -> None:
+        # `updated` is in the future while the bucket is paused
+        if now > self.updated:
+            elapsed = now - self.updated
+            self.tokens = min(self.burst, self.tokens + elapsed * self.current_rate)
+            self.updated = now
+
+
+class RateLimiter(object):
+    def __init__(
+        self,
+        vehicle_rate: float = None,
+        vehicle_burst: float = None,
+        app_rate: float = None,
+        app_burst: float = None,
+        block: bool = True,
+        max_wait: Optional[float] = None,
+        adaptive: bool = True,
+        max_buckets: int = 10000,
+    ):
+        """
+        Spaces requests out to stay under Smartcar's rate limits.
+
+        Args:
+            vehicle_rate (float, optional): Requests per second to each vehicle.
+                None for no limit.
+
+            vehicle_burst (float, optional): Requests that can be sent at once to
+                a vehicle that was idle. Defaults to one second worth of requests.
+
+            app_rate (float, optional): Requests per second by each application.
+                None for no limit.
+
+            app_burst (float, optional): Like `vehicle_burst`, per application
+
+            block (bool, optional): Wait for a token before sending a request. If
+                False, raise a SmartcarRateLimitException instead.
+
+            max_wait (float, optional): When blocking, raise instead of waiting
+                longer than `max_wait` seconds. None for no limit.
+
+            adaptive (bool, optional): Slow down after Smartcar rejects a
+                request, and speed back up gradually after it accepts them
+
+            max_buckets (int, optional): Maximum number of buckets kept. Idle
+                buckets are dropped first, then the least recently used ones.
+        """
+        for name, rate in (("vehicle_rate", vehicle_rate), ("app_rate", app_rate)):
+            if rate is not None and rate <= 0:
+                raise ValueError(f"'{name}' must be positive")
+        if max_buckets < 1:
+            raise ValueError("'max_buckets' must be at least 1")
+
+        self.limits = {
+            VEHICLE: (vehicle_rate, vehicle_burst),
+            APPLICATION: (app_rate, app_burst),
+        }
+        self.block = block
+        self.max_wait = max_wait
+        self.adaptive = adaptive
+        self.max_buckets = max_buckets
+        # Least recently used first
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def wait_time(self, keys: Iterable[Key]) -> float:
+        """
+        Args:
+            keys: rate limit keys of a request, see `vehicle_key` and `app_key`
+
+        Returns:
+            float: seconds until the request could be sent without waiting
+        """
+        with self._lock:
+            return self._wait_time(self._buckets_for(keys), time.monotonic())
+
+    def try_acquire(self, keys: Iterable[Key]) -> float:
+        """
+        Take a token for a request from every bucket it counts against, if they
+        all have one.
+
+        Returns:
+            float: 0 if the request can be sent, otherwise seconds to wait before
+                trying again
+        """
+        with self._lock:
+            buckets = self._buckets_for(keys)
+            wait = self._wait_time(buckets, time.monotonic())
+            if wait == 0:
+                for bucket in buckets:
+                    bucket.take()
+            return wait
+
+    def record_success(self, keys: Iterable[Key]) -> None:
+        if not self.adaptive:
+            return
+        with self._lock:
+            for bucket in self._buckets_for(keys):
+                bucket.succeed()
+
+    def record_rejection(
+        self, keys: Iterable[Key], exception: sce.SmartcarException
+    ) -> None:
+        """
+        Learn from a RATE_LIMIT error: pause the vehicle's bucket if Smartcar
+        rejected the request because of the vehicle, otherwise the application's.
+        """
+        kind = (
+            VEHICLE
+            if getattr(exception, "code", None) in VEHICLE_CODES
+            else APPLICATION
+        )
+        retry_after = retry.parse_retry_after(getattr(exception, "retry_after", None))
+
+        with self._lock:
+            now = time.monotonic()
+            for bucket in self._buckets_for(key for key in keys if key[0] == kind):
+                bucket.reject(now, retry_after)
+
+    def exceeded(self, wait: float) -> sce.SmartcarException:
+        """
+        Returns (SmartcarRateLimitException): the error raised instead of
+            waiting `wait` seconds for a token
+        """
+        return sce.SmartcarRateLimitException(
+            type="SDK_RATE_LIMIT",
+            code="CLIENT_RATE_LIMIT",
+            description=f"The client-side rate limit was reached. Retry in {wait:.3f}s.",
+            retry_after=wait,
+        )
+
+    def _buckets_for(self, keys: Iterable[Key]) -> List[TokenBucket]:
+        keys = list(keys)
+        new = sum(
+            1
+            for key in keys
+            if key not in self._buckets
+            and self.limits.get(key[0], (None, None))[0] is not None
+        )
+        if new:
+            self._evict(time.monotonic(), new)
+        return [bucket for bucket in map(self._bucket, keys) if bucket is not None]
+
+    def _bucket(self, key: Key) -> Optional[TokenBucket]:
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            self._buckets.move_to_end(key)
+            return bucket
+
+        rate, burst = self.limits.get(key[0], (None, None))
+        if rate is None:
+            return None
+        bucket = self._buckets[key] = TokenBucket(rate, burst, self.adaptive)
+        return bucket
+
+    def _evict(self, now: float, room: int) -> None:
+        """
+        Make room for `room` new buckets. Drops the idle buckets that were used
+        least recently, until one is not, then the other idle buckets and the
+        least recently used ones if there are still too many.
+        """
+        buckets = self._buckets
+        while buckets:
+            key, bucket = next(iter(buckets.items()))
+            if not bucket.idle(now):
+                break
+            del buckets[key]
+
+        limit = max(self.max_buckets - room, 0)
+        if len(buckets) > limit:
+            for key in [key for key, bucket in buckets.items() if bucket.idle(now)]:
+                del buckets[key]
+        while len(buckets) > limit:
+            buckets.popitem(last=False)
+
+    @staticmethod
+    def _wait_time(buckets: list, now: float) -> float:
+        return max([bucket.wait_time(now) for bucket in buckets], default=0.0)
+
+
+# Default limiter
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Returns:
+        RateLimiter: the limiter used by requests that do not set their own, or
+            None if requests are not rate limited
+    """
+    return _rate_limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """
+    Replace the limiter used by requests that do not set their own.
+
+    Args:
+        limiter (RateLimiter): e.g. `smartcar.RateLimiter(vehicle_rate=1)`, or
+            None to stop rate limiting
+    """
+    global _rate_limiter
+    if limiter is not None and not isinstance(limiter, RateLimiter):
+        raise TypeError("'limiter' must be an instance of smartcar.RateLimiter or None")
+
+    with _rate_limiter_lock:
+        _rate_limiter = limiter
@@ -0,0 +1,212 @@
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional, Union
+
+import smartcar.exception as sce
+import smartcar.transport as transport
+
+# Retry policies for 'helpers.requester' and 'helpers.async_requester'.
+#
+# A failed request is retried when its SmartcarException is retryable (keyed on
+# its `type`, or `type` and `code`, or on its HTTP status code) AND retrying is
+# safe for the request: idempotent requests (e.g. GET) can be retried after any
+# retryable error, but non-idempotent ones (e.g. POST /security to lock a
+# vehicle) are only retried when Smartcar rejected them outright with a
+# RATE_LIMIT error, i.e. when they were never processed.
+#
+# The wait before a retry is the error's Retry-After value when it has one,
+# otherwise an exponential backoff with full jitter.
+
+# Retryable errors, as SmartcarException types or (type, code) pairs
+DEFAULT_RETRYABLE = frozenset(
+    [
+        "RATE_LIMIT",
+        "SERVER",
+        ("UPSTREAM", "RATE_LIMIT"),
+        ("UPSTREAM", "UNKNOWN_ISSUE"),
+    ]
+)
+
+DEFAULT_RETRY_ON_STATUS = frozenset([429, 500, 502, 503, 504])
+
+DEFAULT_IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+# Errors that guarantee a request was rejected without being processed
+REJECTED_TYPES = frozenset(["RATE_LIMIT"])
+
+# Causes of an SDK_ERROR that mean the connection failed, before a response
+CONNECTION_ERRORS = (transport.TransportConnectionError, ConnectionError)
+
+
+class RetryPolicy(object):
+    def __init__(
+        self,
+        max_attempts: int = 1,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        jitter: bool = True,
+        max_retry_after: Optional[float] = 60.0,
+        retryable: Iterable[Union[str, tuple]] = DEFAULT_RETRYABLE,
+        retry_on_status: Iterable[int] = DEFAULT_RETRY_ON_STATUS,
+        retry_on_connection_error: bool = True,
+        idempotent_methods: Iterable[str] = DEFAULT_IDEMPOTENT_METHODS,
+    ):
+        """
+        Decides whether, and after how long, a failed request is retried.
+
+        Args:
+            max_attempts (int, optional): Total number of attempts, including the
+                first one. Defaults to 1 (no retries).
+
+            backoff_base (float, optional): Backoff in seconds before the first retry,
+                doubled for every following retry
+
+            backoff_max (float, optional): Maximum backoff in seconds
+
+            jitter (bool, optional): Wait a random time between 0 and the backoff
+
+            max_retry_after (float, optional): Errors with a longer Retry-After (in
+                seconds) are raised instead of retried. None for no limit.
+
+            retryable (iterable, optional): SmartcarException types (e.g. "SERVER")
+                or (type, code) pairs (e.g. ("UPSTREAM", "RATE_LIMIT")) to retry
+
+            retry_on_status (iterable, optional): HTTP status codes to retry
+
+            retry_on_connection_error (bool, optional): Retry idempotent requests
+                that failed before a response was received
+
+            idempotent_methods (iterable, optional): HTTP methods that are safe to
+                send more than once
+        """
+        if max_attempts < 1:
+            raise ValueError("'max_attempts' must be at least 1")
+
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.max_retry_after = max_retry_after
+        self.retryable = frozenset(retryable)
+        self.retry_on_status = frozenset(retry_on_status)
+        self.retry_on_connection_error = retry_on_connection_error
+        self.idempotent_methods = frozenset(m.upper() for m in idempotent_methods)
+
+    def next_delay(
+        self,
+        exception: sce.SmartcarException,
+        method: str,
+        attempt: int,
+        idempotent: Optional[bool] = None,
+    ) -> Optional[float]:
+        """
+        Args:
+            exception (SmartcarException): the error raised by the last attempt
+
+            method (str): HTTP method of the request
+
+            attempt (int): number of attempts made so far, minus one
+
+            idempotent (bool, optional): Overrides `idempotent_methods` for this
+                request (e.g. batch requests are POSTs that only read data)
+
+        Returns:
+            float: seconds to wait before retrying, or None to raise `exception`
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+
+        if idempotent is None:
+            idempotent = method.upper() in self.idempotent_methods
+
+        if not self.is_retryable(exception, idempotent):
+            return None
+
+        retry_after = parse_retry_after(getattr(exception, "retry_after", None))
+        if retry_after is not None:
+            if self.max_retry_after is not None and retry_after > self.max_retry_after:
+                return None
+            return retry_after
+
+        backoff = min(self.backoff_max, self.backoff_base * (2**attempt))
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+
+    def is_retryable(self, exception: sce.SmartcarException, idempotent: bool) -> bool:
+        error_type = getattr(exception, "type", None)
+        error_code = getattr(exception, "code", None)
+
+        if not idempotent:
+            return error_type in REJECTED_TYPES
+
+        if error_type in self.retryable or (error_type, error_code) in self.retryable:
+            return True
+
+        status_code = getattr(exception, "status_code", None)
+        if status_code is not None:
+            return status_code in self.retry_on_status
+
+        # No response: only retry failed connections (e.g. a connection reset),
+        # not other errors of the transport (e.g. a missing library)
+        return self.retry_on_connection_error and isinstance(
+            exception.__cause__, CONNECTION_ERRORS
+        )
+
+
+def parse_retry_after(retry_after) -> Optional[float]:
+    """
+    Args:
+        retry_after: Retry-After value, in seconds or as an HTTP date
+
+    Returns:
+        float: seconds to wait, or None if `retry_after` is missing or invalid
+    """
+    if retry_after is None:
+        return None
+
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(str(retry_after))
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+# Default policy
+
+_retry_policy = RetryPolicy()
+_retry_policy_lock = threading.Lock()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """
+    Returns:
+        RetryPolicy: the policy used by requests that do not set their own
+    """
+    return _retry_policy
+
+
+def set_retry_policy(policy: RetryPolicy) -> None:
+    """
+    Replace the policy used by requests that do not set their own.
+
+    Args:
+        policy (RetryPolicy): e.g. `smartcar.RetryPolicy(max_attempts=3)`
+    """
+    global _retry_policy
+    if not isinstance(policy, RetryPolicy):
+        raise TypeError("'policy' must be an instance of smartcar.RetryPolicy")
+
+    with _retry_policy_lock:
+        _retry_policy = policy
@@ -0,0 +1,200 @@
+import threading
+import time
+from http import cookiejar
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Pooled HTTP sessions for requests to Smartcar.
+#
+# 'requests.request' builds a brand new Session (and with it, a brand new
+# connection pool) on every call, which means a new TCP + TLS handshake for
+# every request. Every request sent by the SDK goes through a single, shared
+# SessionManager instead, so connections to Smartcar are kept alive and reused
+# across Vehicle, AuthClient and the management functions.
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_IDLE = 60.0
+
+
+class SessionManager(object):
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keep_alive: bool = True,
+        max_idle: Optional[float] = DEFAULT_MAX_IDLE,
+    ):
+        """
+        Thread-safe owner of a pooled requests.Session.
+
+        The session is built lazily on first use. If it sits idle (no requests
+        in flight) for longer than `max_idle` seconds, its pooled connections
+        are closed and a fresh session is built on the next request, so stale
+        keep-alive connections are not handed out after long quiet periods.
+
+        Args:
+            pool_connections (int, optional): Number of per-host connection pools to cache
+
+            pool_maxsize (int, optional): Maximum number of connections kept per host
+
+            keep_alive (bool, optional): Set to False to close connections after
+                every request
+
+            max_idle (float, optional): Seconds a session may sit idle before its
+                connections are evicted. None disables eviction.
+        """
+        if pool_connections < 1 or pool_maxsize < 1:
+            raise ValueError("'pool_connections' and 'pool_maxsize' must be at least 1")
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.max_idle = max_idle
+
+        self._lock = threading.Lock()
+        self._session = None
+        self._in_flight = 0
+        self._last_used = 0.0
+        # Set once replaced by `configure_session`: the session is then closed
+        # whenever its last request in flight completes
+        self._retired = False
+
+    def request(self, method: str, url: str, **kwargs) -> requests.models.Response:
+        """
+        Send a request using the pooled session.
+
+        Args:
+            method (str): HTTP method
+
+            url (str): url of the request
+
+            **kwargs: parameters for requests.Session.request
+
+        Returns:
+            requests.models.Response
+        """
+        session = self._acquire()
+        try:
+            return session.request(method, url, **kwargs)
+        finally:
+            self._release()
+
+    def close(self) -> None:
+        """
+        Close the current session and all of its pooled connections. A new
+        session is built on the next request.
+        """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _acquire(self) -> requests.Session:
+        with self._lock:
+            now = time.monotonic()
+
+            if (
+                self._session is not None
+                and self._in_flight == 0
+                and self.max_idle is not None
+                and now - self._last_used > self.max_idle
+            ):
+                self._session.close()
+                self._session = None
+
+            if self._session is None:
+                self._session = self._build_session()
+
+            self._in_flight += 1
+            self._last_used = now
+            return self._session
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._last_used = time.monotonic()
+            if self._retired and self._in_flight == 0:
+                self._session.close()
+                self._session = None
+
+    def _retire(self) -> None:
+        """
+        Close the session once the requests in flight complete.
+        """
+        with self._lock:
+            self._retired = True
+            if self._session is not None and self._in_flight == 0:
+                self._session.close()
+                self._session = None
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+
+        # Retries are handled by the SDK, not by urllib3.
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=0,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        # The session is shared by every user and vehicle in the process, so it
+        # must never carry cookies from one request over to the next.
+        session.cookies.set_policy(cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+
+        return session
+
+
+_manager = SessionManager()
+_manager_lock = threading.Lock()
+
+
+def get_session_manager() -> SessionManager:
+    """
+    Returns:
+        SessionManager: the manager shared by every request the SDK sends
+    """
+    return _manager
+
+
+def configure_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    keep_alive: bool = True,
+    max_idle: Optional[float] = DEFAULT_MAX_IDLE,
+) -> SessionManager:
+    """
+    Replace the shared session manager. Connections held by the previous
+    manager are closed, once the requests it is sending complete.
+
+    Args:
+        pool_connections (int, optional): Number of per-host connection pools to cache
+
+        pool_maxsize (int, optional): Maximum number of connections kept per host.
+            Set this to at least the number of threads sending requests concurrently.
+
+        keep_alive (bool, optional): Set to False to close connections after
+            every request
+
+        max_idle (float, optional): Seconds a session may sit idle before its
+            connections are evicted. None disables eviction.
+
+    Returns:
+        SessionManager: the new shared manager
+    """
+    global _manager
+    new_manager = SessionManager(pool_connections, pool_maxsize, keep_alive, max_idle)
+
+    with _manager_lock:
+        old_manager = _manager
+        _manager = new_manager
+
+    old_manager._retire()
+    return new_manager
@@ -1,13 +1,16 @@
 import base64
 import hmac
 import hashlib
+import operator
 import os
 import re
-from typing import NamedTuple, List, Dict, Optional, Union
+from typing import NamedTuple, Iterator, List, Dict, Optional, Union
 from warnings import warn
 
 import smartcar.config as config
 import smartcar.helpers as helpers
+import smartcar.pagination as pagination
+import smartcar.ratelimit as ratelimit
 import smartcar.types as types
 
 API_VERSION = "2.0"
@@ -57,12 +60,19 @@ def get_user(access_token: str) -> types.User:
     """
     url = f"{config.API_URL}/v{API_VERSION}/user"
     headers = {"Authorization": f"Bearer {access_token}"}
-    response = helpers.requester("GET", url, headers=headers)
+    response = helpers.requester(
+        "GET", url, headers=headers, rate_limit_keys=(ratelimit.app_key(),)
+    )
 
     return types.select_named_tuple("user", response)
 
 
-def get_vehicles(access_token: str, paging: dict = None) -> types.Vehicles:
+def get_vehicles(
+    access_token: str,
+    paging: dict = None,
+    fetch_all: bool = False,
+    max_concurrency: int = pagination._FETCH_ALL_CONCURRENCY,
+) -> types.Vehicles:
     """
     Get a list of the user's vehicle ids
 
@@ -75,20 +85,71 @@ def get_vehicles(access_token: str, paging: dict = None) -> types.Vehicles:
 
             offset (int, optional): The index to start the vehicle list at
 
+        fetch_all (bool, optional): Return the vehicle ids of every page from
+            `paging` on. The pages after the first one are requested in parallel.
+
+        max_concurrency (int, optional): With `fetch_all`, the maximum number of
+            pages requested at once
+
     Returns:
         Vehicles: NamedTuple("Vehicles", [("vehicles", List[str]), ("paging", Paging), ("meta", namedtuple)])
 
     Raises:
         SmartcarException
     """
+    if fetch_all:
+        first, vehicles = pagination.fetch_all(
+            lambda page_paging: get_vehicles(access_token, page_paging),
+            operator.attrgetter("vehicles"),
+            paging or {},
+            max_concurrency,
+        )
+        return first._replace(vehicles=vehicles)
+
     url = f"{config.API_URL}/v{API_VERSION}/vehicles"
     headers = {"Authorization": f"Bearer {access_token}"}
     params = paging if paging is not None else None
-    response = helpers.requester("GET", url, headers=headers, params=params)
+    response = helpers.requester(
+        "GET",
+        url,
+        headers=headers,
+        params=params,
+        rate_limit_keys=(ratelimit.app_key(),),
+    )
 
     return types.select_named_tuple("vehicles", response)
 
 
+def iter_vehicles(
+    access_token: str, limit: int = 50, prefetch: bool = True
+) -> Iterator[str]:
+    """
+    Iterate over all the user's vehicle ids, requesting `limit` of them at a
+    time. While the ids of a page are consumed, the next page is prefetched.
+
+    Args:
+        access_token (str): A valid access token from a previously retrieved
+            access object
+
+        limit (int, optional): The number of vehicle ids requested at a time
+
+        prefetch (bool, optional): Request the next page in the background
+
+    Returns:
+        Iterator[str]: vehicle ids
+
+    Raises:
+        SmartcarException
+    """
+    return pagination.iter_items(
+        lambda page_paging: get_vehicles(access_token, page_paging),
+        operator.attrgetter("vehicles"),
+        pagination.next_offset,
+        {"limit": limit, "offset": 0},
+        prefetch,
+    )
+
+
 def get_compatibility(
     vin: str, scope: List[str], country: str = "US", options: dict = None
 ) -> Union[types.CompatibilityV1, types.CompatibilityV2]:
@@ -142,6 +203,29 @@ def get_compatibility(
             ],
         )
     """
+    url, headers, params, api_version, client_id = _compatibility_request(
+        vin, scope, country, options
+    )
+    response = helpers.requester(
+        "GET",
+        url,
+        headers=headers,
+        params=params,
+        rate_limit_keys=(ratelimit.app_key(client_id),),
+    )
+
+    return types.select_named_tuple(_compatibility_path(api_version), response)
+
+
+def _compatibility_request(
+    vin: str, scope: List[str], country: str = "US", options: dict = None
+) -> tuple:
+    """
+    Validate the arguments to `get_compatibility`.
+
+    Returns:
+        (url, headers, params, api_version, client_id) of the compatibility request
+    """
     client_id = os.environ.get("SMARTCAR_CLIENT_ID")
     client_secret = os.environ.get("SMARTCAR_CLIENT_SECRET")
     api_version = API_VERSION
@@ -204,12 +288,14 @@ def get_compatibility(
     base64_id_secret = base64_bytes.decode("ascii")
     headers = {"Authorization": f"Basic {base64_id_secret}"}
 
-    response = helpers.requester("GET", url, headers=headers, params=params)
+    return url, headers, params, api_version, client_id
+
 
+def _compatibility_path(api_version: str) -> str:
     if api_version == "1.0":
-        return types.select_named_tuple("compatibility_v1", response)
+        return "compatibility_v1"
     elif api_version == "2.0":
-        return types.select_named_tuple("compatibility_v2", response)
+        return "compatibility_v2"
     else:
         raise Exception("Please use a valid API version (e.g. '1.0' or '2.0')")
 
@@ -285,6 +371,59 @@ def get_connections(
     Returns:
         GetConnections: A named tuple containing connections, paging information, and meta data.
     """
+    url, headers, params = _connections_request(amt, filter, paging)
+    response = helpers.requester(
+        "GET",
+        url,
+        headers=headers,
+        params=params,
+        rate_limit_keys=(ratelimit.app_key(),),
+    )
+
+    return _format_connections(response)
+
+
+def iter_connections(
+    amt: str,
+    filter: Optional[Dict[str, str]] = None,
+    limit: Optional[int] = None,
+    prefetch: bool = True,
+) -> Iterator[types.Connection]:
+    """
+    Iterate over all the connections of the application, following the paging
+    cursors of `get_connections`. While the connections of a page are consumed,
+    the next page is prefetched.
+
+    Args:
+        amt (str): Application Management Token from Smartcar Dashboard
+
+        filter (dict, optional): see `get_connections`
+
+        limit (int, optional): The number of connections requested at a time
+
+        prefetch (bool, optional): Request the next page in the background
+
+    Returns:
+        Iterator[Connection]
+    """
+    return pagination.iter_items(
+        lambda page_paging: get_connections(amt, filter, page_paging),
+        operator.attrgetter("connections"),
+        pagination.next_cursor,
+        {} if limit is None else {"limit": limit},
+        prefetch,
+    )
+
+
+def _connections_request(
+    amt: str,
+    filter: Optional[Dict[str, str]] = None,
+    paging: Optional[Dict[str, Optional[int]]] = None,
+) -> tuple:
+    """
+    Returns:
+        (url, headers, params) of the `get_connections` request
+    """
     if filter is None:
         filter = {}
     if paging is None:
@@ -302,7 +441,10 @@ def get_connections(
 
     url = f"{config.MANAGEMENT_API_URL}/v{get_api_version()}/management/connections/"
     headers = {"Authorization": f"Basic {get_management_token(amt)}"}
-    response = helpers.requester("GET", url, headers=headers, params=params)
+    return url, headers, params
+
+
+def _format_connections(response) -> types.GetConnections:
     data = response.json()
     connections = [
         types.Connection(c.get("vehicleId"), c.get("userId"), c.get("connectedAt"))
@@ -315,7 +457,7 @@ def get_connections(
     return types.GetConnections(
         connections,
         response_paging,
-        types.build_meta(response.headers),
+        types.build_meta(response.headers, response.retry_count),
     )
 
 
@@ -352,7 +494,13 @@ def delete_connections(amt: str, filter: dict = {}) -> types.DeleteConnections:
 
     url = f"{config.MANAGEMENT_API_URL}/v{get_api_version()}/management/connections/"
     headers = {"Authorization": f"Basic {get_management_token(amt)}"}
-    response = helpers.requester("DELETE", url, headers=headers, params=params)
+    response = helpers.requester(
+        "DELETE",
+        url,
+        headers=headers,
+        params=params,
+        rate_limit_keys=(ratelimit.app_key(),),
+    )
     data = response.json()
     connections = [
         types.Connection(c.get("vehicleId"), c.get("userId"), c.get("connectedAt"))
@@ -361,5 +509,5 @@ def delete_connections(amt: str, filter: dict = {}) -> types.DeleteConnections:
 
     return types.DeleteConnections(
         connections,
-        types.build_meta(response.headers),
+        types.build_meta(response.headers, response.retry_count),
     )
@@ -0,0 +1,147 @@
+import contextlib
+import contextvars
+import threading
+import time
+from typing import NamedTuple, Optional, Tuple, Union
+
+import smartcar.exception as sce
+
+# Request timeouts and end-to-end deadlines.
+#
+# Every attempt of a request is bounded by a connect and a read timeout. They
+# are resolved from, in order of precedence: the endpoint's timeout, the
+# client's timeout, and the default set with 'set_default_timeout'.
+#
+# A deadline (see 'deadline') bounds everything sent inside it: all attempts
+# of a request, the waits between retries, and every request of a multi-request
+# operation. Each attempt's timeouts are cut down to the time left, and running
+# out raises a SmartcarTimeoutException with code "DEADLINE_EXCEEDED".
+
+Timeout = NamedTuple("Timeout", [("connect", float), ("read", float)])
+
+TimeoutLike = Union[None, float, Tuple[float, float], Timeout]
+
+_default_timeout = Timeout(310.0, 310.0)
+_default_timeout_lock = threading.Lock()
+
+# Absolute time.monotonic() of the innermost deadline, if any
+_deadline = contextvars.ContextVar("smartcar_deadline", default=None)
+
+
+def to_timeout(timeout: TimeoutLike) -> Optional[Timeout]:
+    """
+    Args:
+        timeout: seconds for both connect and read, or a (connect, read) pair
+
+    Returns:
+        Timeout, or None if `timeout` is None
+    """
+    if timeout is None:
+        return None
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return Timeout(float(connect), float(read))
+    return Timeout(float(timeout), float(timeout))
+
+
+def get_default_timeout() -> Timeout:
+    """
+    Returns:
+        Timeout: the timeout of requests that do not set their own
+    """
+    return _default_timeout
+
+
+def set_default_timeout(timeout: TimeoutLike) -> None:
+    """
+    Set the timeout of requests that do not set their own.
+
+    Args:
+        timeout (float | (float, float)): seconds for both connect and read,
+            or a (connect, read) pair
+    """
+    global _default_timeout
+    if timeout is None:
+        raise ValueError("'timeout' must be a number or a (connect, read) pair")
+
+    with _default_timeout_lock:
+        _default_timeout = to_timeout(timeout)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float):
+    """
+    Bound every request sent inside the block (including retries) to a total of
+    `seconds`. Nested deadlines can only shorten the time left.
+
+    Works across threads only for code running in the same context: use
+    `contextvars.copy_context().run` to carry a deadline into a worker thread.
+    asyncio tasks created inside the block inherit it.
+
+    Args:
+        seconds (float): time budget for the block
+
+    Raises:
+        SmartcarTimeoutException: when a request is sent, or a retry is
+            scheduled, past the deadline
+    """
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """
+    Returns:
+        float: seconds left before the current deadline, or None if there is none
+    """
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def attempt_timeout(timeout: TimeoutLike = None) -> Timeout:
+    """
+    Resolve the timeout of a single attempt of a request.
+
+    Args:
+        timeout: the request's own timeout, if any
+
+    Returns:
+        Timeout: `timeout` (or the default), cut down to the current deadline
+
+    Raises:
+        SmartcarTimeoutException: if the current deadline has passed
+    """
+    resolved = to_timeout(timeout) or _default_timeout
+    left = remaining()
+    if left is None:
+        return resolved
+    if left <= 0:
+        raise deadline_exceeded()
+    return Timeout(min(resolved.connect, left), min(resolved.read, left))
+
+
+def fits_deadline(delay: float) -> bool:
+    """
+    Returns (bool): whether waiting `delay` seconds stays within the current
+        deadline
+    """
+    left = remaining()
+    return left is None or delay < left
+
+
+def deadline_exceeded() -> sce.SmartcarTimeoutException:
+    return sce.SmartcarTimeoutException(
+        type="SDK_TIMEOUT",
+        code="DEADLINE_EXCEEDED",
+        description="The deadline for this request ran out.",
+    )
@@ -0,0 +1,213 @@
+import asyncio
+import contextvars
+import inspect
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Hashable
+
+import smartcar.types as types
+
+# Access tokens that refresh themselves.
+#
+# A TokenManager holds the Access of each user or vehicle (under any hashable
+# key) and hands out their access tokens. An Access is refreshed with its
+# AuthClient `refresh_margin` seconds before it expires, when its token is
+# requested. Threads (or tasks) that need the same token while it is being
+# refreshed wait for that refresh instead of sending their own, so a refresh
+# token is only ever exchanged once.
+#
+# `smartcar.Vehicle` takes a TokenManager in place of an access token, and then
+# requests the token of its vehicle id (or of its `token_key` option) before
+# every request.
+
+
+class TokenManager(object):
+    def __init__(
+        self,
+        auth_client,
+        refresh_margin: float = 300.0,
+        on_refresh: Callable[[Hashable, types.Access], None] = None,
+    ):
+        """
+        Args:
+            auth_client (AuthClient | AsyncAuthClient): Client exchanging the
+                refresh tokens
+
+            refresh_margin (float, optional): Seconds before its expiration at
+                which an access token is refreshed
+
+            on_refresh (callable, optional): Called with (key, Access) after each
+                refresh, e.g. to store the new refresh token
+        """
+        if refresh_margin < 0:
+            raise ValueError("'refresh_margin' must not be negative")
+
+        self.auth_client = auth_client
+        self.refresh_margin = refresh_margin
+        self.on_refresh = on_refresh
+        self._access = {}
+        self._locks = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def set(self, key: Hashable, access: types.Access) -> None:
+        """
+        Hold `access` for `key`, e.g. the Access of `AuthClient.exchange_code`.
+        """
+        with self._lock:
+            self._access[key] = access
+
+    def remove(self, key: Hashable) -> None:
+        with self._lock:
+            self._access.pop(key, None)
+            self._locks.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._access
+
+    def get(self, key: Hashable) -> types.Access:
+        """
+        Returns:
+            Access: the Access of `key`, refreshed first if it expires within
+                `refresh_margin`
+
+        Raises:
+            KeyError: if no Access is held for `key`
+            SmartcarException: if the refresh fails
+        """
+        access = self._current(key)
+        if not self._expiring(access):
+            return access
+        return self._refresh(key, access)
+
+    def access_token(self, key: Hashable) -> str:
+        """
+        Returns (str): a valid access token of `key`, see `get`
+        """
+        return self.get(key).access_token
+
+    def refresh(self, key: Hashable) -> types.Access:
+        """
+        Refresh the Access of `key` now, e.g. after its token was revoked.
+
+        Returns:
+            Access: the new Access
+        """
+        return self._refresh(key, self._current(key))
+
+    async def async_get(self, key: Hashable) -> types.Access:
+        """
+        asyncio version of `get`. With a synchronous AuthClient, the refresh
+        runs on the default executor.
+        """
+        access = self._current(key)
+        if not self._expiring(access):
+            return access
+        return await self._async_refresh(key, access)
+
+    async def async_access_token(self, key: Hashable) -> str:
+        """
+        asyncio version of `access_token`
+        """
+        return (await self.async_get(key)).access_token
+
+    async def async_refresh(self, key: Hashable) -> types.Access:
+        """
+        asyncio version of `refresh`
+        """
+        return await self._async_refresh(key, self._current(key))
+
+    def _current(self, key: Hashable) -> types.Access:
+        with self._lock:
+            return self._access[key]
+
+    def _expiring(self, access: types.Access) -> bool:
+        expiration = access.expiration
+        if expiration is None:
+            return False
+        # Access.expiration is a naive UTC datetime
+        now = datetime.now(timezone.utc)
+        if expiration.tzinfo is None:
+            now = now.replace(tzinfo=None)
+        return expiration - timedelta(seconds=self.refresh_margin) <= now
+
+    def _key_lock(self, key: Hashable) -> threading.Lock:
+        # The one critical section of the refreshes of `key`, held by a thread
+        # of `_refresh` or by the task of `_async_refresh` running the exchange
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _refresh(self, key: Hashable, stale: types.Access) -> types.Access:
+        with self._key_lock(key):
+            # Another thread (or task) refreshed it while this one waited
+            current = self._current(key)
+            if current is not stale:
+                return current
+
+            access = self.auth_client.exchange_refresh_token(stale.refresh_token)
+            if inspect.isawaitable(access):
+                access.close()
+                raise TypeError(
+                    "An AsyncAuthClient can only refresh tokens with the "
+                    "asyncio methods of TokenManager, e.g. `async_access_token`"
+                )
+            return self._store(key, access)
+
+    async def _async_refresh(self, key: Hashable, stale: types.Access) -> types.Access:
+        # Tasks only collapse the refreshes of one event loop; the key lock
+        # serializes them with the other loops and threads
+        task_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = asyncio.ensure_future(self._exchange(key, stale))
+                self._tasks[task_key] = task
+                task.add_done_callback(lambda _: self._forget_task(task_key, task))
+        # A cancelled caller does not cancel the refresh the others wait for
+        return await asyncio.shield(task)
+
+    def _forget_task(self, task_key: tuple, task: asyncio.Future) -> None:
+        with self._lock:
+            if self._tasks.get(task_key) is task:
+                del self._tasks[task_key]
+
+    async def _exchange(self, key: Hashable, stale: types.Access) -> types.Access:
+        lock = self._key_lock(key)
+        await _acquire(lock)
+        try:
+            current = self._current(key)
+            if current is not stale:
+                return current
+
+            exchange = self.auth_client.exchange_refresh_token
+            if inspect.iscoroutinefunction(exchange):
+                access = await exchange(stale.refresh_token)
+            else:
+                context = contextvars.copy_context()
+                access = await asyncio.get_running_loop().run_in_executor(
+                    None, context.run, exchange, stale.refresh_token
+                )
+            return self._store(key, access)
+        finally:
+            lock.release()
+
+    def _store(self, key: Hashable, access: types.Access) -> types.Access:
+        self.set(key, access)
+        if self.on_refresh is not None:
+            self.on_refresh(key, access)
+        return access
+
+
+async def _acquire(lock: threading.Lock) -> None:
+    """
+    Acquire a threading.Lock without blocking the event loop.
+    """
+    if lock.acquire(blocking=False):
+        return
+    acquiring = asyncio.get_running_loop().run_in_executor(None, lock.acquire)
+    try:
+        await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        # The executor still acquires it, for no one
+        acquiring.add_done_callback(lambda _: lock.release())
+        raise
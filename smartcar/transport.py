@@ -0,0 +1,524 @@
+import asyncio
+import threading
+from typing import Optional, Tuple, Union
+
+import requests
+import requests.structures as rs
+
+import smartcar.codec as codec
+import smartcar.session as session
+
+# Transports send a single HTTP request and return its status, headers and body.
+#
+# 'helpers.requester' hands every request to the active transport and only ever
+# sees a TransportResponse, so Vehicle, AuthClient and the static methods do not
+# depend on a particular HTTP library. RequestsTransport (the default) sends
+# requests through the pooled 'requests' session. HttpxTransport is an optional
+# backend that can multiplex many concurrent requests over a few HTTP/2
+# connections.
+#
+# AsyncTransport is the asyncio counterpart used by 'helpers.async_requester'
+# (and with it, everything in 'smartcar.aio'). Unless one is set, each event loop
+# gets a default HttpxAsyncTransport, which is closed when `asyncio.run` shuts the
+# loop down, or by `aclose_default_transports`.
+
+Timeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+
+class TransportResponse(object):
+    __slots__ = ("status_code", "headers", "content", "retry_count")
+
+    def __init__(
+        self, status_code: int, headers: rs.CaseInsensitiveDict, content: bytes
+    ):
+        """
+        A transport-agnostic HTTP response.
+
+        Args:
+            status_code (int): HTTP status code
+
+            headers (CaseInsensitiveDict): response headers
+
+            content (bytes): raw response body
+
+        Attributes:
+            self.retry_count (int): Number of times the request was retried
+                before this response was received
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.retry_count = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self._encoding(), errors="replace")
+
+    def json(self):
+        return codec.loads(self.content)
+
+    def _encoding(self) -> str:
+        content_type = self.headers.get("Content-Type", "")
+        for param in content_type.split(";")[1:]:
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "charset" and value:
+                return value.strip("\"'")
+        return "utf-8"
+
+
+class TransportTimeout(Exception):
+    def __init__(self, phase: str):
+        """
+        Raised by transports when a request times out.
+
+        Args:
+            phase (str): "connect" or "read"
+        """
+        self.phase = phase
+        super().__init__(f"{phase} timeout")
+
+
+class TransportConnectionError(Exception):
+    """
+    Raised by transports when a request fails before a complete response is
+    received: the connection could not be opened, or was reset or closed. Only
+    these failures (and timeouts) are retried as connection errors.
+    """
+
+
+class Transport(object):
+    """
+    Base class for transports. Subclasses must implement `send`, and must be
+    safe to call from multiple threads at once.
+    """
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        data: dict = None,
+        json: dict = None,
+        auth: tuple = None,
+        timeout: Timeout = None,
+    ) -> TransportResponse:
+        """
+        Send a request and return the response, whatever its status code.
+        Timeouts must be raised as `TransportTimeout`, and failed connections
+        as `TransportConnectionError`.
+
+        Args:
+            method (str): HTTP method
+
+            url (str): url of the request
+
+            headers (dict, optional): request headers
+
+            params (dict, optional): query parameters
+
+            data (dict, optional): form-encoded request body
+
+            json (dict, optional): JSON request body
+
+            auth (tuple, optional): (username, password) for HTTP Basic auth
+
+            timeout (float | (float, float), optional): total timeout, or a
+                (connect, read) timeout pair, in seconds
+
+        Returns:
+            TransportResponse
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Release any connections held by the transport.
+        """
+
+
+class RequestsTransport(Transport):
+    def __init__(self, session_manager: session.SessionManager = None):
+        """
+        Transport backed by `requests`.
+
+        Args:
+            session_manager (SessionManager, optional): Defaults to the shared
+                manager configured with `smartcar.configure_session`
+        """
+        self._session_manager = session_manager
+
+    def send(
+        self,
+        method,
+        url,
+        headers=None,
+        params=None,
+        data=None,
+        json=None,
+        auth=None,
+        timeout=None,
+    ):
+        manager = self._session_manager or session.get_session_manager()
+        try:
+            response = manager.request(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                data=data,
+                json=json,
+                auth=auth,
+                timeout=timeout,
+            )
+        except requests.exceptions.ConnectTimeout as e:
+            raise TransportTimeout("connect") from e
+        except requests.exceptions.Timeout as e:
+            raise TransportTimeout("read") from e
+        except requests.exceptions.SSLError:
+            raise
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+        ) as e:
+            raise TransportConnectionError(str(e)) from e
+        return TransportResponse(
+            response.status_code, response.headers, response.content
+        )
+
+    def close(self):
+        if self._session_manager is not None:
+            self._session_manager.close()
+
+
+class HttpxTransport(Transport):
+    def __init__(
+        self,
+        http2: Optional[bool] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+    ):
+        """
+        Transport backed by `httpx`. With `http2` enabled, concurrent requests
+        to the same host are multiplexed over a small number of connections.
+
+        Requires the optional dependencies: pip install "smartcar[http2]"
+
+        Args:
+            http2 (bool, optional): Negotiate HTTP/2 with servers that support it.
+                Defaults to True if the `h2` package is installed, otherwise
+                requests use HTTP/1.1.
+
+            max_connections (int, optional): Maximum number of open connections
+
+            max_keepalive_connections (int, optional): Maximum number of idle
+                connections kept alive
+
+            keepalive_expiry (float, optional): Seconds an idle connection is kept
+        """
+        httpx = _import_httpx()
+        self._client = httpx.Client(
+            http2=_http2(http2),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+
+    def send(
+        self,
+        method,
+        url,
+        headers=None,
+        params=None,
+        data=None,
+        json=None,
+        auth=None,
+        timeout=None,
+    ):
+        httpx = _import_httpx()
+        try:
+            response = self._client.request(
+                method,
+                url,
+                headers=headers,
+                params=_drop_none(params),
+                **_httpx_body(data),
+                json=json,
+                auth=auth,
+                timeout=_httpx_timeout(timeout),
+            )
+        except httpx.ConnectTimeout as e:
+            raise TransportTimeout("connect") from e
+        except httpx.TimeoutException as e:
+            raise TransportTimeout("read") from e
+        except (httpx.NetworkError, httpx.RemoteProtocolError) as e:
+            raise TransportConnectionError(str(e)) from e
+        return TransportResponse(
+            response.status_code,
+            rs.CaseInsensitiveDict(response.headers.items()),
+            response.content,
+        )
+
+    def close(self):
+        self._client.close()
+
+
+class AsyncTransport(object):
+    """
+    Base class for asyncio transports. Subclasses must implement `send`.
+    """
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        data: dict = None,
+        json: dict = None,
+        auth: tuple = None,
+        timeout: Timeout = None,
+    ) -> TransportResponse:
+        """
+        Send a request and return the response, whatever its status code.
+        Takes the same arguments as `Transport.send`.
+
+        Returns:
+            TransportResponse
+        """
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """
+        Release any connections held by the transport.
+        """
+
+
+class HttpxAsyncTransport(AsyncTransport):
+    def __init__(
+        self,
+        http2: Optional[bool] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+    ):
+        """
+        Asyncio transport backed by `httpx`. Takes the same arguments as
+        `HttpxTransport`. An instance must only be used from one event loop.
+
+        Requires the optional dependencies: pip install "smartcar[http2]"
+        """
+        httpx = _import_httpx()
+        self._client = httpx.AsyncClient(
+            http2=_http2(http2),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+
+    async def send(
+        self,
+        method,
+        url,
+        headers=None,
+        params=None,
+        data=None,
+        json=None,
+        auth=None,
+        timeout=None,
+    ):
+        httpx = _import_httpx()
+        try:
+            response = await self._client.request(
+                method,
+                url,
+                headers=headers,
+                params=_drop_none(params),
+                **_httpx_body(data),
+                json=json,
+                auth=auth,
+                timeout=_httpx_timeout(timeout),
+            )
+        except httpx.ConnectTimeout as e:
+            raise TransportTimeout("connect") from e
+        except httpx.TimeoutException as e:
+            raise TransportTimeout("read") from e
+        except (httpx.NetworkError, httpx.RemoteProtocolError) as e:
+            raise TransportConnectionError(str(e)) from e
+        return TransportResponse(
+            response.status_code,
+            rs.CaseInsensitiveDict(response.headers.items()),
+            response.content,
+        )
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+# Active transports
+
+_transport = RequestsTransport()
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> Transport:
+    """
+    Returns:
+        Transport: the transport every request is currently sent with
+    """
+    return _transport
+
+
+def set_transport(transport: Transport) -> None:
+    """
+    Replace the transport every request is sent with.
+
+    Args:
+        transport (Transport): e.g. `smartcar.HttpxTransport()`
+    """
+    global _transport
+    if not isinstance(transport, Transport):
+        raise TypeError("'transport' must be an instance of smartcar.Transport")
+
+    with _transport_lock:
+        _transport = transport
+
+
+_async_transport = None
+# Connections held by an asyncio client belong to the event loop that opened
+# them, so unless one is set explicitly, each loop gets its own default:
+# loop -> (transport, task closing it when the loop shuts down)
+_default_async_transports = {}
+
+
+def get_async_transport() -> AsyncTransport:
+    """
+    Returns:
+        AsyncTransport: the transport every asyncio request is currently sent
+            with. Defaults to an `HttpxAsyncTransport` for the running event loop.
+
+    Raises:
+        ImportError: if the default is needed and httpx is not installed
+    """
+    if _async_transport is not None:
+        return _async_transport
+
+    loop = asyncio.get_running_loop()
+    with _transport_lock:
+        if loop not in _default_async_transports:
+            _import_httpx(
+                "asyncio requests without a transport set with "
+                "smartcar.set_async_transport"
+            )
+            transport = HttpxAsyncTransport()
+            closer = loop.create_task(_close_on_shutdown(transport))
+            # Loops that are not run by `asyncio.run` never cancel it
+            closer._log_destroy_pending = False
+            closer.add_done_callback(lambda _: _forget_transport(loop, transport))
+            _default_async_transports[loop] = (transport, closer)
+        return _default_async_transports[loop][0]
+
+
+async def aclose_default_transports() -> None:
+    """
+    Close the default transport of the running event loop, e.g. before closing
+    a loop that is not run by `asyncio.run`. The next asyncio request opens a
+    new one.
+    """
+    loop = asyncio.get_running_loop()
+    with _transport_lock:
+        transport, closer = _default_async_transports.pop(loop, (None, None))
+    if transport is not None:
+        closer.cancel()
+        await transport.aclose()
+
+
+async def _close_on_shutdown(transport: AsyncTransport) -> None:
+    # `asyncio.run` cancels the tasks left when its coroutine returns, and runs
+    # the loop until they are done, so the connections are closed on their loop
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await transport.aclose()
+
+
+def _forget_transport(loop: asyncio.AbstractEventLoop, transport: AsyncTransport):
+    with _transport_lock:
+        if _default_async_transports.get(loop, (None,))[0] is transport:
+            del _default_async_transports[loop]
+
+
+def set_async_transport(transport: Optional[AsyncTransport]) -> None:
+    """
+    Replace the transport every asyncio request is sent with.
+
+    Args:
+        transport (AsyncTransport): e.g. `smartcar.HttpxAsyncTransport()`. Pass
+            None to go back to a default transport per event loop.
+    """
+    global _async_transport
+    if transport is not None and not isinstance(transport, AsyncTransport):
+        raise TypeError("'transport' must be an instance of smartcar.AsyncTransport")
+
+    with _transport_lock:
+        _async_transport = transport
+
+
+# Static helpers for transports
+
+
+def _import_httpx(user: str = "This transport"):
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError(
+            f'{user} requires httpx. Install it with: pip install "smartcar[http2]"'
+        ) from e
+    return httpx
+
+
+def _http2(http2: Optional[bool]) -> bool:
+    """
+    Returns (bool): whether to enable HTTP/2, which httpx supports with the
+        optional `h2` package
+    """
+    try:
+        import h2  # noqa: F401
+    except ImportError as e:
+        if http2:
+            raise ImportError(
+                'HTTP/2 requires h2. Install it with: pip install "smartcar[http2]"'
+            ) from e
+        return False
+    return http2 is not False
+
+
+def _httpx_body(data) -> dict:
+    # httpx takes raw bytes (e.g. pre-encoded JSON) as 'content', and forms as 'data'
+    if isinstance(data, (bytes, str)):
+        return {"content": data}
+    return {"data": data}
+
+
+def _drop_none(params: Optional[dict]) -> Optional[dict]:
+    # requests silently drops None query parameters, httpx sends them as empty strings
+    if params is None:
+        return None
+    return {key: value for key, value in params.items() if value is not None}
+
+
+def _httpx_timeout(timeout: Timeout):
+    httpx = _import_httpx()
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
@@ -1,10 +1,16 @@
 import datetime
+import functools
+import operator
 from collections import namedtuple
-from typing import List, Optional, NamedTuple, Union
+from collections.abc import Sequence
+from typing import Any, Callable, List, Optional, NamedTuple, Union
 import re
 import requests.structures as rs
 import enum
 
+import smartcar.exception as sce
+import smartcar.helpers as helpers
+
 # Return types for Smartcar API.
 #
 # 'generate_named_tuple' is used to generate an un-typed namedtuple from
@@ -13,6 +19,21 @@ import enum
 # that does not have an explicit length (e.g. response headers, batch requests)
 #
 # Otherwise, use the explicitly defined NamedTuples for better type hints!
+#
+# The classes of generated namedtuples are cached by name and attributes, so
+# that every response of the same shape (e.g. every "Meta") shares one class
+# instead of building a new one.
+
+# Number of generated namedtuple classes kept, least recently used first out
+NAMED_TUPLE_CACHE_SIZE = 1024
+
+# Number of converted camelCased keys kept, least recently used first out
+CAMEL_TO_SNAKE_CACHE_SIZE = 4096
+
+_CAMEL_WORD = re.compile("(.)([A-Z][a-z]+)")
+_DIGITS = re.compile("(.)([0-9]+)")
+_CAMEL_BOUNDARY = re.compile("([a-z0-9])([A-Z])")
+_CONVERTIBLE = re.compile("[A-Z0-9]")
 
 
 def generate_named_tuple(
@@ -48,11 +69,28 @@ def generate_named_tuple(
 
         attributes.append(formatted)
 
-    gen = namedtuple(name, attributes)
+    gen = _named_tuple_class(name, tuple(attributes))
 
     return gen._make([dictionary[k] for k in keys])
 
 
+@functools.lru_cache(maxsize=NAMED_TUPLE_CACHE_SIZE)
+def _named_tuple_class(name: str, attributes: tuple) -> type:
+    """
+    Returns (type): the namedtuple class with `name` and `attributes`
+    """
+    gen = namedtuple(name, attributes)
+
+    # Generated classes cannot be found by name in this module, so pickle their
+    # instances as a call rebuilding them from the cached class
+    gen.__reduce__ = lambda self: (_make_named_tuple, (name, attributes, tuple(self)))
+    return gen
+
+
+def _make_named_tuple(name: str, attributes: tuple, values: tuple) -> namedtuple:
+    return _named_tuple_class(name, attributes)._make(values)
+
+
 def _camel_to_snake(camel_string: str) -> str:
     """
     Use regex to change camelCased string to snake_case
@@ -64,26 +102,116 @@ def _camel_to_snake(camel_string: str) -> str:
         A snake_cased string
 
     """
-    result = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", camel_string)
-    result = re.sub("(.)([0-9]+)", r"\1_\2", result)
-    result = re.sub("([a-z0-9])([A-Z])", r"\1_\2", result)
+    # Keys without capitals or digits (e.g. "distance") need no regex
+    if _CONVERTIBLE.search(camel_string) is None:
+        return camel_string.lower()
+    return _convert_camel_case(camel_string)
+
+
+@functools.lru_cache(maxsize=CAMEL_TO_SNAKE_CACHE_SIZE)
+def _convert_camel_case(camel_string: str) -> str:
+    result = _CAMEL_WORD.sub(r"\1_\2", camel_string)
+    result = _DIGITS.sub(r"\1_\2", result)
+    result = _CAMEL_BOUNDARY.sub(r"\1_\2", result)
     return result.lower()
 
 
-def build_meta(response_headers: rs.CaseInsensitiveDict) -> namedtuple:
-    smartcar_headers = {
+class Meta(tuple):
+    """
+    Base class of the namedtuples holding the Smartcar headers of a response.
+
+    A Meta only has the attributes of the headers the response has, among:
+        request_id (str): sc-request-id
+        data_age (str): sc-data-age, when the vehicle recorded the data
+        unit_system (str): sc-unit-system
+        fetched_at (str): sc-fetched-at, when Smartcar fetched the data
+        retry_count (int): retries before the response was received, if known
+
+    The timestamps are also available parsed, as `data_age_datetime` and
+    `fetched_at_datetime` (None if the response does not have the header).
+    """
+
+    __slots__ = ()
+
+    # header -> attribute, in the order of the fields
+    _HEADERS = {
         "sc-data-age": "data_age",
         "sc-unit-system": "unit_system",
         "sc-request-id": "request_id",
         "sc-fetched-at": "fetched_at",
     }
 
-    meta_dict = {}
-    for key, value in smartcar_headers.items():
-        if key in response_headers:
-            meta_dict[value] = response_headers[key]
+    @property
+    def data_age_datetime(self) -> Optional[datetime.datetime]:
+        return _parse_meta_datetime(getattr(self, "data_age", None))
+
+    @property
+    def fetched_at_datetime(self) -> Optional[datetime.datetime]:
+        return _parse_meta_datetime(getattr(self, "fetched_at", None))
+
+
+@functools.lru_cache(maxsize=NAMED_TUPLE_CACHE_SIZE)
+def _meta_class(attributes: tuple) -> type:
+    """
+    Returns (type): the Meta namedtuple class with `attributes`
+    """
+    gen = type("Meta", (namedtuple("Meta", attributes), Meta), {"__slots__": ()})
+    gen.__reduce__ = lambda self: (_make_meta, (attributes, tuple(self)))
+    return gen
+
+
+def _make_meta(attributes: tuple, values: tuple) -> Meta:
+    return _meta_class(attributes)._make(values)
+
+
+_UNPARSED = object()
 
-    return generate_named_tuple(meta_dict, "Meta", True)
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime.datetime]:
+    """
+    Returns (datetime): an ISO 8601 timestamp (or date), in UTC if it has no
+        timezone, or None if it is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+# The responses of a vehicle (or of a batch) share their timestamps, so parsed
+# header timestamps are kept
+_parse_meta_datetime = functools.lru_cache(maxsize=CAMEL_TO_SNAKE_CACHE_SIZE)(
+    _parse_datetime
+)
+
+
+def build_meta(
+    response_headers: rs.CaseInsensitiveDict, retry_count: int = None
+) -> Optional[Meta]:
+    """
+    Returns (Meta): the Smartcar headers of `response_headers` (and
+        `retry_count`), or None if there are none
+    """
+    # The values are copied when the response is read, so that meta stays a
+    # tuple: only the namedtuple class (cached per set of headers) and the
+    # parsed timestamps (parsed on access) are saved
+    attributes = []
+    values = []
+    for header, attribute in Meta._HEADERS.items():
+        if header in response_headers:
+            attributes.append(attribute)
+            values.append(response_headers[header])
+    if retry_count is not None:
+        attributes.append("retry_count")
+        values.append(retry_count)
+    if not attributes:
+        return None
+    return _meta_class(tuple(attributes))._make(values)
 
 
 # ===========================================
@@ -207,32 +335,158 @@ DiagnosticTroubleCodes = NamedTuple(
 )
 
 
-class ServiceCost:
-    total_cost: Optional[float] = None
-    currency: Optional[str] = None
+ServiceCost = NamedTuple(
+    "ServiceCost", [("total_cost", Optional[float]), ("currency", Optional[str])]
+)
+
+ServiceDetail = NamedTuple(
+    "ServiceDetail", [("type", str), ("value", Union[None, str, float])]
+)
+
+ServiceTask = NamedTuple(
+    "ServiceTask", [("task_id", Optional[str]), ("task_description", Optional[str])]
+)
+
+
+class ServiceRecord(object):
+    """
+    A service record of a vehicle. The record keeps its JSON object, and each
+    field is decoded from it the first time it is read. `record[key]` reads the
+    JSON object, e.g. `record["odometerDistance"]`.
+
+    Attributes:
+        odometer_distance (float)
+        service_date (datetime)
+        service_id (str, optional)
+        service_tasks (List[ServiceTask])
+        service_details (List[ServiceDetail])
+        service_cost (ServiceCost)
+    """
+
+    __slots__ = (
+        "_data",
+        "_service_date",
+        "_service_tasks",
+        "_service_details",
+        "_service_cost",
+    )
+
+    _fields = (
+        "odometer_distance",
+        "service_date",
+        "service_id",
+        "service_tasks",
+        "service_details",
+        "service_cost",
+    )
+
+    def __init__(self, data: dict):
+        self._data = data
+        self._service_date = _UNPARSED
+        self._service_tasks = None
+        self._service_details = None
+        self._service_cost = None
+
+    @property
+    def odometer_distance(self) -> Optional[float]:
+        return self._data.get("odometerDistance")
+
+    @property
+    def service_id(self) -> Optional[str]:
+        return self._data.get("serviceId")
+
+    @property
+    def service_date(self) -> Optional[datetime.datetime]:
+        if self._service_date is _UNPARSED:
+            self._service_date = _parse_datetime(self._data.get("serviceDate"))
+        return self._service_date
+
+    @property
+    def service_tasks(self) -> List[ServiceTask]:
+        if self._service_tasks is None:
+            self._service_tasks = [
+                ServiceTask(task.get("taskId"), task.get("taskDescription"))
+                for task in self._data.get("serviceTasks") or []
+            ]
+        return self._service_tasks
+
+    @property
+    def service_details(self) -> List[ServiceDetail]:
+        if self._service_details is None:
+            self._service_details = [
+                ServiceDetail(detail.get("type"), detail.get("value"))
+                for detail in self._data.get("serviceDetails") or []
+            ]
+        return self._service_details
+
+    @property
+    def service_cost(self) -> ServiceCost:
+        if self._service_cost is None:
+            cost = self._data.get("serviceCost") or {}
+            self._service_cost = ServiceCost(
+                cost.get("totalCost"), cost.get("currency")
+            )
+        return self._service_cost
+
+    def __getitem__(self, key: str):
+        return self._data[key]
+
+    def _asdict(self) -> dict:
+        return {field: getattr(self, field) for field in self._fields}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ServiceRecord):
+            return NotImplemented
+        return self._data == other._data
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"ServiceRecord(service_id={self.service_id!r}, "
+            f"service_date={self._data.get('serviceDate')!r}, "
+            f"odometer_distance={self.odometer_distance!r})"
+        )
+
+
+class ServiceRecords(Sequence):
+    """
+    The records of a ServiceHistory, as a sequence that wraps each JSON object
+    in a ServiceRecord when it is first read.
+    """
+
+    __slots__ = ("_items", "_records")
 
+    def __init__(self, items: list):
+        self._items = items
+        self._records = [None] * len(items)
 
-class ServiceDetail:
-    type: str
-    value: Union[None, str, float] = None
+    def __len__(self) -> int:
+        return len(self._items)
 
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        record = self._records[index]
+        if record is None:
+            record = self._records[index] = ServiceRecord(self._items[index])
+        return record
 
-class ServiceTask:
-    task_id: Optional[str] = None
-    task_description: Optional[str] = None
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ServiceRecords):
+            return self._items == other._items
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
 
+    __hash__ = None
 
-class ServiceRecord:
-    odometer_distance: float
-    service_date: datetime
-    service_id: Optional[str] = None
-    service_tasks: List[ServiceTask]
-    service_details: List[ServiceDetail]
-    service_cost: ServiceCost
+    def __repr__(self) -> str:
+        return f"ServiceRecords({len(self)} records)"
 
 
 ServiceHistory = NamedTuple(
-    "ServiceHistory", [("items", List[ServiceRecord]), ("meta", namedtuple)]
+    "ServiceHistory", [("items", ServiceRecords), ("meta", namedtuple)]
 )
 
 Battery = NamedTuple(
@@ -332,6 +586,13 @@ DeleteConnections = NamedTuple(
 
 Response = NamedTuple("Response", [("body", dict), ("meta", namedtuple)])
 
+# Undecoded response of a request sent with raw=True: the body is a view of the
+# bytes received, without parsing them
+RawResponse = NamedTuple(
+    "RawResponse",
+    [("body", memoryview), ("status_code", int), ("meta", namedtuple)],
+)
+
 # ===========================================
 # Lock Status Tuples
 # ===========================================
@@ -359,6 +620,174 @@ LockStatus = NamedTuple(
     ],
 )
 
+# ===========================================
+# Response decoders
+# ===========================================
+#
+# A decoder turns the body of a response (parsed JSON) and its meta into the
+# NamedTuple of its path. 'select_named_tuple' looks decoders up by path in
+# '_decoders'; most are compiled from a field spec with 'field_decoder'.
+
+Decoder = Callable[[Any, namedtuple], Any]
+
+
+def field_decoder(named_tuple: type, *keys: str) -> Decoder:
+    """
+    Compile a decoder that passes the values of `keys` in the response body,
+    followed by the meta, to `named_tuple`.
+
+    Args:
+        named_tuple (type): e.g. Location
+
+        *keys (str): body keys, in the order of the fields of `named_tuple`
+            (e.g. "latitude", "longitude")
+
+    Returns:
+        Decoder
+    """
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda data, meta: named_tuple(data[key], meta)
+
+    get_fields = operator.itemgetter(*keys)
+    return lambda data, meta: named_tuple(*get_fields(data), meta)
+
+
+def register_decoder(path: str, decoder: Decoder) -> None:
+    """
+    Decode the responses of `path` with `decoder`, including the responses of
+    `Vehicle.request` and `Vehicle.batch` for that path. Built-in paths cannot
+    be overridden.
+
+    Args:
+        path (str): e.g. "tesla/charge/ammeter"
+
+        decoder (Decoder): function of the response body and its meta, e.g. one
+            returned by `field_decoder`
+    """
+    path = _normalize_path(path)
+    if path in _decoders and path not in _registered_paths:
+        raise ValueError(f"The decoder of '{path}' is built in")
+
+    _decoders[path] = decoder
+    _registered_paths.add(path)
+
+
+def request_path(path: str) -> str:
+    """
+    Returns (str): the path to decode a `Vehicle.request` to `path` with: `path`
+        if a decoder was registered for it, otherwise "request"
+    """
+    path = _normalize_path(path)
+    return path if path in _registered_paths else "request"
+
+
+def _normalize_path(path: str) -> str:
+    return path.split("?", 1)[0].strip("/")
+
+
+def _decode_vehicles(data: dict, meta: namedtuple) -> Vehicles:
+    paging = data["paging"]
+    return Vehicles(data["vehicles"], Paging(paging["count"], paging["offset"]), meta)
+
+
+def _decode_compatibility_v2(data: dict, meta: namedtuple) -> CompatibilityV2:
+    typed_capabilities = format_capabilities(data["capabilities"])
+    return CompatibilityV2(data["compatible"], data["reason"], typed_capabilities, meta)
+
+
+def _decode_nominal_capacity(data: dict, meta: namedtuple) -> NominalCapcity:
+    available_capacities = [
+        AvailableCapacity(item["capacity"], item["description"])
+        for item in data["availableCapacities"]
+    ]
+    return NominalCapcity(available_capacities, data["capacity"], data["url"], meta)
+
+
+def _decode_system_status(data: dict, meta: namedtuple) -> DiagnosticSystemStatus:
+    systems = [
+        DiagnosticSystem(
+            system_id=item["systemId"],
+            status=item["status"],
+            description=item.get("description"),
+        )
+        for item in data["systems"]
+    ]
+    return DiagnosticSystemStatus(systems=systems, meta=meta)
+
+
+def _decode_dtcs(data: dict, meta: namedtuple) -> DiagnosticTroubleCodes:
+    active_codes = [
+        DiagnosticTroubleCode(code=item["code"], timestamp=item.get("timestamp"))
+        for item in data["activeCodes"]
+    ]
+    return DiagnosticTroubleCodes(active_codes=active_codes, meta=meta)
+
+
+def _decode_service_history(data: list, meta: namedtuple) -> ServiceHistory:
+    return ServiceHistory(ServiceRecords(data), meta)
+
+
+def _decode_permissions(data: dict, meta: namedtuple) -> Permissions:
+    paging = data["paging"]
+    return Permissions(
+        data["permissions"], Paging(paging["count"], paging["offset"]), meta
+    )
+
+
+_action_decoder = field_decoder(Action, "status", "message")
+_status_decoder = field_decoder(Status, "status")
+
+_decoders = {
+    # smartcar.py
+    "user": field_decoder(User, "id"),
+    "vehicles": _decode_vehicles,
+    "compatibility_v1": field_decoder(CompatibilityV1, "compatible"),
+    "compatibility_v2": _decode_compatibility_v2,
+    # vehicle.py
+    "vin": field_decoder(Vin, "vin"),
+    "charge": field_decoder(Charge, "isPluggedIn", "state"),
+    "battery": field_decoder(Battery, "percentRemaining", "range"),
+    "battery/capacity": field_decoder(BatteryCapacity, "capacity"),
+    "battery/nominal_capacity": _decode_nominal_capacity,
+    "fuel": field_decoder(Fuel, "range", "percentRemaining", "amountRemaining"),
+    "tires/pressure": field_decoder(
+        TirePressure, "frontLeft", "frontRight", "backLeft", "backRight"
+    ),
+    "engine/oil": field_decoder(EngineOil, "lifeRemaining"),
+    "odometer": field_decoder(Odometer, "distance"),
+    "location": field_decoder(Location, "latitude", "longitude"),
+    "charge/limit": field_decoder(ChargeLimit, "limit"),
+    "service/history": _decode_service_history,
+    "diagnostics/system_status": _decode_system_status,
+    "diagnostics/dtcs": _decode_dtcs,
+    "permissions": _decode_permissions,
+    "security": field_decoder(
+        LockStatus,
+        "isLocked",
+        "doors",
+        "windows",
+        "sunroof",
+        "storage",
+        "chargingPort",
+    ),
+    "subscribe": field_decoder(Subscribe, "webhookId", "vehicleId"),
+    "lock": _action_decoder,
+    "unlock": _action_decoder,
+    "start_charge": _action_decoder,
+    "stop_charge": _action_decoder,
+    "set_charge_limit": _action_decoder,
+    "send_destination": _action_decoder,
+    "disconnect": _status_decoder,
+    "unsubscribe": _status_decoder,
+    "": field_decoder(Attributes, "id", "make", "model", "year"),
+    "request": Response,
+}
+
+# Paths registered with 'register_decoder'
+_registered_paths = set()
+
+
 # ===========================================
 # Named Tuple Selector Function
 # ===========================================
@@ -379,11 +808,11 @@ def select_named_tuple(path: str, response_or_dict) -> NamedTuple:
     representing the result of each request in the batch. For this reason,
     this function needs to be able to parse a dictionary as well.
 
-    Note that if a path is not dictated in one of the
-    conditionals below, the raw data will be returned. This, in theory,
-    shouldn't run because paths are defined by the contributing developer.
-    In the case of "batch" requests, incorrect paths to batch will result in
-    a SmartcarException before this function is called.
+    Note that if no decoder is registered for a path, the raw data will be
+    returned. This, in theory, shouldn't happen because paths are defined by
+    the contributing developer. In the case of "batch" requests, incorrect
+    paths to batch will result in a SmartcarException before this function
+    is called.
 
     Args:
         path (str): Smartcar API path
@@ -400,147 +829,183 @@ def select_named_tuple(path: str, response_or_dict) -> NamedTuple:
         headers = build_meta(headers_dict)
         data = response_or_dict["body"]
     else:
-        headers = build_meta(response_or_dict.headers)
+        headers = build_meta(
+            response_or_dict.headers, getattr(response_or_dict, "retry_count", None)
+        )
         data = response_or_dict.json()
 
-    # smartcar.py
-    if path == "user":
-        return User(data["id"], headers)
-
-    elif path == "vehicles":
-        return Vehicles(
-            data["vehicles"],
-            Paging(data["paging"]["count"], data["paging"]["offset"]),
-            headers,
-        )
+    decoder = _decoders.get(path)
+    if decoder is not None:
+        return decoder(data, headers)
 
-    elif path == "compatibility_v1":
-        return CompatibilityV1(data["compatible"], headers)
+    elif type(data) == dict:
+        return generate_named_tuple(data, "Data")
 
-    elif path == "compatibility_v2":
-        typed_capabilities = format_capabilities(data["capabilities"])
-        return CompatibilityV2(
-            data["compatible"], data["reason"], typed_capabilities, headers
-        )
+    else:
+        return data
 
-    # vehicle.py
-    elif path == "vin":
-        return Vin(data["vin"], headers)
 
-    elif path == "charge":
-        return Charge(data["isPluggedIn"], data["state"], headers)
+def raw_response(response) -> RawResponse:
+    """
+    Wrap a response without decoding its body, e.g. to forward it as is.
 
-    elif path == "battery":
-        return Battery(data["percentRemaining"], data["range"], headers)
+    Args:
+        response: Smartcar response
 
-    elif path == "battery/capacity":
-        return BatteryCapacity(data["capacity"], headers)
+    Returns:
+        RawResponse: the body bytes (as a memoryview, which does not copy them),
+            status code and meta of the response
+    """
+    body = response.content
+    if isinstance(body, (bytes, bytearray)):
+        body = memoryview(body)
+    return RawResponse(
+        body,
+        response.status_code,
+        build_meta(response.headers, getattr(response, "retry_count", None)),
+    )
 
-    elif path == "battery/nominal_capacity":
-        available_capacities = [
-            AvailableCapacity(item["capacity"], item["description"])
-            for item in data["availableCapacities"]
-        ]
-        return NominalCapcity(
-            available_capacities, data["capacity"], data["url"], headers
-        )
 
-    elif path == "fuel":
-        return Fuel(
-            data["range"],
-            data["percentRemaining"],
-            data["amountRemaining"],
-            headers,
-        )
+# ===========================================
+# Batch results
+# ===========================================
 
-    elif path == "tires/pressure":
-        return TirePressure(
-            data["frontLeft"],
-            data["frontRight"],
-            data["backLeft"],
-            data["backRight"],
-            headers,
-        )
 
-    elif path == "engine/oil":
-        return EngineOil(data["lifeRemaining"], headers)
+class BatchResult(object):
+    def __init__(
+        self,
+        responses: List[dict],
+        headers: rs.CaseInsensitiveDict,
+        retry_count: int = None,
+    ):
+        """
+        Result of a batch request. The response of each path is decoded, or
+        turned into a SmartcarException, the first time it is read, and kept.
+
+        Read a path by its attribute, as a function returning its NamedTuple or
+        raising its SmartcarException (e.g. `result.engine_oil()`), or by path
+        with `result["/engine/oil"]`. Iterating yields (path, ok, value) for
+        every path.
+
+        Args:
+            responses (list): the "responses" of the batch response body
+
+            headers (CaseInsensitiveDict): headers of the batch response
+
+            retry_count (int, optional): retries of the batch request
+        """
+        self._headers = headers
+        self._retry_count = retry_count
+        self._meta = None
+        # attribute -> (requested path, formatted path, path response)
+        self._responses = {}
+        # formatted path -> attribute
+        self._attributes = {}
+        # attribute -> (ok, NamedTuple or SmartcarException)
+        self._outcomes = {}
+
+        for path_response in responses:
+            path, attribute = helpers.format_path_and_attribute_for_batch(
+                path_response["path"]
+            )
+            self._responses[attribute] = (path_response["path"], path, path_response)
+            self._attributes[path] = attribute
+
+    @property
+    def meta(self) -> namedtuple:
+        if self._meta is None:
+            self._meta = build_meta(self._headers, self._retry_count)
+        return self._meta
+
+    @property
+    def _fields(self) -> tuple:
+        return tuple(self._responses) + ("meta",)
+
+    def __getattr__(self, name: str) -> Callable[[], NamedTuple]:
+        # Only called for names that are not regular attributes, i.e. paths
+        if name.startswith("_") or name not in self._responses:
+            raise AttributeError(name)
+        return lambda: self._value(name)
+
+    def __getitem__(self, path: str) -> NamedTuple:
+        """
+        Args:
+            path (str): a requested path, e.g. "/odometer"
+
+        Returns:
+            NamedTuple: the decoded response of `path`
+
+        Raises:
+            KeyError: if `path` was not part of the batch
+            SmartcarException: if the request of `path` failed
+        """
+        attribute = self._attributes.get(path[1:] if path.startswith("/") else path)
+        if attribute is None:
+            raise KeyError(path)
+        return self._value(attribute)
+
+    def __contains__(self, path: str) -> bool:
+        return (path[1:] if path.startswith("/") else path) in self._attributes
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def __iter__(self):
+        """
+        Yields:
+            (str, bool, NamedTuple | SmartcarException): the requested path,
+                whether its request succeeded, and its decoded response or
+                exception
+        """
+        for attribute, (requested_path, _, _) in self._responses.items():
+            ok, value = self._outcome(attribute)
+            yield requested_path, ok, value
+
+    def __repr__(self) -> str:
+        return f"BatchResult({', '.join(self._responses)})"
+
+    def _value(self, attribute: str) -> NamedTuple:
+        ok, value = self._outcome(attribute)
+        if not ok:
+            # The exception is kept, so each read raises a copy of it
+            raise value._clone()
+        return value
+
+    def _outcome(self, attribute: str) -> tuple:
+        outcome = self._outcomes.get(attribute)
+        if outcome is None:
+            _, path, path_response = self._responses[attribute]
+            outcome = self._outcomes[attribute] = decode_batch_response(
+                path, path_response, self._headers.get("sc-request-id")
+            )
+        return outcome
 
-    elif path == "odometer":
-        return Odometer(data["distance"], headers)
 
-    elif path == "location":
-        return Location(data["latitude"], data["longitude"], headers)
+def decode_batch_response(
+    path: str, path_response: dict, request_id: Optional[str]
+) -> tuple:
+    """
+    Args:
+        path (str): formatted path of the response, e.g. "engine/oil"
 
-    elif path == "charge/limit":
-        return ChargeLimit(data["limit"], headers)
+        path_response (dict): one of the "responses" of a batch response
 
-    elif path == "service/history":
-        return ServiceHistory(data, headers)
+        request_id (str): the sc-request-id of the batch response
 
-    elif path == "diagnostics/system_status":
-        systems = [
-            DiagnosticSystem(
-                system_id=item["systemId"],
-                status=item["status"],
-                description=item.get("description"),
-            )
-            for item in data["systems"]
-        ]
-        return DiagnosticSystemStatus(systems=systems, meta=headers)
-
-    elif path == "diagnostics/dtcs":
-        active_codes = [
-            DiagnosticTroubleCode(code=item["code"], timestamp=item.get("timestamp"))
-            for item in data["activeCodes"]
-        ]
-        return DiagnosticTroubleCodes(active_codes=active_codes, meta=headers)
-
-    elif path == "permissions":
-        return Permissions(
-            data["permissions"],
-            Paging(data["paging"]["count"], data["paging"]["offset"]),
-            headers,
-        )
-    elif path == "security":
-        return LockStatus(
-            data["isLocked"],
-            data["doors"],
-            data["windows"],
-            data["sunroof"],
-            data["storage"],
-            data["chargingPort"],
-            headers,
-        )
-    elif path == "subscribe":
-        return Subscribe(data["webhookId"], data["vehicleId"], headers)
-
-    elif (
-        path == "lock"
-        or path == "unlock"
-        or path == "start_charge"
-        or path == "stop_charge"
-        or path == "set_charge_limit"
-        or path == "send_destination"
-    ):
-        return Action(data["status"], data["message"], headers)
-
-    elif path == "disconnect" or path == "unsubscribe":
-        return Status(data["status"], headers)
-
-    elif path == "":
-        return Attributes(
-            data["id"],
-            data["make"],
-            data["model"],
-            data["year"],
-            headers,
+    Returns:
+        (bool, NamedTuple | SmartcarException): whether the request succeeded,
+            and its decoded response or exception
+    """
+    if path_response.get("code") == 200:
+        headers = dict(path_response.get("headers") or {})
+        headers["sc-request-id"] = request_id
+        return True, select_named_tuple(
+            path, {"body": path_response.get("body"), "headers": headers}
         )
 
-    elif path == "request":
-        return Response(data, headers)
-
-    elif type(data) == dict:
-        return generate_named_tuple(data, "Data")
-
-    else:
-        return data
+    # The body was already parsed with the batch response
+    return False, sce.exception_from_json(
+        path_response.get("code"),
+        path_response.get("headers", {}),
+        path_response.get("body"),
+    )
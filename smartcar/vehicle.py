@@ -1,22 +1,31 @@
-from collections import namedtuple
-import json
-from typing import Callable, List, Optional
+import datetime
+import operator
+from typing import Hashable, Iterator, List, NamedTuple, Optional, Tuple, Union
+import smartcar.coalesce as coalesce
 import smartcar.config as config
 import smartcar.helpers as helpers
+import smartcar.pagination as pagination
+import smartcar.ratelimit as ratelimit
 import smartcar.smartcar
+import smartcar.tokens as tokens
 import smartcar.types as types
-import smartcar.exception as sce
 
 
 class Vehicle(object):
-    def __init__(self, vehicle_id: str, access_token: str, options: dict = None):
+    def __init__(
+        self,
+        vehicle_id: str,
+        access_token: Union[str, tokens.TokenManager],
+        options: dict = None,
+    ):
         """
         Initializes a new Vehicle to use for making requests to the Smartcar API.
 
         Args:
             vehicle_id (str): the vehicle's unique identifier
 
-            access_token (str): a valid access token
+            access_token (str | TokenManager): a valid access token, or a
+                TokenManager holding the Access of the vehicle
 
             options (dict, optional): Can contain the following keys:
                 unit_system (str, optional): the unit system to use for vehicle data.
@@ -28,6 +37,42 @@ class Vehicle(object):
                 flags(dict, optional): Object of flags where key is the name of the flag and
                     value is string or boolean value.
 
+                retry_policy(RetryPolicy, optional): Policy for retrying failed requests.
+                    Defaults to the policy set with `smartcar.set_retry_policy`.
+
+                timeout(float | (float, float), optional): Connect and read timeout, in
+                    seconds, of this vehicle's requests. Defaults to the timeout set with
+                    `smartcar.set_default_timeout`.
+
+                endpoint_timeouts(dict, optional): Timeouts for specific endpoints, keyed
+                    by path (e.g. {"location": (3, 10)}). Takes precedence over `timeout`.
+
+                rate_limiter(RateLimiter, optional): Client-side rate limiter for this
+                    vehicle's requests. Defaults to the limiter set with
+                    `smartcar.set_rate_limiter`.
+
+                client_id(str, optional): Client id of the application, keying its
+                    application-level rate limit. Defaults to a bucket shared by all
+                    requests that do not set one.
+
+                coalesce(bool, optional): Share one request between identical GETs
+                    sent concurrently. Defaults to the setting of `smartcar.set_coalescing`.
+
+                cache(ResponseCache, optional): Cache for this vehicle's GET responses,
+                    returned while their data is recent enough. Can be shared by
+                    vehicles. Defaults to no caching.
+
+                auto_batch(AutoBatcher, optional): Combine the getters called within a
+                    short window into a single batch request. Defaults to no batching.
+
+                raw(bool, optional): Return the undecoded RawResponse of getters,
+                    `batch` and `request`, instead of NamedTuples. Raw GETs are not
+                    cached or auto-batched. Defaults to False.
+
+                token_key(hashable, optional): Key of the vehicle's Access in the
+                    TokenManager passed as `access_token`, e.g. a user id.
+                    Defaults to the vehicle id.
+
         Attributes:
             self.vehicle_id (str)
             self.access_token (str): Access token retrieved from Smartcar Connect
@@ -36,9 +81,19 @@ class Vehicle(object):
         """
         self.vehicle_id = vehicle_id
         self.access_token = access_token
+        self._token_key = vehicle_id
         self._api_version = smartcar.smartcar.API_VERSION
         self._unit_system = "metric"
         self._flags = {}
+        self._retry_policy = None
+        self._timeout = None
+        self._endpoint_timeouts = {}
+        self._rate_limiter = None
+        self._client_id = None
+        self._coalesce = None
+        self._cache = None
+        self._auto_batch = None
+        self._raw = False
 
         if options:
             if options.get("unit_system"):
@@ -50,42 +105,95 @@ class Vehicle(object):
             if options.get("flags"):
                 self._flags = options["flags"]
 
-    def vin(self) -> types.Vin:
+            if options.get("retry_policy"):
+                self._retry_policy = options["retry_policy"]
+
+            if options.get("timeout"):
+                self._timeout = options["timeout"]
+
+            if options.get("endpoint_timeouts"):
+                self._endpoint_timeouts = options["endpoint_timeouts"]
+
+            if options.get("rate_limiter"):
+                self._rate_limiter = options["rate_limiter"]
+
+            if options.get("client_id"):
+                self._client_id = options["client_id"]
+
+            if options.get("coalesce") is not None:
+                self._coalesce = options["coalesce"]
+
+            if options.get("cache") is not None:
+                self._cache = options["cache"]
+
+            if options.get("auto_batch") is not None:
+                self._auto_batch = options["auto_batch"]
+
+            if options.get("raw") is not None:
+                self._raw = options["raw"]
+
+            if options.get("token_key") is not None:
+                self._token_key = options["token_key"]
+
+    @property
+    def access_token(self) -> str:
+        """
+        Returns (str): the access token of the requests, refreshed first if the
+            vehicle has a TokenManager and its token is about to expire
+        """
+        if self._token_manager is not None:
+            return self._token_manager.access_token(self._token_key)
+        return self._access_token
+
+    @access_token.setter
+    def access_token(self, access_token: Union[str, tokens.TokenManager]) -> None:
+        if isinstance(access_token, tokens.TokenManager):
+            self._token_manager = access_token
+            self._access_token = None
+        else:
+            self._token_manager = None
+            self._access_token = access_token
+
+    def vin(self, raw: bool = None) -> types.Vin:
         """
         GET Vehicle.vin
 
+        Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
         Returns:
             Vin: NamedTuple("Vin", [("vin", str), ("meta", namedtuple)])
 
         Raises:
             SmartcarException
         """
-        path = "vin"
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("vin", raw=raw)
 
-    def charge(self) -> types.Charge:
+    def charge(self, raw: bool = None) -> types.Charge:
         """
         GET Vehicle.charge
 
+        Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
         Returns:
             Charge: NamedTuple("Charge", [("is_plugged_in", bool), ("state", str), ("meta", namedtuple)])
 
         Raises:
             SmartcarException
         """
-        path = "charge"
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("charge", raw=raw)
 
-    def battery(self) -> types.Battery:
+    def battery(self, raw: bool = None) -> types.Battery:
         """
         GET Vehicle.battery
 
+        Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
         Returns:
             Battery: NamedTuple("Battery", [("percent_remaining", float),
                 ("range", float),
@@ -94,31 +202,31 @@ class Vehicle(object):
         Raises:
             SmartcarException
         """
-        path = "battery"
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("battery", raw=raw)
 
-    def battery_capacity(self) -> types.BatteryCapacity:
+    def battery_capacity(self, raw: bool = None) -> types.BatteryCapacity:
         """
         GET Vehicle.battery_capacity
 
+        Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
         Returns:
             BatteryCapacity: NamedTuple("BatteryCapacity", [("capacity", float), ("meta", namedtuple)])
 
         Raises:
             SmartcarException
         """
-        path = "battery/capacity"
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("battery/capacity", raw=raw)
 
-    def nominal_capacity(self) -> types.NominalCapcity:
+    def nominal_capacity(self, raw: bool = None) -> types.NominalCapcity:
         """
         GET Vehicle.nominal_capacity
+        Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
         Returns:
             NamedTuple(
                 "NominalCapcity",
@@ -132,16 +240,16 @@ class Vehicle(object):
         Raises:
             SmartcarException
         """
-        path = "battery/nominal_capacity"
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("battery/nominal_capacity", raw=raw)
 
-    def fuel(self) -> types.Fuel:
+    def fuel(self, raw: bool = None) -> types.Fuel:
         """
         GET Vehicle.fuel
 
+        Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
         Returns:
             Fuel: NamedTuple("Fuel", [("range", float),
                 ("percent_remaining", float), ("amount_remaining", float), ("meta", namedtuple)])
@@ -149,16 +257,16 @@ class Vehicle(object):
         Raises:
             SmartcarException
         """
-        path = "fuel"
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("fuel", raw=raw)
 
-    def tire_pressure(self) -> types.TirePressure:
+    def tire_pressure(self, raw: bool = None) -> types.TirePressure:
         """
         GET Vehicle.tire_pressure
 
+        Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
         Returns:
             TirePressure: NamedTuple("tirePressure", [
                 ("front_left", int), ("front_right", int), ("back_left", int), ("back_right", int),
@@ -168,46 +276,45 @@ class Vehicle(object):
         Raises:
             SmartcarException
         """
-        path = "tires/pressure"
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("tires/pressure", raw=raw)
 
-    def engine_oil(self) -> types.EngineOil:
+    def engine_oil(self, raw: bool = None) -> types.EngineOil:
         """
         GET Vehicle.engine_oil
 
+        Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
         Returns:
             EngineOil: NamedTuple("EngineOil", [("life_remaining", float), ("meta", namedtuple)])
 
         Raises:
             SmartcarException
         """
-        path = "engine/oil"
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("engine/oil", raw=raw)
 
-    def odometer(self) -> types.Odometer:
+    def odometer(self, raw: bool = None) -> types.Odometer:
         """
         GET Vehicle.odometer
 
+        Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
         Returns:
             Odometer: NamedTuple("Odometer", [("distance", float), ("meta", namedtuple)])
 
         Raises:
             SmartcarException
         """
-        path = "odometer"
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("odometer", raw=raw)
 
     def service_history(
-        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        raw: bool = None,
     ) -> types.ServiceHistory:
         """
         Returns a list of all the service records performed on the vehicle,
@@ -218,6 +325,8 @@ class Vehicle(object):
             start_date (Optional[str]): The start date for the record filter, either in 'YYYY-MM-DD' or
                                         'YYYY-MM-DDTHH:MM:SS.SSSZ' format.
             end_date (Optional[str]): The end date for the record filter, similar format to start_date.
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
 
         Returns:
             ServiceHistory: NamedTuple("ServiceHistory", [("items", List[ServiceRecord]), ("meta", namedtuple)])
@@ -229,22 +338,54 @@ class Vehicle(object):
             Smartcar API Documentation for Vehicle Service History:
             https://smartcar.com/docs/api#get-vehicle-service-history
         """
-        path = "service/history"
-        url = self._format_url(path)
-        headers = self._get_headers()
         params = {}
         if start_date:
             params["startDate"] = start_date
         if end_date:
             params["endDate"] = end_date
 
-        response = helpers.requester("GET", url, headers=headers, params=params)
-        return types.select_named_tuple(path, response)
+        return self._get("service/history", params, raw=raw)
+
+    def iter_service_history(
+        self,
+        start_date: str,
+        end_date: Optional[str] = None,
+        window_days: int = 365,
+    ) -> Iterator[types.ServiceRecord]:
+        """
+        Stream the service records of a long date range. The range is requested
+        `window_days` at a time, oldest window first, so that only the records of
+        one window are held at once.
+
+        Args:
+            start_date (str): 'YYYY-MM-DD', or a timestamp of which only the date
+                is used
+            end_date (Optional[str]): similar format to start_date. Defaults to today.
+            window_days (int, optional): Number of days requested at a time
+
+        Returns:
+            Iterator[ServiceRecord]
+
+        Raises:
+            SmartcarException
+        """
+        windows = self._service_history_windows(start_date, end_date, window_days)
+        return (
+            record
+            for window_start, window_end in windows
+            for record in self.service_history(window_start, window_end).items
+        )
 
-    def diagnostic_system_status(self) -> types.DiagnosticSystemStatus:
+    def diagnostic_system_status(
+        self, raw: bool = None
+    ) -> types.DiagnosticSystemStatus:
         """
         GET Vehicle.diagnostic_system_status
 
+        Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
         Returns:
             DiagnosticSystemStatus: NamedTuple("DiagnosticSystemStatus", [
                 ("systems", List[DiagnosticSystem]),
@@ -254,16 +395,18 @@ class Vehicle(object):
         Raises:
             SmartcarException
         """
-        path = "diagnostics/system_status"
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("diagnostics/system_status", raw=raw)
 
-    def diagnostic_trouble_codes(self) -> types.DiagnosticTroubleCodes:
+    def diagnostic_trouble_codes(
+        self, raw: bool = None
+    ) -> types.DiagnosticTroubleCodes:
         """
         GET Vehicle.diagnostic_trouble_codes
 
+        Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
         Returns:
             DiagnosticTroubleCodes: NamedTuple("DiagnosticTroubleCodes", [
                 ("active_codes", List[DiagnosticTroubleCode]),
@@ -273,29 +416,31 @@ class Vehicle(object):
         Raises:
             SmartcarException
         """
-        path = "diagnostics/dtcs"
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("diagnostics/dtcs", raw=raw)
 
-    def location(self) -> types.Location:
+    def location(self, raw: bool = None) -> types.Location:
         """
         GET Vehicle.location
 
+        Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
         Returns:
             Location: NamedTuple("Location", [("latitude", float), ("longitude", float), ("meta", namedtuple)])
 
         Raises:
             SmartcarException
         """
-        path = "location"
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("location", raw=raw)
 
-    def permissions(self, paging: dict = None):
+    def permissions(
+        self,
+        paging: dict = None,
+        raw: bool = None,
+        fetch_all: bool = False,
+        max_concurrency: int = pagination._FETCH_ALL_CONCURRENCY,
+    ):
         """
         GET Vehicle.permissions
 
@@ -305,31 +450,66 @@ class Vehicle(object):
 
                 offset (int, optional): The index to start permission list at
 
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
+            fetch_all (bool, optional): Return the permissions of every page from
+                `paging` on. The pages after the first one are requested in
+                parallel, and are always decoded.
+
+            max_concurrency (int, optional): With `fetch_all`, the maximum number
+                of pages requested at once
+
         Returns:
             list: vehicle's permissions
 
         Raises:
             SmartcarException
         """
-        path = "permissions"
-        url = self._format_url(path)
-        headers = self._get_headers()
-
-        if paging is None:
-            response = helpers.requester("GET", url, headers=self._get_headers())
-        else:
-            limit = paging.get("limit", 25)
-            offset = paging.get("offset", 0)
-            response = helpers.requester(
-                "GET", url, headers=headers, params={"limit": limit, "offset": offset}
+        if fetch_all:
+            first, permissions = pagination.fetch_all(
+                lambda page_paging: self.permissions(page_paging, raw=False),
+                operator.attrgetter("permissions"),
+                paging or {},
+                max_concurrency,
             )
+            return first._replace(permissions=permissions)
 
-        return types.select_named_tuple(path, response)
+        return self._get("permissions", self._permissions_params(paging), raw=raw)
 
-    def attributes(self) -> types.Attributes:
+    def iter_permissions(self, limit: int = 25, prefetch: bool = True) -> Iterator[str]:
+        """
+        Iterate over all the vehicle's permissions, requesting `limit` of them at
+        a time. While the permissions of a page are consumed, the next page is
+        prefetched.
+
+        Args:
+            limit (int, optional): The number of permissions requested at a time
+
+            prefetch (bool, optional): Request the next page in the background
+
+        Returns:
+            Iterator[str]: vehicle's permissions
+
+        Raises:
+            SmartcarException
+        """
+        return pagination.iter_items(
+            lambda paging: self.permissions(paging, raw=False),
+            operator.attrgetter("permissions"),
+            pagination.next_offset,
+            {"limit": limit, "offset": 0},
+            prefetch,
+        )
+
+    def attributes(self, raw: bool = None) -> types.Attributes:
         """
         GET Vehicle.attributes
 
+        Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
         Returns:
             Attributes: NamedTuple("Attributes", [("id", str), ("make", str), ("model", str), ("year", str),
             ("meta", namedtuple)])
@@ -337,33 +517,33 @@ class Vehicle(object):
         Raises:
             SmartcarException
         """
-        path = ""
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("", raw=raw)
 
-    def get_charge_limit(self) -> types.ChargeLimit:
+    def get_charge_limit(self, raw: bool = None) -> types.ChargeLimit:
         """
         GET Vehicle.get_charge_limit
 
+        Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
         Returns:
             ChargeLimit = NamedTuple("ChargeLimit", [("limit", float), ("meta", namedtuple)])
 
         Raises:
             SmartcarException
         """
-        path = "charge/limit"
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("charge/limit", raw=raw)
 
-    def lock_status(self) -> types.LockStatus:
+    def lock_status(self, raw: bool = None) -> types.LockStatus:
         """
             GET Vehicle.lock_status
 
-            Returns:
+            Args:
+            raw (bool, optional): Return the undecoded RawResponse. Defaults to
+                the vehicle's `raw` option.
+
+        Returns:
                 LockStatus = NamedTuple("LockStatus", [
                     ("is_locked", bool)
                     ("doors", List[Door]),
@@ -377,11 +557,7 @@ class Vehicle(object):
             Raises:
                 SmartcarException
         """
-        path = "security"
-        url = self._format_url(path)
-        headers = self._get_headers()
-        response = helpers.requester("GET", url, headers=headers)
-        return types.select_named_tuple(path, response)
+        return self._get("security", raw=raw)
 
     # ===========================================
     # Action (POST) Requests
@@ -397,12 +573,7 @@ class Vehicle(object):
         Raises:
             SmartcarException
         """
-        url = self._format_url("security")
-        headers = self._get_headers(need_unit_system=False)
-        response = helpers.requester(
-            "POST", url, headers=headers, json={"action": "LOCK"}
-        )
-        return types.select_named_tuple("lock", response)
+        return self._action("security", {"action": "LOCK"}, "lock")
 
     def unlock(self) -> types.Status:
         """
@@ -414,12 +585,7 @@ class Vehicle(object):
         Raises:
             SmartcarException
         """
-        url = self._format_url("security")
-        headers = self._get_headers(need_unit_system=False)
-        response = helpers.requester(
-            "POST", url, headers=headers, json={"action": "UNLOCK"}
-        )
-        return types.select_named_tuple("unlock", response)
+        return self._action("security", {"action": "UNLOCK"}, "unlock")
 
     def start_charge(self) -> types.Status:
         """
@@ -431,12 +597,7 @@ class Vehicle(object):
         Raises:
             SmartcarException
         """
-        url = self._format_url("charge")
-        headers = self._get_headers(need_unit_system=False)
-        response = helpers.requester(
-            "POST", url, headers=headers, json={"action": "START"}
-        )
-        return types.select_named_tuple("start_charge", response)
+        return self._action("charge", {"action": "START"}, "start_charge")
 
     def stop_charge(self) -> types.Status:
         """
@@ -448,12 +609,7 @@ class Vehicle(object):
         Raises:
             SmartcarException
         """
-        url = self._format_url("charge")
-        headers = self._get_headers(need_unit_system=False)
-        response = helpers.requester(
-            "POST", url, headers=headers, json={"action": "STOP"}
-        )
-        return types.select_named_tuple("stop_charge", response)
+        return self._action("charge", {"action": "STOP"}, "stop_charge")
 
     def set_charge_limit(self, limit) -> types.Status:
         """
@@ -465,12 +621,7 @@ class Vehicle(object):
         Raises:
             SmartcarException
         """
-        url = self._format_url("charge/limit")
-        headers = self._get_headers(need_unit_system=False)
-        response = helpers.requester(
-            "POST", url, headers=headers, json={"limit": limit}
-        )
-        return types.select_named_tuple("set_charge_limit", response)
+        return self._action("charge/limit", {"limit": limit}, "set_charge_limit")
 
     def send_destination(self, latitude, longitude) -> types.Action:
         """
@@ -482,56 +633,30 @@ class Vehicle(object):
         Raises:
             SmartcarException
         """
-        url = self._format_url("navigation/destination")
-        headers = self._get_headers(need_unit_system=False)
-        response = helpers.requester(
-            "POST",
-            url,
-            headers=headers,
-            json={"latitude": latitude, "longitude": longitude},
-        )
-        return types.select_named_tuple("send_destination", response)
-
-    @staticmethod
-    def _batch_path_response(
-        path: str, path_response: dict, top_response: dict
-    ) -> Callable[[], namedtuple]:
-        if path_response.get("code") == 200:
-            # attach top-level sc-request-id to res_dict
-            path_response["headers"]["sc-request-id"] = top_response.headers.get(
-                "sc-request-id"
-            )
-            # use lambda default args to avoid issues with closures
-            return lambda p=path, r=path_response: types.select_named_tuple(p, r)
-
-        # if individual response is erroneous, attach a lambda that returns a SmartcarException
-        def _attribute_raise_exception(smartcar_exception):
-            raise smartcar_exception
-
-        path_status_code = path_response.get("code")
-        path_headers = path_response.get("headers", {})
-        path_body = json.dumps(path_response.get("body"))
-        sc_exception = sce.exception_factory(
-            path_status_code, path_headers, path_body, False
+        return self._action(
+            "navigation/destination",
+            {"latitude": latitude, "longitude": longitude},
+            "send_destination",
         )
-        return lambda e=sc_exception: _attribute_raise_exception(e)
 
-    def batch(self, paths: List[str]) -> namedtuple:
+    def batch(self, paths: List[str], raw: bool = None) -> types.BatchResult:
         """
         POST Vehicle.batch
 
         This method follows a series of steps:
         1. Format and send request to Smartcar API batch endpoint
-        2. Store each response in a batch dictionary.
-        3. Attach meta object for the high-level batch request to the dictionary
-        4. Transform batch_dict into a namedtuple, and return
+        2. Wrap the response of each path in a BatchResult, which decodes it
+           (or builds its SmartcarException) the first time it is read
 
         Args:
             paths (str[]): an array of paths to make
             the batch request to
 
+            raw (bool, optional): Return the undecoded RawResponse of the batch
+            request. Defaults to the vehicle's `raw` option.
+
         Returns:
-            namedtuple: the responses from Smartcar API, each attribute is a lambda
+            BatchResult: the responses from Smartcar API, each attribute is a function
             that returns the appropriate NamedTuple OR raises a SmartcarException (if
             the request results in an error).
 
@@ -541,29 +666,30 @@ class Vehicle(object):
         # STEP 1 - Send Request
         url = self._format_url("batch")
         headers = self._get_headers()
-        json_body = {"requests": [{"path": path} for path in paths]}
-        response = helpers.requester("POST", url, headers=headers, json=json_body)
-
-        # STEP 2 - Format batch_dict
-        # [KEYS] will represent the path sent in the batch.
-        # The name of the key will eventually be the name of the method attached to the final return.
-        # [VALUES] are lambdas that return a NamedTuple OR raises a SmartcarException, depending on the
-        # success of the request.
-        batch_dict = dict()
-        path_responses = response.json()["responses"]
-        for path_response in path_responses:
-            path, attribute = helpers.format_path_and_attribute_for_batch(
-                path_response["path"]
-            )
-            batch_dict[attribute] = Vehicle._batch_path_response(
-                path, path_response, response
-            )
+        json_body = self._batch_body(paths)
+        response = helpers.requester(
+            "POST",
+            url,
+            headers=headers,
+            json=json_body,
+            idempotent=True,
+            **self._request_options("batch"),
+        )
+        if self._raw_mode(raw):
+            return types.raw_response(response)
 
-        # STEP 3 - Attach Meta to batch_dict
-        batch_dict["meta"] = types.build_meta(response.headers)
+        # STEP 2 - Wrap the path responses
+        return Vehicle._batch_result(response)
 
-        # STEP 4 - Transform batch_dict into a namedtuple
-        return types.generate_named_tuple(batch_dict, "batch")
+    @staticmethod
+    def _batch_body(paths: List[str]) -> dict:
+        return {"requests": [{"path": path} for path in paths]}
+
+    @staticmethod
+    def _batch_result(response) -> types.BatchResult:
+        return types.BatchResult(
+            response.json()["responses"], response.headers, response.retry_count
+        )
 
     # ===========================================
     # DELETE requests
@@ -585,7 +711,12 @@ class Vehicle(object):
         """
         url = self._format_url("application")
         headers = self._get_headers(need_unit_system=False)
-        response = helpers.requester("DELETE", url, headers=headers)
+        response = helpers.requester(
+            "DELETE",
+            url,
+            headers=headers,
+            **self._request_options("application"),
+        )
         return types.select_named_tuple("disconnect", response)
 
     # ===========================================
@@ -602,10 +733,7 @@ class Vehicle(object):
         Returns:
             Subscribe: NamedTuple("Subscribe", [("webhook_id", str"), ("vehicle_id", str), ("meta", namedtuple)
         """
-        url = self._format_url(f"webhooks/{webhook_id}")
-        headers = self._get_headers(need_unit_system=False)
-        response = helpers.requester("POST", url, headers=headers)
-        return types.select_named_tuple("subscribe", response)
+        return self._action(f"webhooks/{webhook_id}", None, "subscribe")
 
     def unsubscribe(self, amt: str, webhook_id: str) -> types.Status:
         """
@@ -622,7 +750,12 @@ class Vehicle(object):
 
         # Note: Authorization header is different, compared to the other methods
         headers = {"Authorization": f"Bearer {amt}"}
-        response = helpers.requester("DELETE", url, headers=headers)
+        response = helpers.requester(
+            "DELETE",
+            url,
+            headers=headers,
+            **self._request_options(f"webhooks/{webhook_id}"),
+        )
         return types.select_named_tuple("unsubscribe", response)
 
     # ===========================================
@@ -630,7 +763,12 @@ class Vehicle(object):
     # ===========================================
 
     def request(
-        self, method: str, path: str, body: dict = {}, headers: dict = {}
+        self,
+        method: str,
+        path: str,
+        body: dict = {},
+        headers: dict = {},
+        raw: bool = None,
     ) -> types.Response:
         """
         Utility method to make a request to a Smartcar endpoint - can be used
@@ -641,26 +779,30 @@ class Vehicle(object):
             path (str): The path to make the request to.
             body (dict): The request body.
             headers (dict): The headers to include in the request.
+            raw (bool): Return the undecoded RawResponse. Defaults to the
+                vehicle's `raw` option.
 
         Returns:
-            Response = NamedTuple("Response", [("body", dict), ("meta", namedtuple)])
+            Response = NamedTuple("Response", [("body", dict), ("meta", namedtuple)]),
+            or the result of the decoder registered for `path` with
+            `smartcar.register_decoder`
 
         Raises:
             SmartcarException
         """
         url = self._format_url(path)
+        headers = self._request_headers(headers)
+        response = helpers.requester(
+            method,
+            url,
+            headers=headers,
+            json=body,
+            **self._request_options(path),
+        )
+        if self._raw_mode(raw):
+            return types.raw_response(response)
 
-        # Authorization header not provided
-        if not "Authorization" in headers:
-            has_units_header = "sc-unit-system" in headers
-            generated_headers = self._get_headers(
-                need_unit_system=(not has_units_header)
-            )
-            headers.update(generated_headers)
-
-        response = helpers.requester(method, url, headers=headers, json=body)
-
-        return types.select_named_tuple("request", response)
+        return types.select_named_tuple(types.request_path(path), response)
 
     # ===========================================
     # Utility
@@ -686,6 +828,166 @@ class Vehicle(object):
     # ===========================================
     # Private methods
     # ===========================================
+    def _get(self, path: str, params: dict = None, raw: bool = None) -> NamedTuple:
+        """
+        Returns (NamedTuple): the decoded response to a GET request to `path`, or
+            its RawResponse
+        """
+        raw = self._raw_mode(raw)
+        if self._cache is not None and not raw:
+            key = (self.vehicle_id,) + self._request_key("GET", path, params)
+            return self._cache.get_or_load(key, lambda: self._load(path, params))
+        return self._load(path, params, raw)
+
+    def _load(self, path: str, params: dict = None, raw: bool = False) -> NamedTuple:
+        if self._coalescing():
+            key = self._request_key("GET", path, params) + (raw,)
+            return coalesce.single_flight.do(
+                key, lambda: self._fetch(path, params, raw)
+            )
+        return self._fetch(path, params, raw)
+
+    def _fetch(self, path: str, params: dict = None, raw: bool = False) -> NamedTuple:
+        if self._auto_batch is not None and params is None and not raw:
+            return self._auto_batch.get(self, path)
+        return self._send_get(path, params, raw)
+
+    def _send_get(
+        self, path: str, params: dict = None, raw: bool = False
+    ) -> NamedTuple:
+        url = self._format_url(path)
+        headers = self._get_headers()
+        response = helpers.requester(
+            "GET",
+            url,
+            headers=headers,
+            params=params,
+            **self._request_options(path),
+        )
+        if raw:
+            return types.raw_response(response)
+        return types.select_named_tuple(path, response)
+
+    def _action(self, path: str, body: Optional[dict], result_path: str) -> NamedTuple:
+        """
+        Returns (NamedTuple): the decoded response to a POST request to `path`
+        """
+        url = self._format_url(path)
+        headers = self._get_headers(need_unit_system=False)
+        response = helpers.requester(
+            "POST",
+            url,
+            headers=headers,
+            json=body,
+            **self._request_options(path),
+        )
+        self._invalidate_cache()
+        return types.select_named_tuple(result_path, response)
+
+    def _invalidate_cache(self) -> None:
+        # Actions change the vehicle's state, e.g. lock_status() after lock()
+        if self._cache is not None:
+            self._cache.invalidate(self.vehicle_id)
+
+    def _raw_mode(self, raw: Optional[bool]) -> bool:
+        return self._raw if raw is None else raw
+
+    def _coalescing(self) -> bool:
+        if self._coalesce is None:
+            return coalesce.get_coalescing()
+        return self._coalesce
+
+    def _request_key(self, method: str, path: str, params: dict = None) -> tuple:
+        """
+        Returns (tuple): identity of a request, for coalescing identical ones
+        """
+        return (
+            method,
+            self._format_url(path),
+            tuple(sorted(params.items())) if params else (),
+            self._unit_system.lower(),
+            self._credentials(),
+        )
+
+    def _credentials(self) -> Hashable:
+        """
+        Returns: identity of the token of the requests, which does not change
+            when a TokenManager refreshes it
+        """
+        if self._token_manager is not None:
+            return (self._token_manager, self._token_key)
+        return self._access_token
+
+    def _request_options(self, path: str) -> dict:
+        """
+        Returns (dict): the `helpers.requester` options of a request to `path`
+        """
+        return {
+            "retry_policy": self._retry_policy,
+            "timeout": self._timeout_for(path),
+            "rate_limiter": self._rate_limiter,
+            "rate_limit_keys": (
+                ratelimit.vehicle_key(self.vehicle_id),
+                ratelimit.app_key(self._client_id),
+            ),
+        }
+
+    def _timeout_for(self, path: str):
+        """
+        Returns: the timeout of requests to `path`, if one was set for this vehicle
+        """
+        return self._endpoint_timeouts.get(path, self._timeout)
+
+    @staticmethod
+    def _service_history_windows(
+        start_date: str, end_date: Optional[str], window_days: int
+    ) -> List[Tuple[str, str]]:
+        """
+        Returns (list): consecutive ('YYYY-MM-DD', 'YYYY-MM-DD') ranges, both
+            ends included, covering `start_date` to `end_date`
+        """
+        if window_days < 1:
+            raise ValueError("'window_days' must be at least 1")
+
+        start = datetime.date.fromisoformat(start_date[:10])
+        if end_date:
+            end = datetime.date.fromisoformat(end_date[:10])
+        else:
+            end = datetime.datetime.now(datetime.timezone.utc).date()
+        if start > end:
+            raise ValueError("'start_date' must not be after 'end_date'")
+
+        windows = []
+        step = datetime.timedelta(days=window_days)
+        while start <= end:
+            window_end = min(start + step - datetime.timedelta(days=1), end)
+            windows.append((start.isoformat(), window_end.isoformat()))
+            start = window_end + datetime.timedelta(days=1)
+        return windows
+
+    @staticmethod
+    def _permissions_params(paging: Optional[dict]) -> Optional[dict]:
+        if paging is None:
+            return None
+        return {"limit": paging.get("limit", 25), "offset": paging.get("offset", 0)}
+
+    def _request_headers(self, headers: dict) -> dict:
+        """
+        Returns (dict): a copy of the headers passed to `request`, with the
+        generated headers added when no Authorization header was provided.
+        """
+        headers = dict(headers)
+
+        # Authorization header not provided
+        if not "Authorization" in headers:
+            has_units_header = "sc-unit-system" in headers
+            generated_headers = self._get_headers(
+                need_unit_system=(not has_units_header)
+            )
+            headers.update(generated_headers)
+
+        return headers
+
     def _format_query_params(self) -> str:
         """
         Returns (str): Query parameters as a query string
@@ -1,7 +1,9 @@
 import pytest
 
 import smartcar as sc
+import smartcar.config as config
 import tests.auth_helpers as ah
+from tests.server_helpers import StandInServer
 
 
 # Fixtures that can be used throughout the testing suite:
@@ -184,3 +186,21 @@ def ford_car(access_ford):
     vehicle_ids = sc.get_vehicles(access_ford.access_token)
     vehicle_id = vehicle_ids.vehicles[0]
     yield sc.Vehicle(vehicle_id, access_ford.access_token)
+
+
+# # Stand-in server fixtures:
+@pytest.fixture
+def stand_in_server(monkeypatch):
+    """
+    Start a local stand-in for Smartcar API, and point the SDK's
+    API, auth and management origins at it.
+
+    Yields:
+        server(tests.server_helpers.StandInServer)
+    """
+    server = StandInServer().start()
+    monkeypatch.setattr(config, "API_URL", server.url)
+    monkeypatch.setattr(config, "AUTH_URL", f"{server.url}/oauth/token")
+    monkeypatch.setattr(config, "MANAGEMENT_API_URL", server.url)
+    yield server
+    server.stop()
@@ -1,3 +1,5 @@
+from collections.abc import Sequence
+
 import smartcar.types as types
 from smartcar.exception import SmartcarException
 import tests.auth_helpers as ah
@@ -167,8 +169,8 @@ def test_service_history(ford_car):
     assert hasattr(response, "_fields"), "Response should have '_fields' attribute"
     assert "items" in response._fields, "'items' should be a key in the response fields"
 
-    # Check the 'items' array.
-    assert isinstance(response.items, list), "Items should be a list"
+    # Check the 'items' sequence.
+    assert isinstance(response.items, Sequence), "Items should be a sequence"
 
     # Iterate over each item in the 'items' list to perform further validations.
     for item in response.items:
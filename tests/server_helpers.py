@@ -0,0 +1,105 @@
+import json
+import threading
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# A local stand-in for Smartcar API, used by unit tests that need real HTTP
+# traffic (transport conformance, retries, timeouts...).
+#
+# Responses are scripted per (method, path). If more than one response is
+# scripted for a route they are served in order, and the last one repeats.
+
+
+class StandInServer(object):
+    def __init__(self):
+        self.requests = []
+        self._routes = defaultdict(deque)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def add(
+        self,
+        method,
+        path,
+        status=200,
+        json_body=None,
+        body=None,
+        headers=None,
+        delay=0,
+    ):
+        response_headers = {"SC-Request-Id": "stand-in-request-id"}
+        if json_body is not None:
+            body = json.dumps(json_body)
+            response_headers["Content-Type"] = "application/json"
+        response_headers.update(headers or {})
+
+        with self._lock:
+            self._routes[(method, path)].append(
+                (status, response_headers, (body or "").encode("utf-8"), delay)
+            )
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next_response(self, method, path):
+        with self._lock:
+            queue = self._routes.get((method, path))
+            if not queue:
+                return 404, {"Content-Type": "text/plain"}, b"Not Found", 0
+            if len(queue) > 1:
+                return queue.popleft()
+            return queue[0]
+
+
+def _handler_for(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _handle(self):
+            parsed = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            server.requests.append(
+                {
+                    "method": self.command,
+                    "path": parsed.path,
+                    "query": parse_qs(parsed.query),
+                    "headers": dict(self.headers.items()),
+                    "body": body,
+                }
+            )
+
+            status, headers, content, delay = server._next_response(
+                self.command, parsed.path
+            )
+            if delay:
+                threading.Event().wait(delay)
+
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, str(value))
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        do_GET = do_POST = do_DELETE = do_PUT = _handle
+
+    return Handler
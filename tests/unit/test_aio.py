@@ -0,0 +1,165 @@
+import asyncio
+import json
+
+import pytest
+
+import smartcar.aio as aio
+from smartcar.exception import SmartcarException
+
+pytest.importorskip("httpx")
+
+VID = "ada7207c-3c0a-4027-a47f-6215ce6f7b93"
+TOKEN = "9ad942c6-32b8-4af2-ada6-5e8ecdbad9c2"
+
+
+def test_async_vehicle_getters(stand_in_server):
+    stand_in_server.add(
+        "GET",
+        f"/v2.0/vehicles/{VID}/battery",
+        json_body={"percentRemaining": 0.5, "range": 100.0},
+        headers={"sc-unit-system": "metric"},
+    )
+    stand_in_server.add(
+        "GET", f"/v2.0/vehicles/{VID}/odometer", json_body={"distance": 1234.5}
+    )
+
+    async def read():
+        vehicle = aio.AsyncVehicle(VID, TOKEN)
+        return await asyncio.gather(vehicle.battery(), vehicle.odometer())
+
+    battery, odometer = asyncio.run(read())
+
+    assert battery.percent_remaining == 0.5
+    assert battery.meta.unit_system == "metric"
+    assert odometer.distance == 1234.5
+    assert stand_in_server.requests[0]["headers"]["Authorization"] == f"Bearer {TOKEN}"
+
+
+def test_async_vehicle_action_and_batch(stand_in_server):
+    stand_in_server.add(
+        "POST",
+        f"/v2.0/vehicles/{VID}/security",
+        json_body={"status": "success", "message": "Successfully sent request."},
+    )
+    stand_in_server.add(
+        "POST",
+        f"/v2.0/vehicles/{VID}/batch",
+        json_body={
+            "responses": [
+                {
+                    "path": "/odometer",
+                    "code": 200,
+                    "body": {"distance": 1},
+                    "headers": {},
+                }
+            ]
+        },
+    )
+
+    async def run():
+        vehicle = aio.AsyncVehicle(VID, TOKEN)
+        return await vehicle.lock(), await vehicle.batch(["/odometer"])
+
+    action, batch = asyncio.run(run())
+
+    assert action.status == "success"
+    assert json.loads(stand_in_server.requests[0]["body"]) == {"action": "LOCK"}
+    assert batch.odometer().distance == 1
+
+
+def test_async_errors_raise_smartcar_exception(stand_in_server):
+    stand_in_server.add(
+        "GET",
+        f"/v2.0/vehicles/{VID}/location",
+        status=409,
+        json_body={
+            "statusCode": 409,
+            "type": "VEHICLE_STATE",
+            "code": "ASLEEP",
+            "description": "The vehicle is asleep.",
+            "requestId": "stand-in-request-id",
+        },
+    )
+
+    with pytest.raises(SmartcarException) as e:
+        asyncio.run(aio.AsyncVehicle(VID, TOKEN).location())
+
+    assert e.value.type == "VEHICLE_STATE"
+    assert e.value.code == "ASLEEP"
+
+
+def test_async_static_methods(stand_in_server):
+    stand_in_server.add(
+        "GET",
+        "/v2.0/vehicles",
+        json_body={"vehicles": [VID], "paging": {"count": 1, "offset": 0}},
+    )
+    stand_in_server.add(
+        "GET",
+        "/v2.0/management/connections/",
+        json_body={
+            "connections": [{"vehicleId": VID, "userId": "user", "connectedAt": None}],
+            "paging": {"cursor": None},
+        },
+    )
+
+    async def run():
+        return (
+            await aio.get_vehicles(TOKEN, {"limit": 1}),
+            await aio.get_connections("amt"),
+        )
+
+    vehicles, connections = asyncio.run(run())
+
+    assert vehicles.vehicles == [VID]
+    assert vehicles.paging.count == 1
+    assert stand_in_server.requests[0]["query"] == {"limit": ["1"]}
+    assert connections.connections[0].vehicle_id == VID
+
+
+def test_async_exchange_refresh_token(stand_in_server):
+    stand_in_server.add(
+        "POST",
+        "/oauth/token",
+        json_body={
+            "access_token": "access",
+            "token_type": "Bearer",
+            "expires_in": 7200,
+            "refresh_token": "refresh",
+        },
+    )
+    client = aio.AsyncAuthClient("id", "secret", "https://example.com/auth")
+
+    access = asyncio.run(client.exchange_refresh_token("old-refresh"))
+
+    assert access.access_token == "access"
+    assert access.expiration is not None
+    assert stand_in_server.requests[0]["body"] == (
+        b"grant_type=refresh_token&refresh_token=old-refresh"
+    )
+
+
+def test_async_raw_getter(stand_in_server):
+    stand_in_server.add(
+        "GET", f"/v2.0/vehicles/{VID}/odometer", json_body={"distance": 104.32}
+    )
+    vehicle = aio.AsyncVehicle(VID, TOKEN)
+
+    response = asyncio.run(vehicle.odometer(raw=True))
+
+    assert json.loads(bytes(response.body)) == {"distance": 104.32}
+    assert response.status_code == 200
+
+
+def test_iter_service_history(stand_in_server):
+    path = f"/v2.0/vehicles/{VID}/service/history"
+    stand_in_server.add("GET", path, json_body=[{"serviceId": "a"}])
+    stand_in_server.add("GET", path, json_body=[{"serviceId": "b"}])
+
+    async def read():
+        vehicle = aio.AsyncVehicle(VID, TOKEN)
+        records = vehicle.iter_service_history("2023-01-01", "2023-01-02", 1)
+        return [record.service_id async for record in records]
+
+    assert asyncio.run(read()) == ["a", "b"]
+    assert len(stand_in_server.requests) == 2
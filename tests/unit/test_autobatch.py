@@ -0,0 +1,146 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+import smartcar
+
+VID = "ada7207c-3c0a-4027-a47f-6215ce6f7b93"
+TOKEN = "9ad942c6-32b8-4af2-ada6-5e8ecdbad9c2"
+
+
+def _path_response(path, body, code=200):
+    return {"path": path, "code": code, "body": body, "headers": {}}
+
+
+def _add_batch(server):
+    server.add(
+        "POST",
+        f"/v2.0/vehicles/{VID}/batch",
+        json_body={
+            "responses": [
+                _path_response("/odometer", {"distance": 10}),
+                _path_response("/battery", {"percentRemaining": 0.5, "range": 9}),
+                _path_response(
+                    "/location",
+                    {
+                        "type": "VEHICLE_STATE",
+                        "code": "ASLEEP",
+                        "description": "The vehicle is asleep.",
+                        "statusCode": 409,
+                    },
+                    code=409,
+                ),
+            ]
+        },
+    )
+
+
+def _in_threads(*fns):
+    results = [None] * len(fns)
+
+    def run(i):
+        try:
+            results[i] = fns[i]()
+        except smartcar.SmartcarException as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(fns))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_getters_within_window_share_one_batch(stand_in_server):
+    _add_batch(stand_in_server)
+    batcher = smartcar.AutoBatcher(window=0.2)
+    vehicle = smartcar.Vehicle(VID, TOKEN, {"auto_batch": batcher})
+
+    odometer, battery, location = _in_threads(
+        vehicle.odometer, vehicle.battery, vehicle.location
+    )
+
+    assert odometer.distance == 10
+    assert battery.percent_remaining == 0.5
+    assert isinstance(location, smartcar.SmartcarException)
+    assert location.code == "ASLEEP"
+    assert len(stand_in_server.requests) == 1
+    body = json.loads(stand_in_server.requests[0]["body"])
+    assert sorted(r["path"] for r in body["requests"]) == [
+        "/battery",
+        "/location",
+        "/odometer",
+    ]
+
+
+def test_callers_raise_their_own_errors(stand_in_server):
+    _add_batch(stand_in_server)
+    batcher = smartcar.AutoBatcher(window=0.2)
+    vehicle = smartcar.Vehicle(VID, TOKEN, {"auto_batch": batcher})
+
+    _, first, second = _in_threads(vehicle.odometer, vehicle.location, vehicle.location)
+
+    assert first.code == second.code == "ASLEEP"
+    assert first is not second
+
+    # Same for the error of a whole batch
+    stand_in_server.add(
+        "GET",
+        f"/v2.0/vehicles/{VID}/location",
+        status=409,
+        json_body={
+            "type": "VEHICLE_STATE",
+            "code": "ASLEEP",
+            "description": "The vehicle is asleep.",
+            "statusCode": 409,
+        },
+    )
+    first, second = _in_threads(vehicle.location, vehicle.location)
+
+    assert len(stand_in_server.requests) == 2
+    assert first.code == second.code == "ASLEEP"
+    assert first is not second
+
+
+def test_single_getter_is_sent_alone(stand_in_server):
+    stand_in_server.add(
+        "GET", f"/v2.0/vehicles/{VID}/odometer", json_body={"distance": 3}
+    )
+    vehicle = smartcar.Vehicle(
+        VID, TOKEN, {"auto_batch": smartcar.AutoBatcher(window=0)}
+    )
+
+    assert vehicle.odometer().distance == 3
+    assert stand_in_server.requests[0]["method"] == "GET"
+
+
+def test_full_batches_are_sent_early(stand_in_server):
+    _add_batch(stand_in_server)
+    batcher = smartcar.AutoBatcher(window=5, max_batch_size=2)
+    vehicle = smartcar.Vehicle(VID, TOKEN, {"auto_batch": batcher})
+
+    odometer, battery = _in_threads(vehicle.odometer, vehicle.battery)
+
+    assert odometer.distance == 10
+    assert battery.range == 9
+
+
+def test_async_getters_in_one_tick_share_one_batch(stand_in_server):
+    pytest.importorskip("httpx")
+    _add_batch(stand_in_server)
+    batcher = smartcar.AutoBatcher(window=0)
+
+    async def read():
+        vehicle = smartcar.AsyncVehicle(VID, TOKEN, {"auto_batch": batcher})
+        return await asyncio.gather(
+            vehicle.odometer(), vehicle.battery(), return_exceptions=True
+        )
+
+    odometer, battery = asyncio.run(read())
+
+    assert odometer.distance == 10
+    assert battery.percent_remaining == 0.5
+    assert len(stand_in_server.requests) == 1
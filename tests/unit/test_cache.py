@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import smartcar
+import smartcar.cache as cache
+
+VID = "ada7207c-3c0a-4027-a47f-6215ce6f7b93"
+TOKEN = "9ad942c6-32b8-4af2-ada6-5e8ecdbad9c2"
+BATTERY = {"percentRemaining": 0.5, "range": 100.0}
+
+
+def _data_age(seconds_ago):
+    recorded_at = datetime.now(timezone.utc) - timedelta(seconds=seconds_ago)
+    return recorded_at.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _add_battery(server, seconds_ago=0, **kwargs):
+    server.add(
+        "GET",
+        f"/v2.0/vehicles/{VID}/battery",
+        json_body=BATTERY,
+        headers={"sc-data-age": _data_age(seconds_ago)},
+        **kwargs,
+    )
+
+
+def test_fresh_responses_are_served_from_cache(stand_in_server):
+    _add_battery(stand_in_server, seconds_ago=5)
+    response_cache = cache.ResponseCache(max_age=30)
+    vehicle = smartcar.Vehicle(VID, TOKEN, {"cache": response_cache})
+
+    first = vehicle.battery()
+    second = smartcar.Vehicle(VID, TOKEN, {"cache": response_cache}).battery()
+    with smartcar.max_age(1):
+        third = vehicle.battery()
+
+    assert second is first
+    assert third is not first
+    assert len(stand_in_server.requests) == 2
+    assert response_cache.stats() == cache.CacheStats(1, 0, 2, 0, 1)
+
+
+def test_old_data_is_fetched_again(stand_in_server):
+    _add_battery(stand_in_server, seconds_ago=120)
+    vehicle = smartcar.Vehicle(VID, TOKEN, {"cache": cache.ResponseCache(max_age=60)})
+
+    vehicle.battery()
+    vehicle.battery()
+
+    assert len(stand_in_server.requests) == 2
+
+
+def test_entries_are_keyed_by_request_and_evicted(stand_in_server):
+    _add_battery(stand_in_server)
+    stand_in_server.add(
+        "GET", f"/v2.0/vehicles/{VID}/odometer", json_body={"distance": 1}
+    )
+    response_cache = cache.ResponseCache(max_entries=1)
+    vehicle = smartcar.Vehicle(VID, TOKEN, {"cache": response_cache})
+    imperial = smartcar.Vehicle(
+        VID, TOKEN, {"cache": response_cache, "unit_system": "imperial"}
+    )
+
+    vehicle.battery()
+    imperial.battery()
+    vehicle.odometer()
+
+    assert len(stand_in_server.requests) == 3
+    assert response_cache.stats().evictions == 2
+    assert response_cache.stats().size == 1
+
+
+def test_actions_invalidate_the_vehicle(stand_in_server):
+    _add_battery(stand_in_server)
+    stand_in_server.add(
+        "POST",
+        f"/v2.0/vehicles/{VID}/security",
+        json_body={"status": "success", "message": "ok"},
+    )
+    response_cache = cache.ResponseCache()
+    vehicle = smartcar.Vehicle(VID, TOKEN, {"cache": response_cache})
+
+    vehicle.battery()
+    vehicle.lock()
+    vehicle.battery()
+
+    assert len(stand_in_server.requests) == 3
+
+
+def test_stale_while_revalidate(stand_in_server):
+    _add_battery(stand_in_server, seconds_ago=10)
+    response_cache = cache.ResponseCache(max_age=5, stale_while_revalidate=60)
+    vehicle = smartcar.Vehicle(VID, TOKEN, {"cache": response_cache})
+
+    first = vehicle.battery()
+    stale = vehicle.battery()
+    deadline = time.monotonic() + 2
+    while len(stand_in_server.requests) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert stale is first
+    assert len(stand_in_server.requests) == 2
+    assert response_cache.stats().stale_hits == 1
+
+
+def _wait_for_refresh(response_cache):
+    deadline = time.monotonic() + 2
+    while response_cache._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_background_refresh_runs_in_the_callers_context():
+    response_cache = cache.ResponseCache(max_age=0, stale_while_revalidate=60)
+    response_cache.get_or_load(("vehicle",), lambda: "first")
+    seen = []
+
+    def load():
+        seen.append(cache._max_age.get())
+        return "second"
+
+    with smartcar.max_age(0):
+        assert response_cache.get_or_load(("vehicle",), load) == "first"
+    _wait_for_refresh(response_cache)
+
+    assert seen == [0]
+    assert response_cache.get_or_load(("vehicle",), load, max_age=60) == "second"
+
+
+def test_background_refresh_after_invalidate_is_dropped():
+    response_cache = cache.ResponseCache(max_age=0, stale_while_revalidate=60)
+    response_cache.get_or_load(("vehicle",), lambda: "first")
+    loading = threading.Event()
+    release = threading.Event()
+
+    def load():
+        loading.set()
+        release.wait(2)
+        return "stale"
+
+    response_cache.get_or_load(("vehicle",), load)
+    loading.wait(2)
+    response_cache.invalidate("vehicle")
+    release.set()
+    _wait_for_refresh(response_cache)
+
+    assert response_cache.stats().size == 0
+
+
+def test_async_cache(stand_in_server):
+    pytest.importorskip("httpx")
+    _add_battery(stand_in_server)
+    response_cache = cache.ResponseCache()
+
+    async def read():
+        vehicle = smartcar.AsyncVehicle(VID, TOKEN, {"cache": response_cache})
+        return await vehicle.battery(), await vehicle.battery()
+
+    first, second = asyncio.run(read())
+
+    assert second is first
+    assert len(stand_in_server.requests) == 1
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+
+import pytest
+
+import smartcar
+import smartcar.coalesce as coalesce
+from smartcar.exception import SmartcarException
+
+VID = "ada7207c-3c0a-4027-a47f-6215ce6f7b93"
+TOKEN = "9ad942c6-32b8-4af2-ada6-5e8ecdbad9c2"
+BATTERY = {"percentRemaining": 0.5, "range": 100.0}
+
+
+def _in_threads(fn, count):
+    results = [None] * count
+
+    def run(i):
+        results[i] = fn()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_single_flight_shares_errors():
+    flight = coalesce.SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        started.set()
+        release.wait()
+        raise SmartcarException(message="boom")
+
+    def call():
+        try:
+            flight.do("key", fail)
+        except SmartcarException as e:
+            return e
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    threading.Timer(0.1, release.set).start()
+    errors = _in_threads(call, 3)
+    leader.join()
+
+    assert len(calls) == 1
+    assert all(isinstance(e, SmartcarException) for e in errors)
+    assert [str(e) for e in errors] == ["boom"] * 3
+    # Every waiter raises its own copy of the error
+    assert len({id(e) for e in errors}) == 3
+    assert flight.in_flight() == 0
+
+
+def test_concurrent_identical_gets_share_one_request(stand_in_server):
+    stand_in_server.add(
+        "GET", f"/v2.0/vehicles/{VID}/battery", json_body=BATTERY, delay=0.3
+    )
+
+    results = _in_threads(
+        lambda: smartcar.Vehicle(VID, TOKEN, {"coalesce": True}).battery(), 5
+    )
+
+    assert len(stand_in_server.requests) == 1
+    assert all(battery.percent_remaining == 0.5 for battery in results)
+
+
+def test_only_identical_concurrent_gets_are_coalesced(stand_in_server):
+    stand_in_server.add("GET", f"/v2.0/vehicles/{VID}/battery", json_body=BATTERY)
+    vehicle = smartcar.Vehicle(VID, TOKEN)
+    imperial = smartcar.Vehicle(VID, TOKEN, {"unit_system": "imperial"})
+    smartcar.set_coalescing(True)
+
+    try:
+        vehicle.battery()
+        vehicle.battery()
+    finally:
+        smartcar.set_coalescing(False)
+
+    assert len(stand_in_server.requests) == 2
+    assert vehicle._request_key("GET", "battery") != imperial._request_key(
+        "GET", "battery"
+    )
+    assert vehicle._request_key("GET", "battery") != vehicle._request_key(
+        "GET", "odometer"
+    )
+
+
+def test_async_identical_gets_share_one_request(stand_in_server):
+    pytest.importorskip("httpx")
+    stand_in_server.add(
+        "GET", f"/v2.0/vehicles/{VID}/battery", json_body=BATTERY, delay=0.2
+    )
+
+    async def read():
+        vehicles = [
+            smartcar.AsyncVehicle(VID, TOKEN, {"coalesce": True}) for _ in range(5)
+        ]
+        return await asyncio.gather(*(vehicle.battery() for vehicle in vehicles))
+
+    results = asyncio.run(read())
+
+    assert len(stand_in_server.requests) == 1
+    assert len({id(battery) for battery in results}) == 1
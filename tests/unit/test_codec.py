@@ -0,0 +1,136 @@
+import json
+
+import pytest
+
+import smartcar
+import smartcar.codec as codec
+
+VID = "ada7207c-3c0a-4027-a47f-6215ce6f7b93"
+TOKEN = "9ad942c6-32b8-4af2-ada6-5e8ecdbad9c2"
+
+
+@pytest.fixture
+def counting_codec():
+    calls = {"loads": 0, "dumps": 0}
+
+    def loads(data):
+        calls["loads"] += 1
+        return json.loads(data)
+
+    def dumps(obj):
+        calls["dumps"] += 1
+        return json.dumps(obj).encode("utf-8")
+
+    previous = smartcar.get_json_codec()
+    smartcar.set_json_codec(smartcar.JsonCodec("counting", loads, dumps))
+    yield calls
+    smartcar.set_json_codec(previous)
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "ujson"])
+def test_codecs_round_trip(name):
+    if name != "json":
+        pytest.importorskip(name)
+    json_codec = codec.json_codec(name)
+    document = {"requests": [{"path": "/odometer"}], "unit": "km", "value": 1.5}
+
+    encoded = json_codec.dumps(document)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == document
+    assert json_codec.loads(encoded) == document
+    assert json_codec.loads(encoded.decode("utf-8")) == document
+
+
+def test_auto_falls_back_to_stdlib(monkeypatch):
+    def missing():
+        raise ImportError
+
+    monkeypatch.setitem(codec._CODECS, "orjson", missing)
+
+    assert codec.json_codec("auto").name == "json"
+
+
+def test_auto_never_picks_ujson(monkeypatch):
+    def missing():
+        raise ImportError
+
+    monkeypatch.setitem(codec._CODECS, "orjson", missing)
+    monkeypatch.setitem(
+        codec._CODECS, "ujson", lambda: codec.JsonCodec("ujson", json.loads, None)
+    )
+
+    assert codec.json_codec("auto").name == "json"
+    assert codec.json_codec("ujson").name == "ujson"
+
+
+def test_set_json_codec_validates():
+    with pytest.raises(ValueError):
+        smartcar.set_json_codec("simplejson")
+    with pytest.raises(TypeError):
+        smartcar.set_json_codec(json)
+
+
+def test_requests_and_responses_use_the_codec(stand_in_server, counting_codec):
+    stand_in_server.add(
+        "POST",
+        f"/v2.0/vehicles/{VID}/batch",
+        json_body={
+            "responses": [
+                {
+                    "path": "/odometer",
+                    "code": 200,
+                    "body": {"distance": 10},
+                    "headers": {},
+                },
+            ]
+        },
+    )
+    vehicle = smartcar.Vehicle(VID, TOKEN)
+
+    response = vehicle.batch(["/odometer"])
+
+    assert response.odometer().distance == 10
+    assert counting_codec == {"loads": 1, "dumps": 1}
+    request = stand_in_server.requests[0]
+    assert request["headers"]["Content-Type"] == "application/json"
+    assert json.loads(request["body"]) == {"requests": [{"path": "/odometer"}]}
+
+
+def test_batch_errors_are_not_parsed_again(stand_in_server, counting_codec):
+    stand_in_server.add(
+        "POST",
+        f"/v2.0/vehicles/{VID}/batch",
+        json_body={
+            "responses": [
+                {
+                    "path": "/location",
+                    "code": 409,
+                    "body": {
+                        "type": "VEHICLE_STATE",
+                        "code": "ASLEEP",
+                        "description": "The vehicle is asleep.",
+                        "statusCode": 409,
+                    },
+                    "headers": {},
+                },
+            ]
+        },
+    )
+    vehicle = smartcar.Vehicle(VID, TOKEN)
+
+    response = vehicle.batch(["/location"])
+
+    with pytest.raises(smartcar.SmartcarException) as e:
+        response.location()
+    assert e.value.code == "ASLEEP"
+    assert counting_codec["loads"] == 1
+
+
+def test_exception_from_json_serializes_unknown_bodies():
+    error = smartcar.exception.exception_from_json(
+        500, {"SC-Request-Id": "abc"}, {"unexpected": True}
+    )
+
+    assert error.type == "SDK_ERROR"
+    assert json.loads(error.message) == {"unexpected": True}
@@ -0,0 +1,70 @@
+import pickle
+
+import pytest
+import requests.structures as rs
+
+import smartcar
+import smartcar.types as types
+
+
+def _meta(request_id="request-id"):
+    return types.build_meta(
+        rs.CaseInsensitiveDict(
+            {
+                "Content-Type": "application/json",
+                "sc-request-id": request_id,
+                "sc-unit-system": "metric",
+                "sc-fetched-at": "2023-05-04T07:20:51.844Z",
+            }
+        ),
+        0,
+    )
+
+
+def _lock_status(meta):
+    doors = [
+        {"type": "frontLeft", "status": "CLOSED"},
+        {"type": "frontRight", "status": "OPEN"},
+    ]
+    return types.LockStatus(True, doors, [], [], [], [], meta)
+
+
+def test_round_trip_to_named_tuple():
+    for result in [
+        types.Battery(0.5, 300.5, _meta()),
+        types.Charge(True, "CHARGING", _meta()),
+        types.Location(37.4, -122.1, _meta()),
+        types.Odometer(10000.0, _meta()),
+        types.TirePressure(219.3, 219.3, 219.3, 219.3, _meta()),
+        _lock_status(_meta()),
+    ]:
+        record = smartcar.to_compact(result)
+
+        assert type(record).__name__ == f"Compact{type(result).__name__}"
+        assert record._fields == result._fields
+        assert not hasattr(record, "__dict__")
+        assert record.to_named_tuple() == result
+        assert record.to_named_tuple().meta._fields == result.meta._fields
+        assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_pool_shares_openings_and_strings():
+    pool = smartcar.CompactPool()
+    meta = _meta()
+
+    first = smartcar.to_compact(_lock_status(meta), pool)
+    second = smartcar.to_compact(_lock_status(_meta()), pool)
+    other = smartcar.to_compact(_lock_status(_meta("other-id")), pool)
+
+    assert first.doors is second.doors
+    assert first.doors[0].type is other.doors[0].type
+    assert first.meta == second.meta
+    assert first.meta != other.meta
+    assert first.meta.unit_system is other.meta.unit_system
+    assert first.meta.request_id == "request-id"
+    assert first.meta.retry_count == 0
+
+
+def test_results_without_compact_record():
+    with pytest.raises(TypeError):
+        smartcar.to_compact(types.Vin("vin", _meta()))
@@ -0,0 +1,199 @@
+import asyncio
+import base64
+
+import pytest
+
+import smartcar
+
+SCOPE = ["read_battery", "read_odometer"]
+OPTIONS = {"client_id": "client-id", "client_secret": "client-secret"}
+
+
+def _compatible(stand_in_server, count=1):
+    for _ in range(count):
+        stand_in_server.add(
+            "GET",
+            "/v2.0/compatibility",
+            json_body={"compatible": True, "reason": None, "capabilities": []},
+        )
+
+
+def test_check_many_caches_results(stand_in_server):
+    _compatible(stand_in_server)
+    checker = smartcar.CompatibilityChecker(SCOPE, options=OPTIONS)
+
+    results = dict(checker.check_many(["VIN1", "VIN2", "VIN3"]))
+
+    assert sorted(results) == ["VIN1", "VIN2", "VIN3"]
+    assert all(result.compatible for result in results.values())
+    assert len(stand_in_server.requests) == 3
+
+    request = stand_in_server.requests[0]
+    credentials = base64.b64encode(b"client-id:client-secret").decode()
+    assert request["headers"]["Authorization"] == f"Basic {credentials}"
+    assert request["query"]["scope"] == ["read_battery read_odometer"]
+
+    # A second screen of the same VINs, with the scope in another order, is
+    # served from the cache
+    other = smartcar.CompatibilityChecker(
+        list(reversed(SCOPE)), options=OPTIONS, cache=checker.cache
+    )
+    assert other.check("vin2") is results["VIN2"]
+    assert len(list(other.check_many(["VIN1", "VIN3"]))) == 2
+    assert len(stand_in_server.requests) == 3
+    assert checker.cache.stats().hits == 3
+
+
+def test_check_many_yields_errors(stand_in_server):
+    stand_in_server.add(
+        "GET",
+        "/v2.0/compatibility",
+        status=400,
+        json_body={
+            "type": "VALIDATION",
+            "code": None,
+            "description": "Invalid VIN.",
+            "statusCode": 400,
+        },
+    )
+    checker = smartcar.CompatibilityChecker(SCOPE, options=OPTIONS)
+
+    ((vin, result),) = checker.check_many(["BAD"])
+
+    assert vin == "BAD"
+    assert isinstance(result, smartcar.SmartcarException)
+    assert checker.cache.stats().size == 0
+
+
+def test_async_check_many(stand_in_server):
+    _compatible(stand_in_server)
+    checker = smartcar.CompatibilityChecker(SCOPE, options=OPTIONS, max_concurrency=2)
+
+    async def check():
+        return [result async for result in checker.async_check_many(["A", "B", "C"])]
+
+    results = asyncio.run(check())
+
+    assert sorted(vin for vin, _ in results) == ["A", "B", "C"]
+    assert len(stand_in_server.requests) == 3
+
+
+def test_results_are_cached_per_request(stand_in_server):
+    _compatible(stand_in_server, 2)
+    checker = smartcar.CompatibilityChecker(SCOPE, options=OPTIONS)
+    flagged = smartcar.CompatibilityChecker(
+        SCOPE, options=dict(OPTIONS, flags={"country": "DE"}), cache=checker.cache
+    )
+
+    checker.check("VIN1")
+    flagged.check("VIN1")
+    assert len(stand_in_server.requests) == 2
+    assert stand_in_server.requests[1]["query"]["flags"] == ["country:DE"]
+
+    # The ttl of the checker applies inside a 'max_age' block too
+    with smartcar.max_age(0):
+        checker.check("VIN1")
+        flagged.check("VIN1")
+    assert len(stand_in_server.requests) == 2
+
+
+def test_max_concurrency_must_be_positive():
+    with pytest.raises(ValueError):
+        smartcar.CompatibilityChecker(SCOPE, options=OPTIONS, max_concurrency=0)
+
+
+def _incompatible(stand_in_server, count=1):
+    for _ in range(count):
+        stand_in_server.add(
+            "GET",
+            "/v2.0/compatibility",
+            json_body={
+                "compatible": False,
+                "reason": "VEHICLE_NOT_COMPATIBLE",
+                "capabilities": [],
+            },
+        )
+
+
+# Same model and year, different serial numbers and check digits
+MODEL_VINS = ["1HGCM82631A00435%d" % i for i in range(5)]
+
+
+def test_vin_prefix():
+    assert smartcar.compatibility.vin_prefix("1hgcm82633a004352") == "1HGCM8263"
+    assert smartcar.compatibility.vin_prefix("short") is None
+
+
+def test_prefix_cache_answers_known_incompatible_models(stand_in_server):
+    _incompatible(stand_in_server)
+    prefixes = smartcar.VinPrefixCache(min_observations=2)
+    checker = smartcar.CompatibilityChecker(
+        SCOPE, options=OPTIONS, prefix_cache=prefixes
+    )
+
+    results = [checker.check(vin) for vin in MODEL_VINS]
+
+    assert [result.compatible for result in results] == [False] * 5
+    assert len(stand_in_server.requests) == 2
+    assert results[2].meta is None
+    assert results[0].meta.request_id == "stand-in-request-id"
+
+    # A forced refresh sends the request even when the prefix is known
+    checker.check(MODEL_VINS[3], refresh=True)
+    assert len(stand_in_server.requests) == 3
+
+
+def test_refresh_bypasses_stale_results(stand_in_server):
+    _compatible(stand_in_server)
+    _incompatible(stand_in_server)
+    cache = smartcar.ResponseCache(stale_while_revalidate=3600)
+    checker = smartcar.CompatibilityChecker(SCOPE, options=OPTIONS, ttl=0, cache=cache)
+
+    assert checker.check("VIN1").compatible
+    # Even a result that may be served stale is requested again, and replaced
+    assert not checker.check("VIN1", refresh=True).compatible
+    assert len(stand_in_server.requests) == 2
+    assert cache.stats().stale_hits == 0
+
+
+def test_prefix_cache_confidence(stand_in_server):
+    _compatible(stand_in_server, 2)
+    _incompatible(stand_in_server)
+    prefixes = smartcar.VinPrefixCache(min_observations=1)
+    checker = smartcar.CompatibilityChecker(
+        SCOPE, options=OPTIONS, prefix_cache=prefixes
+    )
+
+    # Compatible prefixes are only answered with answer="all"
+    checker.check(MODEL_VINS[0])
+    checker.check(MODEL_VINS[1])
+    assert len(stand_in_server.requests) == 2
+    prefixes.answer = "all"
+    assert checker.check(MODEL_VINS[2]).compatible
+    assert len(stand_in_server.requests) == 2
+
+    # A prefix whose VINs disagree is not answered anymore
+    prefixes.answer = "incompatible"
+    checker.check(MODEL_VINS[3])
+    prefixes.answer = "all"
+    checker.check(MODEL_VINS[4])
+    assert len(stand_in_server.requests) == 4
+
+    prefixes.forget(MODEL_VINS[0])
+    assert len(prefixes) == 0
+
+
+def test_prefix_cache_is_bounded():
+    prefixes = smartcar.VinPrefixCache(min_observations=1, max_prefixes=2)
+    result = smartcar.types.CompatibilityV2(False, "VEHICLE_NOT_COMPATIBLE", [], None)
+    vins = ["1HGCM82631A004352", "2HGCM82631A004352", "3HGCM82631A004352"]
+
+    for vin in vins[:2]:
+        prefixes.record(vin, result)
+    assert prefixes.lookup(vins[0]) is not None
+    prefixes.record(vins[2], result)
+
+    # The least recently used prefix is forgotten
+    assert len(prefixes) == 2
+    assert prefixes.lookup(vins[1]) is None
+    assert prefixes.lookup(vins[0]) is not None
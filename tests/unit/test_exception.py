@@ -0,0 +1,120 @@
+import json
+import threading
+
+import pytest
+import requests.structures as rs
+
+import smartcar
+import smartcar.exception as sce
+
+HEADERS = rs.CaseInsensitiveDict(
+    {
+        "Content-Type": "application/json",
+        "SC-Request-Id": "request-id",
+        "Retry-After": "5",
+    }
+)
+
+BODY = json.dumps(
+    {
+        "type": "RATE_LIMIT",
+        "code": "VEHICLE",
+        "description": "Slow down.",
+        "docURL": "https://smartcar.com/docs/errors",
+        "resolution": {"type": "RETRY_LATER"},
+        "suggestedUserMessage": "Try again later.",
+        "statusCode": 429,
+        "requestId": "request-id",
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "status_code, cls",
+    [
+        (401, smartcar.AuthenticationError),
+        (403, smartcar.PermissionDeniedError),
+        (404, smartcar.ResourceNotFoundError),
+        (409, smartcar.VehicleStateError),
+        (429, smartcar.RateLimitError),
+        (430, smartcar.BillingError),
+        (500, smartcar.ServerError),
+        (501, smartcar.CompatibilityError),
+        (502, smartcar.UpstreamError),
+        (503, smartcar.ServerError),
+        (400, smartcar.SmartcarException),
+    ],
+)
+def test_exception_class_from_status_code(status_code, cls):
+    headers = rs.CaseInsensitiveDict({"Content-Type": "application/json"})
+    error = sce.exception_factory(status_code, headers, BODY)
+
+    assert type(error) is cls
+    assert isinstance(error, smartcar.SmartcarException)
+
+
+def test_retry_after_header_marks_rate_limits():
+    assert type(sce.exception_factory(420, HEADERS, BODY)) is smartcar.RateLimitError
+    assert type(sce.exception_factory(503, HEADERS, BODY)) is smartcar.ServerError
+
+
+def test_body_is_parsed_on_first_field_read(monkeypatch):
+    loads = []
+    monkeypatch.setattr(sce.codec, "loads", lambda body: loads.append(body) or {})
+    error = sce.exception_factory(429, HEADERS, BODY)
+
+    assert error.http_status == 429
+    assert repr(error) == "RateLimitError('HTTP 429')"
+    assert loads == []
+
+    monkeypatch.undo()
+    assert error.status_code == 429
+    assert error.type == "RATE_LIMIT"
+    assert error.code == "VEHICLE"
+    assert error.description == "Slow down."
+    assert error.doc_url == "https://smartcar.com/docs/errors"
+    assert error.resolution == {"type": "RETRY_LATER", "url": None}
+    assert error.suggested_user_message == "Try again later."
+    assert error.retry_after == "5"
+    assert error.request_id == "request-id"
+    assert error.detail is None
+    assert str(error) == "RATE_LIMIT:VEHICLE - Slow down."
+
+
+def test_lazy_and_parsed_exceptions_match():
+    lazy = sce.exception_factory(429, HEADERS, BODY)
+    parsed = sce.exception_from_json(429, HEADERS, json.loads(BODY))
+
+    assert type(lazy) is type(parsed)
+    for field in sce._BODY_FIELDS:
+        assert getattr(lazy, field) == getattr(parsed, field)
+
+
+def test_non_json_error_bodies():
+    headers = rs.CaseInsensitiveDict({"Content-Type": "text/html"})
+    error = sce.exception_factory(502, headers, "<html>Bad Gateway</html>")
+
+    assert error.message == "<html>Bad Gateway</html>"
+    assert str(error) == "<html>Bad Gateway</html>"
+    with pytest.raises(AttributeError):
+        error.code
+
+
+def test_concurrent_readers_see_every_field():
+    for _ in range(200):
+        error = sce.exception_factory(409, HEADERS, BODY)
+        barrier = threading.Barrier(4)
+        seen = []
+
+        def read():
+            barrier.wait()
+            seen.append((error.type, error.description, error.status_code))
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert seen == [("RATE_LIMIT", "Slow down.", 429)] * 4
+        assert repr(error) == "VehicleStateError('RATE_LIMIT:VEHICLE - Slow down.')"
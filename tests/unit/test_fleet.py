@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+import smartcar
+from smartcar.exception import SmartcarException
+
+TOKEN = "9ad942c6-32b8-4af2-ada6-5e8ecdbad9c2"
+VEHICLE_IDS = [f"vehicle-{i}" for i in range(10)]
+
+
+def _add_odometers(server, failing=()):
+    for vehicle_id in VEHICLE_IDS:
+        path = f"/v2.0/vehicles/{vehicle_id}/odometer"
+        if vehicle_id in failing:
+            server.add(
+                "GET",
+                path,
+                status=409,
+                json_body={
+                    "statusCode": 409,
+                    "type": "VEHICLE_STATE",
+                    "code": "ASLEEP",
+                    "description": "The vehicle is asleep.",
+                },
+            )
+        else:
+            server.add("GET", path, json_body={"distance": 1})
+
+
+def test_run_streams_results_and_errors(stand_in_server):
+    _add_odometers(stand_in_server, failing=("vehicle-3",))
+    fleet = smartcar.Fleet([(vid, TOKEN) for vid in VEHICLE_IDS], max_concurrency=3)
+
+    results = dict(fleet.run("odometer"))
+
+    assert sorted(results) == VEHICLE_IDS
+    assert isinstance(results["vehicle-3"], SmartcarException)
+    assert results["vehicle-0"].distance == 1
+    progress = fleet.progress()
+    assert (progress.total, progress.succeeded, progress.failed) == (10, 9, 1)
+    assert progress.throughput > 0
+
+
+def test_runs_count_their_own_progress(stand_in_server):
+    _add_odometers(stand_in_server, failing=("vehicle-3",))
+    _add_odometers(stand_in_server)
+    fleet = smartcar.Fleet([(vid, TOKEN) for vid in VEHICLE_IDS], max_concurrency=2)
+
+    first = fleet.run("odometer")
+    second = fleet.run("odometer")
+    # Runs of the same fleet, interleaved
+    for _ in range(3):
+        next(first)
+    list(second)
+
+    assert isinstance(first, smartcar.FleetRun)
+    assert first.progress().completed == 3
+    assert second.progress().completed == 10
+    assert fleet.progress().completed == 10
+    list(first)
+    assert first.progress().failed + second.progress().failed == 1
+
+
+def test_run_reads_vehicles_lazily(stand_in_server):
+    _add_odometers(stand_in_server)
+    pairs = ((vid, TOKEN) for vid in VEHICLE_IDS)
+    fleet = smartcar.Fleet(pairs, max_concurrency=2)
+
+    results = fleet.run("odometer")
+    first = next(results)
+    results.close()
+
+    assert first.vehicle_id in VEHICLE_IDS
+    assert len(stand_in_server.requests) <= 3
+    assert fleet.progress().total is None
+
+
+def test_run_batch_paths(stand_in_server):
+    stand_in_server.add(
+        "POST",
+        "/v2.0/vehicles/vehicle-0/batch",
+        json_body={
+            "responses": [
+                {
+                    "path": "/odometer",
+                    "code": 200,
+                    "body": {"distance": 2},
+                    "headers": {},
+                }
+            ]
+        },
+    )
+
+    (result,) = smartcar.Fleet([("vehicle-0", TOKEN)]).run(["/odometer"])
+
+    assert result.result.odometer().distance == 2
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        smartcar.Fleet([]).run("_get")
+
+
+def test_async_run(stand_in_server):
+    pytest.importorskip("httpx")
+    _add_odometers(stand_in_server, failing=("vehicle-5",))
+    fleet = smartcar.Fleet([(vid, TOKEN) for vid in VEHICLE_IDS], max_concurrency=4)
+
+    async def collect():
+        return [result async for result in fleet.async_run("odometer")]
+
+    results = asyncio.run(collect())
+
+    assert len(results) == 10
+    assert fleet.progress().failed == 1
@@ -0,0 +1,306 @@
+import asyncio
+import threading
+
+import pytest
+
+import smartcar
+import smartcar.aio as aio
+import smartcar.pagination as pagination
+import smartcar.types as types
+
+TOKEN = "9ad942c6-32b8-4af2-ada6-5e8ecdbad9c2"
+AMT = "amt"
+
+
+def _vehicles_page(vehicles, count, offset):
+    return {
+        "vehicles": vehicles,
+        "paging": {"count": count, "offset": offset},
+    }
+
+
+def _offset_pages(items, limit):
+    """
+    Returns (callable): a fetch_page over `items`, recording the pagings
+    """
+    pagings = []
+
+    def fetch_page(paging):
+        pagings.append(paging)
+        offset = paging["offset"]
+        return types.Vehicles(
+            items[offset : offset + limit], types.Paging(len(items), offset), None
+        )
+
+    return fetch_page, pagings
+
+
+def test_iter_items_follows_offsets():
+    fetch_page, pagings = _offset_pages(list(range(7)), 3)
+
+    items = pagination.iter_items(
+        fetch_page,
+        lambda page: page.vehicles,
+        pagination.next_offset,
+        {"limit": 3, "offset": 0},
+        prefetch=False,
+    )
+
+    assert list(items) == list(range(7))
+    assert pagings == [
+        {"limit": 3, "offset": 0},
+        {"limit": 3, "offset": 3},
+        {"limit": 3, "offset": 6},
+    ]
+
+
+def test_iter_items_prefetches_the_next_page():
+    fetch_page, pagings = _offset_pages(list(range(6)), 2)
+    second_page_requested = threading.Event()
+
+    def fetch(paging):
+        page = fetch_page(paging)
+        if paging["offset"] == 2:
+            second_page_requested.set()
+        return page
+
+    items = pagination.iter_items(
+        fetch, lambda page: page.vehicles, pagination.next_offset, {"offset": 0}
+    )
+
+    assert next(items) == 0
+    # The second page is requested before the first one is consumed
+    assert second_page_requested.wait(5)
+    assert len(pagings) == 2
+    items.close()
+    assert len(pagings) == 2
+
+
+def test_iter_vehicles(stand_in_server):
+    stand_in_server.add(
+        "GET", "/v2.0/vehicles", json_body=_vehicles_page(["a", "b"], 3, 0)
+    )
+    stand_in_server.add("GET", "/v2.0/vehicles", json_body=_vehicles_page(["c"], 3, 2))
+
+    vehicles = list(smartcar.iter_vehicles(TOKEN, limit=2))
+
+    assert vehicles == ["a", "b", "c"]
+    offsets = [request["query"]["offset"] for request in stand_in_server.requests]
+    assert offsets == [["0"], ["2"]]
+
+
+def test_iter_connections_follows_cursors(stand_in_server):
+    path = "/v2.0/management/connections/"
+    connection = {"vehicleId": "v", "userId": "u", "connectedAt": "2024-01-01"}
+    stand_in_server.add(
+        "GET",
+        path,
+        json_body={"connections": [connection], "paging": {"cursor": "next"}},
+    )
+    stand_in_server.add(
+        "GET", path, json_body={"connections": [connection], "paging": {}}
+    )
+
+    connections = list(smartcar.iter_connections(AMT, {"user_id": "u"}, limit=1))
+
+    assert connections == [types.Connection("v", "u", "2024-01-01")] * 2
+    queries = [request["query"] for request in stand_in_server.requests]
+    assert queries == [
+        {"user_id": ["u"], "limit": ["1"]},
+        {"user_id": ["u"], "limit": ["1"], "cursor": ["next"]},
+    ]
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_async_iter_vehicles(stand_in_server, prefetch):
+    stand_in_server.add(
+        "GET", "/v2.0/vehicles", json_body=_vehicles_page(["a", "b"], 3, 0)
+    )
+    stand_in_server.add("GET", "/v2.0/vehicles", json_body=_vehicles_page(["c"], 3, 2))
+
+    async def read():
+        vehicles = aio.iter_vehicles(TOKEN, limit=2, prefetch=prefetch)
+        return [vehicle async for vehicle in vehicles]
+
+    assert asyncio.run(read()) == ["a", "b", "c"]
+
+
+def test_vehicle_iter_permissions(stand_in_server):
+    vid = "ada7207c-3c0a-4027-a47f-6215ce6f7b93"
+    path = f"/v2.0/vehicles/{vid}/permissions"
+    stand_in_server.add(
+        "GET",
+        path,
+        json_body={"permissions": ["read_vin"], "paging": {"count": 2, "offset": 0}},
+    )
+    stand_in_server.add(
+        "GET",
+        path,
+        json_body={
+            "permissions": ["read_odometer"],
+            "paging": {"count": 2, "offset": 1},
+        },
+    )
+    vehicle = smartcar.Vehicle(vid, TOKEN, options={"raw": True})
+
+    permissions = list(vehicle.iter_permissions(limit=1))
+
+    assert permissions == ["read_vin", "read_odometer"]
+
+
+def test_fetch_all_requests_remaining_pages_in_parallel():
+    fetch_page, pagings = _offset_pages(list(range(10)), 3)
+    running = []
+    overlapped = threading.Event()
+    lock = threading.Lock()
+
+    def fetch(paging):
+        with lock:
+            running.append(paging["offset"])
+            if len(running) > 1:
+                overlapped.set()
+        # Later pages wait for another page to be in flight
+        if paging["offset"]:
+            overlapped.wait(5)
+        try:
+            return fetch_page(paging)
+        finally:
+            with lock:
+                running.remove(paging["offset"])
+
+    first, items = pagination.fetch_all(
+        fetch, lambda page: page.vehicles, {"limit": 3, "offset": 0}
+    )
+
+    assert overlapped.is_set()
+    assert items == list(range(10))
+    assert first.paging == types.Paging(10, 0)
+    assert sorted(paging["offset"] for paging in pagings) == [0, 3, 6, 9]
+
+
+def test_get_vehicles_fetch_all(stand_in_server):
+    stand_in_server.add(
+        "GET", "/v2.0/vehicles", json_body=_vehicles_page(["a", "b"], 6, 0)
+    )
+    stand_in_server.add(
+        "GET", "/v2.0/vehicles", json_body=_vehicles_page(["c", "d"], 6, 2)
+    )
+
+    response = smartcar.get_vehicles(TOKEN, {"limit": 2}, fetch_all=True)
+
+    assert response.vehicles == ["a", "b", "c", "d", "c", "d"]
+    assert response.paging == types.Paging(6, 0)
+    offsets = sorted(
+        request["query"]["offset"][0] for request in stand_in_server.requests[1:]
+    )
+    assert offsets == ["2", "4"]
+
+
+def test_async_permissions_fetch_all(stand_in_server):
+    vid = "ada7207c-3c0a-4027-a47f-6215ce6f7b93"
+    path = f"/v2.0/vehicles/{vid}/permissions"
+    stand_in_server.add(
+        "GET",
+        path,
+        json_body={"permissions": ["read_vin"], "paging": {"count": 3, "offset": 0}},
+    )
+    stand_in_server.add(
+        "GET",
+        path,
+        json_body={
+            "permissions": ["read_odometer"],
+            "paging": {"count": 3, "offset": 1},
+        },
+    )
+
+    async def read():
+        vehicle = aio.AsyncVehicle(vid, TOKEN)
+        return await vehicle.permissions({"limit": 1}, fetch_all=True)
+
+    response = asyncio.run(read())
+
+    assert response.permissions == ["read_vin", "read_odometer", "read_odometer"]
+    assert len(stand_in_server.requests) == 3
+
+
+def test_fetch_all_max_concurrency():
+    fetch_page, pagings = _offset_pages(list(range(10)), 2)
+    running = []
+    most_running = []
+    lock = threading.Lock()
+
+    def fetch(paging):
+        with lock:
+            running.append(paging["offset"])
+            most_running.append(len(running))
+        try:
+            return fetch_page(paging)
+        finally:
+            with lock:
+                running.remove(paging["offset"])
+
+    first, items = pagination.fetch_all(
+        fetch, lambda page: page.vehicles, {"limit": 2, "offset": 0}, max_concurrency=1
+    )
+
+    assert items == list(range(10))
+    assert max(most_running) == 1
+    with pytest.raises(ValueError):
+        smartcar.get_vehicles(TOKEN, fetch_all=True, max_concurrency=0)
+
+
+def _capped_pages(items, cap):
+    """
+    Returns (callable): a fetch_page over `items` returning at most `cap` items
+    per page, whatever the requested limit
+    """
+    pagings = []
+
+    def fetch_page(paging):
+        pagings.append(paging)
+        offset = paging.get("offset", 0)
+        limit = min(paging.get("limit") or cap, cap)
+        return types.Vehicles(
+            items[offset : offset + limit], types.Paging(len(items), offset), None
+        )
+
+    return fetch_page, pagings
+
+
+def test_fetch_all_with_capped_page_size():
+    fetch_page, pagings = _capped_pages(list(range(200)), 50)
+
+    first, items = pagination.fetch_all(
+        fetch_page, lambda page: page.vehicles, {"limit": 100, "offset": 0}
+    )
+
+    assert items == list(range(200))
+    assert len(pagings) == 4
+
+
+def test_fetch_all_completes_short_pages():
+    fetch_page, pagings = _capped_pages(list(range(10)), 4)
+
+    def fetch(paging):
+        # The first page is not capped, the others are
+        if paging["offset"] == 0:
+            return types.Vehicles(list(range(6)), types.Paging(10, 0), None)
+        return fetch_page(paging)
+
+    async def read():
+        return await pagination.afetch_all(
+            _async(fetch), lambda page: page.vehicles, {"limit": 6, "offset": 0}
+        )
+
+    first, items = pagination.fetch_all(
+        fetch, lambda page: page.vehicles, {"limit": 6, "offset": 0}
+    )
+    assert items == list(range(10))
+    assert asyncio.run(read())[1] == list(range(10))
+
+
+def _async(fetch_page):
+    async def fetch(paging):
+        return fetch_page(paging)
+
+    return fetch
@@ -0,0 +1,169 @@
+import asyncio
+import time
+
+import pytest
+
+import smartcar
+import smartcar.ratelimit as ratelimit
+from smartcar.exception import SmartcarRateLimitException, SmartcarTimeoutException
+
+VID = "ada7207c-3c0a-4027-a47f-6215ce6f7b93"
+TOKEN = "9ad942c6-32b8-4af2-ada6-5e8ecdbad9c2"
+
+
+def test_bucket_refills_up_to_burst():
+    bucket = ratelimit.TokenBucket(rate=10, burst=2, adaptive=False)
+    now = bucket.updated
+
+    bucket.take()
+    bucket.take()
+    assert bucket.wait_time(now) == pytest.approx(0.1)
+    assert bucket.wait_time(now + 0.1) == 0
+    assert bucket.wait_time(now + 10) == 0
+    assert bucket.tokens == 2
+
+
+def test_rejection_pauses_and_slows_bucket():
+    bucket = ratelimit.TokenBucket(rate=4)
+    now = bucket.updated
+
+    bucket.reject(now, retry_after=3)
+    assert bucket.current_rate == 2
+    assert bucket.wait_time(now + 1) == pytest.approx(2)
+    assert bucket.wait_time(now + 3) == 0
+
+    for _ in range(10):
+        bucket.succeed()
+    assert bucket.current_rate == 4
+
+
+def test_limiter_counts_requests_against_every_key():
+    limiter = ratelimit.RateLimiter(vehicle_rate=1, app_rate=100, block=False)
+    first = (ratelimit.vehicle_key("a"), ratelimit.app_key("app"))
+    second = (ratelimit.vehicle_key("b"), ratelimit.app_key("app"))
+
+    assert limiter.try_acquire(first) == 0
+    assert limiter.try_acquire(second) == 0
+    assert limiter.try_acquire(first) > 0
+    assert 0 < limiter.wait_time(first) <= 1
+    assert limiter.wait_time([ratelimit.app_key("app")]) == 0
+
+
+def test_limiter_learns_from_rate_limit_errors():
+    limiter = ratelimit.RateLimiter(vehicle_rate=10, app_rate=10)
+    keys = (ratelimit.vehicle_key(VID), ratelimit.app_key())
+    error = smartcar.SmartcarException(
+        type="RATE_LIMIT", code="VEHICLE", description="d", retry_after="5"
+    )
+
+    limiter.record_rejection(keys, error)
+
+    assert limiter.wait_time(keys) == pytest.approx(5, abs=0.1)
+    assert limiter.wait_time([ratelimit.app_key()]) == 0
+
+
+def test_limiter_drops_idle_buckets():
+    limiter = ratelimit.RateLimiter(vehicle_rate=1000, max_buckets=3, block=False)
+
+    limiter.try_acquire([ratelimit.vehicle_key("busy")])
+    limiter.record_rejection(
+        [ratelimit.vehicle_key("busy")],
+        smartcar.SmartcarException(type="RATE_LIMIT", code="VEHICLE", description=""),
+    )
+    for vehicle_id in ("a", "b"):
+        limiter.try_acquire([ratelimit.vehicle_key(vehicle_id)])
+    time.sleep(0.01)
+
+    # The idle buckets are dropped, the slowed down one is kept
+    limiter.try_acquire([ratelimit.vehicle_key("d")])
+    assert list(limiter._buckets) == [
+        ratelimit.vehicle_key("busy"),
+        ratelimit.vehicle_key("d"),
+    ]
+
+
+def test_limiter_keeps_at_most_max_buckets():
+    limiter = ratelimit.RateLimiter(vehicle_rate=0.001, max_buckets=2, block=False)
+
+    for vehicle_id in ("a", "b", "c"):
+        limiter.try_acquire([ratelimit.vehicle_key(vehicle_id)])
+    limiter.try_acquire([ratelimit.vehicle_key("b")])
+
+    assert list(limiter._buckets) == [
+        ratelimit.vehicle_key("c"),
+        ratelimit.vehicle_key("b"),
+    ]
+
+
+def test_app_key_defaults_to_the_client_id(monkeypatch):
+    monkeypatch.setenv("SMARTCAR_CLIENT_ID", "client-id")
+
+    assert ratelimit.app_key() == ratelimit.app_key("client-id")
+    assert ratelimit.app_key("other") != ratelimit.app_key()
+
+
+def test_vehicle_requests_fail_fast(stand_in_server):
+    stand_in_server.add(
+        "GET", f"/v2.0/vehicles/{VID}/odometer", json_body={"distance": 1}
+    )
+    limiter = ratelimit.RateLimiter(vehicle_rate=0.5, block=False)
+    vehicle = smartcar.Vehicle(VID, TOKEN, {"rate_limiter": limiter})
+
+    vehicle.odometer()
+    with pytest.raises(SmartcarRateLimitException) as e:
+        vehicle.odometer()
+
+    assert e.value.type == "SDK_RATE_LIMIT"
+    assert 0 < e.value.retry_after <= 2
+    assert len(stand_in_server.requests) == 1
+
+
+def test_vehicle_requests_block(stand_in_server):
+    stand_in_server.add(
+        "GET", f"/v2.0/vehicles/{VID}/odometer", json_body={"distance": 1}
+    )
+    smartcar.set_rate_limiter(ratelimit.RateLimiter(vehicle_rate=10, vehicle_burst=1))
+
+    try:
+        start = time.monotonic()
+        for _ in range(3):
+            smartcar.Vehicle(VID, TOKEN).odometer()
+        elapsed = time.monotonic() - start
+    finally:
+        smartcar.set_rate_limiter(None)
+
+    assert elapsed >= 0.15
+    assert len(stand_in_server.requests) == 3
+
+
+def test_blocking_respects_deadline(stand_in_server):
+    stand_in_server.add(
+        "GET", f"/v2.0/vehicles/{VID}/odometer", json_body={"distance": 1}
+    )
+    limiter = ratelimit.RateLimiter(vehicle_rate=0.1)
+    vehicle = smartcar.Vehicle(VID, TOKEN, {"rate_limiter": limiter})
+
+    vehicle.odometer()
+    with pytest.raises(SmartcarTimeoutException):
+        with smartcar.deadline(1):
+            vehicle.odometer()
+
+
+def test_async_requests_block(stand_in_server):
+    pytest.importorskip("httpx")
+    stand_in_server.add(
+        "GET",
+        f"/v2.0/vehicles/{VID}/battery",
+        json_body={"percentRemaining": 1, "range": 1},
+    )
+    limiter = ratelimit.RateLimiter(vehicle_rate=10, vehicle_burst=1)
+
+    async def read():
+        vehicle = smartcar.AsyncVehicle(VID, TOKEN, {"rate_limiter": limiter})
+        await asyncio.gather(vehicle.battery(), vehicle.battery())
+
+    start = time.monotonic()
+    asyncio.run(read())
+
+    assert time.monotonic() - start >= 0.05
+    assert len(stand_in_server.requests) == 2
@@ -0,0 +1,180 @@
+import json
+
+import pytest
+
+import smartcar
+import smartcar.retry as retry
+import smartcar.transport as transport
+from smartcar.exception import SmartcarException
+
+VID = "ada7207c-3c0a-4027-a47f-6215ce6f7b93"
+TOKEN = "9ad942c6-32b8-4af2-ada6-5e8ecdbad9c2"
+
+
+def _error(status_code, error_type, code=None, **kwargs):
+    return SmartcarException(
+        status_code=status_code,
+        type=error_type,
+        code=code,
+        description="description",
+        **kwargs,
+    )
+
+
+def _error_body(status_code, error_type, code=None):
+    return {
+        "statusCode": status_code,
+        "type": error_type,
+        "code": code,
+        "description": "description",
+        "requestId": "stand-in-request-id",
+    }
+
+
+def test_default_policy_does_not_retry():
+    policy = retry.RetryPolicy()
+    assert policy.next_delay(_error(500, "SERVER", "INTERNAL"), "GET", 0) is None
+
+
+def test_retryable_types_and_codes():
+    policy = retry.RetryPolicy(max_attempts=3, jitter=False)
+
+    assert policy.next_delay(_error(500, "SERVER", "INTERNAL"), "GET", 0) == 0.5
+    assert policy.next_delay(_error(502, "UPSTREAM", "RATE_LIMIT"), "GET", 1) == 1.0
+    assert policy.next_delay(_error(409, "VEHICLE_STATE", "ASLEEP"), "GET", 0) is None
+    assert policy.next_delay(_error(401, "AUTHENTICATION"), "GET", 0) is None
+    assert policy.next_delay(_error(500, "SERVER"), "GET", 2) is None
+
+
+def test_retry_after_takes_precedence():
+    policy = retry.RetryPolicy(max_attempts=2, max_retry_after=10)
+
+    assert policy.next_delay(_error(429, "RATE_LIMIT", retry_after="3"), "GET", 0) == 3
+    assert (
+        policy.next_delay(_error(429, "RATE_LIMIT", retry_after="30"), "GET", 0) is None
+    )
+
+
+def test_backoff_is_capped_and_jittered():
+    policy = retry.RetryPolicy(max_attempts=10, backoff_base=1, backoff_max=4)
+
+    for _ in range(20):
+        assert 0 <= policy.next_delay(_error(503, "SERVER"), "GET", 5) <= 4
+
+
+def test_non_idempotent_requests_only_retry_rejections():
+    policy = retry.RetryPolicy(max_attempts=2, jitter=False)
+
+    assert policy.next_delay(_error(500, "SERVER"), "POST", 0) is None
+    assert policy.next_delay(_error(429, "RATE_LIMIT", "VEHICLE"), "POST", 0) == 0.5
+    assert policy.next_delay(_error(500, "SERVER"), "POST", 0, idempotent=True) == 0.5
+
+
+def test_connection_errors_are_retried_when_idempotent():
+    policy = retry.RetryPolicy(max_attempts=2, jitter=False)
+    try:
+        try:
+            raise ConnectionError("reset")
+        except ConnectionError as cause:
+            raise SmartcarException(message="SDK_ERROR") from cause
+    except SmartcarException as e:
+        error = e
+
+    assert policy.next_delay(error, "GET", 0) == 0.5
+    assert policy.next_delay(error, "POST", 0) is None
+
+
+def test_other_transport_errors_are_not_retried(stand_in_server):
+    class BrokenTransport(smartcar.Transport):
+        def __init__(self):
+            self.calls = 0
+
+        def send(self, *args, **kwargs):
+            self.calls += 1
+            raise TypeError("broken")
+
+    broken = BrokenTransport()
+    previous = smartcar.get_transport()
+    smartcar.set_transport(broken)
+    try:
+        vehicle = smartcar.Vehicle(
+            VID, TOKEN, {"retry_policy": retry.RetryPolicy(max_attempts=4)}
+        )
+        with pytest.raises(SmartcarException):
+            vehicle.odometer()
+    finally:
+        smartcar.set_transport(previous)
+
+    assert broken.calls == 1
+
+
+def test_refused_connections_raise_connection_errors():
+    backend = smartcar.RequestsTransport()
+    with pytest.raises(transport.TransportConnectionError):
+        # Nothing listens on port 9 of localhost
+        backend.send("GET", "http://127.0.0.1:9/", timeout=1)
+
+
+def test_parse_retry_after():
+    assert retry.parse_retry_after(None) is None
+    assert retry.parse_retry_after(5) == 5
+    assert retry.parse_retry_after("1.5") == 1.5
+    assert retry.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert retry.parse_retry_after("soon") is None
+
+
+def test_requester_retries_and_reports_retry_count(stand_in_server):
+    path = f"/v2.0/vehicles/{VID}/odometer"
+    stand_in_server.add(
+        "GET",
+        path,
+        status=429,
+        json_body=_error_body(429, "RATE_LIMIT", "VEHICLE"),
+        headers={"Retry-After": "0"},
+    )
+    stand_in_server.add("GET", path, json_body={"distance": 10})
+    vehicle = smartcar.Vehicle(
+        VID, TOKEN, {"retry_policy": retry.RetryPolicy(max_attempts=3)}
+    )
+
+    odometer = vehicle.odometer()
+
+    assert odometer.distance == 10
+    assert odometer.meta.retry_count == 1
+    assert len(stand_in_server.requests) == 2
+
+
+def test_actions_are_not_retried_after_server_errors(stand_in_server):
+    stand_in_server.add(
+        "POST",
+        f"/v2.0/vehicles/{VID}/security",
+        status=500,
+        json_body=_error_body(500, "SERVER", "INTERNAL"),
+    )
+    vehicle = smartcar.Vehicle(
+        VID, TOKEN, {"retry_policy": retry.RetryPolicy(max_attempts=3, backoff_base=0)}
+    )
+
+    with pytest.raises(SmartcarException) as e:
+        vehicle.lock()
+
+    assert e.value.retry_count == 0
+    assert len(stand_in_server.requests) == 1
+    assert json.loads(stand_in_server.requests[0]["body"]) == {"action": "LOCK"}
+
+
+def test_batch_is_retried_as_idempotent(stand_in_server):
+    path = f"/v2.0/vehicles/{VID}/batch"
+    stand_in_server.add(
+        "POST", path, status=503, json_body=_error_body(503, "SERVER", "INTERNAL")
+    )
+    stand_in_server.add("POST", path, json_body={"responses": []})
+    previous = retry.get_retry_policy()
+    retry.set_retry_policy(retry.RetryPolicy(max_attempts=2, backoff_base=0))
+
+    try:
+        batch = smartcar.Vehicle(VID, TOKEN).batch([])
+    finally:
+        retry.set_retry_policy(previous)
+
+    assert batch.meta.retry_count == 1
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import responses
+
+import smartcar.helpers as helpers
+import smartcar.session as session
+
+
+def test_session_is_reused():
+    manager = session.SessionManager()
+    first = manager._acquire()
+    manager._release()
+    second = manager._acquire()
+    manager._release()
+
+    assert first is second
+
+
+def test_session_pool_configuration():
+    manager = session.SessionManager(pool_connections=4, pool_maxsize=32)
+    adapter = manager._acquire().get_adapter("https://api.smartcar.com")
+    manager._release()
+
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 32
+    assert adapter.max_retries.total == 0
+
+
+def test_idle_session_is_evicted():
+    manager = session.SessionManager(max_idle=0)
+    first = manager._acquire()
+    manager._release()
+    manager._last_used -= 1
+    second = manager._acquire()
+    manager._release()
+
+    assert first is not second
+
+
+def test_session_in_use_is_not_evicted():
+    manager = session.SessionManager(max_idle=0)
+    first = manager._acquire()
+    manager._last_used -= 1
+    second = manager._acquire()
+    manager._release()
+    manager._release()
+
+    assert first is second
+
+
+def test_keep_alive_disabled():
+    manager = session.SessionManager(keep_alive=False)
+    assert manager._acquire().headers["Connection"] == "close"
+    manager._release()
+
+
+@responses.activate
+def test_requester_uses_shared_session():
+    url = "https://api.smartcar.com/v2.0/user"
+    responses.add(
+        responses.GET,
+        url,
+        json={"id": "user-id"},
+        headers={"Set-Cookie": "name=value"},
+    )
+    manager = session.configure_session(pool_maxsize=2)
+
+    helpers.requester("GET", url)
+    helpers.requester("GET", url)
+
+    assert session.get_session_manager() is manager
+    assert len(responses.calls) == 2
+    assert len(manager._session.cookies) == 0
+    assert "Cookie" not in responses.calls[1].request.headers
+
+
+def test_configure_session_during_request(stand_in_server):
+    stand_in_server.add("GET", "/slow", json_body={}, delay=0.3)
+    url = f"{stand_in_server.url}/slow"
+    previous = session.configure_session()
+    results = []
+
+    thread = threading.Thread(
+        target=lambda: results.append(helpers.requester("GET", url))
+    )
+    thread.start()
+    while previous._in_flight == 0:
+        time.sleep(0.01)
+    current = session.configure_session()
+
+    # The request in flight completes on the previous session, which is
+    # closed afterwards
+    assert previous._session is not None
+    thread.join()
+    assert results[0].status_code == 200
+    assert previous._session is None
+    assert session.get_session_manager() is current
@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+import pytest
+
+import smartcar
+import smartcar.aio as aio
+import smartcar.timeouts as timeouts
+from smartcar.exception import SmartcarTimeoutException
+
+VID = "ada7207c-3c0a-4027-a47f-6215ce6f7b93"
+TOKEN = "9ad942c6-32b8-4af2-ada6-5e8ecdbad9c2"
+
+
+def test_timeout_resolution():
+    vehicle = smartcar.Vehicle(
+        VID, TOKEN, {"timeout": 30, "endpoint_timeouts": {"location": (2, 5)}}
+    )
+
+    assert vehicle._timeout_for("location") == (2, 5)
+    assert vehicle._timeout_for("odometer") == 30
+    assert timeouts.attempt_timeout((2, 5)) == timeouts.Timeout(2, 5)
+    assert timeouts.attempt_timeout() == timeouts.get_default_timeout()
+
+
+def test_deadline_caps_attempt_timeouts():
+    with timeouts.deadline(10):
+        capped = timeouts.attempt_timeout(60)
+        with timeouts.deadline(100):
+            nested = timeouts.attempt_timeout(60)
+
+    assert capped.connect <= 10 and capped.read <= 10
+    assert nested.read <= 10
+    assert timeouts.remaining() is None
+
+
+def test_read_timeout(stand_in_server):
+    stand_in_server.add(
+        "GET", f"/v2.0/vehicles/{VID}/location", json_body={}, delay=0.5
+    )
+    vehicle = smartcar.Vehicle(
+        VID, TOKEN, {"endpoint_timeouts": {"location": (1, 0.1)}}
+    )
+
+    with pytest.raises(SmartcarTimeoutException) as e:
+        vehicle.location()
+
+    assert e.value.type == "SDK_TIMEOUT"
+    assert e.value.code == "READ_TIMEOUT"
+
+
+def test_deadline_exceeded_during_request(stand_in_server):
+    stand_in_server.add(
+        "GET", f"/v2.0/vehicles/{VID}/odometer", json_body={}, delay=0.5
+    )
+
+    with pytest.raises(SmartcarTimeoutException) as e:
+        with smartcar.deadline(0.1):
+            smartcar.Vehicle(VID, TOKEN).odometer()
+
+    assert e.value.code == "DEADLINE_EXCEEDED"
+
+
+def test_deadline_spans_retries(stand_in_server):
+    stand_in_server.add(
+        "GET",
+        f"/v2.0/vehicles/{VID}/odometer",
+        status=503,
+        json_body={
+            "statusCode": 503,
+            "type": "SERVER",
+            "code": "INTERNAL",
+            "description": "description",
+        },
+    )
+    policy = smartcar.RetryPolicy(max_attempts=100, backoff_base=0.05, jitter=False)
+    vehicle = smartcar.Vehicle(VID, TOKEN, {"retry_policy": policy})
+
+    start = time.monotonic()
+    with pytest.raises(SmartcarTimeoutException) as e:
+        with smartcar.deadline(0.3):
+            vehicle.odometer()
+
+    assert e.value.code == "DEADLINE_EXCEEDED"
+    assert e.value.retry_count >= 1
+    assert time.monotonic() - start < 0.3
+
+
+def test_async_deadline(stand_in_server):
+    pytest.importorskip("httpx")
+    stand_in_server.add("GET", f"/v2.0/vehicles/{VID}/battery", json_body={}, delay=0.5)
+
+    async def read():
+        with smartcar.deadline(0.1):
+            return await aio.AsyncVehicle(VID, TOKEN).battery()
+
+    with pytest.raises(SmartcarTimeoutException) as e:
+        asyncio.run(read())
+
+    assert e.value.code == "DEADLINE_EXCEEDED"
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+import smartcar
+import smartcar.aio as aio
+import smartcar.types as types
+
+VID = "ada7207c-3c0a-4027-a47f-6215ce6f7b93"
+
+
+def _access(token, expires_in):
+    expiration = datetime.utcnow() + timedelta(seconds=expires_in)
+    return types.Access(
+        token, "Bearer", expires_in, expiration, f"refresh-{token}", None
+    )
+
+
+class StubAuthClient(object):
+    def __init__(self):
+        self.refresh_tokens = []
+        self._lock = threading.Lock()
+
+    def exchange_refresh_token(self, refresh_token, options=None):
+        with self._lock:
+            self.refresh_tokens.append(refresh_token)
+            count = len(self.refresh_tokens)
+        time.sleep(0.05)
+        return _access(f"token-{count}", 7200)
+
+
+class StubAsyncAuthClient(object):
+    def __init__(self):
+        self.refresh_tokens = []
+
+    async def exchange_refresh_token(self, refresh_token, options=None):
+        self.refresh_tokens.append(refresh_token)
+        await asyncio.sleep(0.05)
+        return _access(f"token-{len(self.refresh_tokens)}", 7200)
+
+
+def test_valid_tokens_are_not_refreshed():
+    client = StubAuthClient()
+    manager = smartcar.TokenManager(client)
+    manager.set("user", _access("token-0", 3600))
+
+    assert manager.access_token("user") == "token-0"
+    assert client.refresh_tokens == []
+    with pytest.raises(KeyError):
+        manager.access_token("other")
+
+
+def test_concurrent_refreshes_collapse():
+    client = StubAuthClient()
+    refreshed = []
+    manager = smartcar.TokenManager(
+        client, on_refresh=lambda key, access: refreshed.append(key)
+    )
+    # Expires within the refresh margin
+    manager.set("user", _access("token-0", 60))
+
+    with ThreadPoolExecutor(8) as executor:
+        tokens = list(executor.map(manager.access_token, ["user"] * 8))
+
+    assert tokens == ["token-1"] * 8
+    assert client.refresh_tokens == ["refresh-token-0"]
+    assert refreshed == ["user"]
+
+    assert manager.refresh("user").access_token == "token-2"
+
+
+def test_async_concurrent_refreshes_collapse():
+    client = StubAsyncAuthClient()
+    manager = smartcar.TokenManager(client)
+    manager.set("user", _access("token-0", 60))
+
+    async def read():
+        return await asyncio.gather(
+            *(manager.async_access_token("user") for _ in range(5))
+        )
+
+    assert asyncio.run(read()) == ["token-1"] * 5
+    assert client.refresh_tokens == ["refresh-token-0"]
+
+    # The synchronous methods need a synchronous AuthClient
+    manager.set("user", _access("token-0", 60))
+    with pytest.raises(TypeError):
+        manager.access_token("user")
+
+
+def test_threads_and_event_loops_share_one_refresh():
+    client = StubAuthClient()
+    manager = smartcar.TokenManager(client)
+    manager.set("user", _access("token-0", 60))
+
+    async def read():
+        return await manager.async_access_token("user")
+
+    # Two threads with their own event loop and two blocking threads
+    readers = [lambda: asyncio.run(read())] * 2 + [
+        lambda: manager.access_token("user")
+    ] * 2
+    with ThreadPoolExecutor(4) as executor:
+        tokens = list(executor.map(lambda reader: reader(), readers))
+
+    assert tokens == ["token-1"] * 4
+    assert client.refresh_tokens == ["refresh-token-0"]
+    assert manager._tasks == {}
+
+
+def test_vehicle_takes_a_token_manager(stand_in_server):
+    stand_in_server.add(
+        "GET", f"/v2.0/vehicles/{VID}/odometer", json_body={"distance": 1}
+    )
+    manager = smartcar.TokenManager(StubAuthClient())
+    manager.set("user", _access("token-0", 60))
+    vehicle = smartcar.Vehicle(VID, manager, options={"token_key": "user"})
+    key = vehicle._request_key("GET", "odometer")
+
+    vehicle.odometer()
+
+    request = stand_in_server.requests[0]
+    assert request["headers"]["Authorization"] == "Bearer token-1"
+    assert vehicle.access_token == "token-1"
+    # Refreshes keep the identity of the requests, for caching and coalescing
+    manager.refresh("user")
+    assert vehicle._request_key("GET", "odometer") == key
+
+
+def test_async_vehicle_refreshes_on_the_event_loop(stand_in_server):
+    stand_in_server.add(
+        "GET", f"/v2.0/vehicles/{VID}/odometer", json_body={"distance": 1}
+    )
+    client = StubAsyncAuthClient()
+    manager = smartcar.TokenManager(client)
+    manager.set(VID, _access("token-0", 60))
+
+    async def read():
+        vehicle = aio.AsyncVehicle(VID, manager)
+        return await vehicle.odometer()
+
+    assert asyncio.run(read()).distance == 1
+    request = stand_in_server.requests[0]
+    assert request["headers"]["Authorization"] == "Bearer token-1"
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import sys
+
+import pytest
+
+import smartcar
+import smartcar.transport as transport
+from smartcar.exception import SmartcarException
+
+# Conformance suite: every transport must behave identically against the
+# local stand-in server.
+
+
+def _requests_transport():
+    return transport.RequestsTransport()
+
+
+def _httpx_transport():
+    pytest.importorskip("httpx")
+    return transport.HttpxTransport()
+
+
+@pytest.fixture(params=[_requests_transport, _httpx_transport])
+def backend(request):
+    backend = request.param()
+    previous = transport.get_transport()
+    transport.set_transport(backend)
+    yield backend
+    transport.set_transport(previous)
+    backend.close()
+
+
+def test_send_returns_status_headers_and_body(stand_in_server, backend):
+    stand_in_server.add(
+        "GET", "/echo", json_body={"ok": True}, headers={"sc-unit-system": "metric"}
+    )
+
+    response = backend.send(
+        "GET",
+        f"{stand_in_server.url}/echo",
+        headers={"X-Test": "1"},
+        params={"a": "b", "skipped": None},
+        timeout=5,
+    )
+
+    assert response.status_code == 200
+    assert response.ok
+    assert response.headers["SC-Unit-System"] == "metric"
+    assert response.json() == {"ok": True}
+    assert json.loads(response.text) == {"ok": True}
+    assert stand_in_server.requests[0]["query"] == {"a": ["b"]}
+    assert stand_in_server.requests[0]["headers"]["X-Test"] == "1"
+
+
+def test_send_json_form_and_basic_auth(stand_in_server, backend):
+    stand_in_server.add("POST", "/json", json_body={})
+    stand_in_server.add("POST", "/form", json_body={})
+
+    backend.send("POST", f"{stand_in_server.url}/json", json={"action": "LOCK"})
+    backend.send(
+        "POST",
+        f"{stand_in_server.url}/form",
+        data={"grant_type": "refresh_token"},
+        auth=("id", "secret"),
+        timeout=(1, 5),
+    )
+
+    json_request, form_request = stand_in_server.requests
+    assert json.loads(json_request["body"]) == {"action": "LOCK"}
+    assert "application/json" in json_request["headers"]["Content-Type"]
+    assert form_request["body"] == b"grant_type=refresh_token"
+    assert form_request["headers"]["Authorization"] == "Basic aWQ6c2VjcmV0"
+
+
+def test_send_does_not_raise_on_error_status(stand_in_server, backend):
+    stand_in_server.add("GET", "/missing", status=404, body="nope")
+
+    response = backend.send("GET", f"{stand_in_server.url}/missing")
+
+    assert response.status_code == 404
+    assert not response.ok
+    assert response.text == "nope"
+
+
+def test_requester_success_through_transport(stand_in_server, backend):
+    stand_in_server.add("GET", "/v2.0/user", json_body={"id": "user-id"})
+
+    user = smartcar.get_user("token")
+
+    assert user.id == "user-id"
+    assert user.meta.request_id == "stand-in-request-id"
+    assert stand_in_server.requests[0]["headers"]["Authorization"] == "Bearer token"
+    assert stand_in_server.requests[0]["headers"]["User-Agent"].startswith("Smartcar/")
+
+
+def test_requester_error_through_transport(stand_in_server, backend):
+    stand_in_server.add(
+        "GET",
+        "/v2.0/user",
+        status=401,
+        json_body={
+            "statusCode": 401,
+            "type": "AUTHENTICATION",
+            "code": None,
+            "description": "The provided token is invalid.",
+            "requestId": "stand-in-request-id",
+        },
+    )
+
+    with pytest.raises(SmartcarException) as e:
+        smartcar.get_user("bad-token")
+
+    assert e.value.status_code == 401
+    assert e.value.type == "AUTHENTICATION"
+
+
+def test_set_transport_rejects_non_transports():
+    with pytest.raises(TypeError):
+        transport.set_transport(object())
+
+
+def test_httpx_falls_back_to_http1_without_h2(monkeypatch):
+    pytest.importorskip("httpx")
+    monkeypatch.setitem(sys.modules, "h2", None)
+
+    backend = transport.HttpxTransport()
+    assert backend._client._transport._pool._http2 is False
+    backend.close()
+    with pytest.raises(ImportError):
+        transport.HttpxTransport(http2=True)
+
+
+def test_default_async_transport_requires_httpx(monkeypatch):
+    monkeypatch.setitem(sys.modules, "httpx", None)
+
+    async def request():
+        return await smartcar.helpers.async_requester("GET", "http://127.0.0.1:9")
+
+    with pytest.raises(ImportError, match="set_async_transport"):
+        asyncio.run(request())
+    assert transport._default_async_transports == {}
+
+
+def test_default_async_transports_are_closed_with_their_loop():
+    pytest.importorskip("httpx")
+
+    async def open_transport():
+        return transport.get_async_transport()
+
+    backend = asyncio.run(open_transport())
+
+    assert backend._client.is_closed
+    assert transport._default_async_transports == {}
+
+
+def test_aclose_default_transports():
+    pytest.importorskip("httpx")
+
+    async def reopen():
+        first = transport.get_async_transport()
+        await smartcar.aclose_default_transports()
+        return first, transport.get_async_transport()
+
+    first, second = asyncio.run(reopen())
+
+    assert first is not second
+    assert first._client.is_closed and second._client.is_closed
@@ -1,4 +1,10 @@
+import datetime
+import pickle
+
+import pytest
+
 import smartcar.types as types
+from smartcar.exception import SmartcarException
 import requests.structures as rs
 
 
@@ -51,3 +57,172 @@ def test_build_meta():
     assert meta.fetched_at == "2023-05-04T07:20:51.844Z"
 
     assert not hasattr(meta, "content_type")
+
+
+def test_meta_holds_the_smartcar_headers():
+    headers = rs.CaseInsensitiveDict(
+        {
+            "sc-request-id": "abc",
+            "sc-fetched-at": "2023-05-04T07:20:51.844Z",
+            "content-type": "application/json",
+        }
+    )
+
+    meta = types.build_meta(headers, 2)
+
+    assert isinstance(meta, tuple) and isinstance(meta, types.Meta)
+    assert meta == ("abc", "2023-05-04T07:20:51.844Z", 2)
+    request_id, fetched_at, retry_count = meta
+    assert meta[0] == request_id == "abc"
+    assert meta._fields == ("request_id", "fetched_at", "retry_count")
+    assert not hasattr(meta, "data_age") and meta.data_age_datetime is None
+    assert meta.fetched_at_datetime == datetime.datetime(
+        2023, 5, 4, 7, 20, 51, 844000, tzinfo=datetime.timezone.utc
+    )
+    assert type(types.build_meta(headers, 3)) is type(meta)
+    assert pickle.loads(pickle.dumps(meta)) == meta
+    assert pickle.loads(pickle.dumps(meta)).fetched_at_datetime is not None
+    assert types.build_meta(rs.CaseInsensitiveDict()) is None
+    with pytest.raises(AttributeError):
+        meta.color = "red"
+
+
+def test_generate_named_tuple_reuses_classes():
+    first = types.generate_named_tuple({"distance": 1, "unitSystem": "metric"}, "Data")
+    second = types.generate_named_tuple({"distance": 2, "unitSystem": "metric"}, "Data")
+    other = types.generate_named_tuple({"distance": 1}, "Data")
+
+    assert type(first) is type(second)
+    assert type(first) is not type(other)
+    assert first == (1, "metric")
+    assert pickle.loads(pickle.dumps(first)) == first
+    assert pickle.loads(pickle.dumps(first))._fields == ("distance", "unit_system")
+
+
+def test_camel_to_snake():
+    assert types._camel_to_snake("distance") == "distance"
+    assert types._camel_to_snake("percentRemaining") == "percent_remaining"
+    assert types._camel_to_snake("tire2Pressure") == "tire_2_pressure"
+    assert types._camel_to_snake("VIN") == "vin"
+    assert types._camel_to_snake("already_snake") == "already_snake"
+
+
+def test_decoder_registry():
+    Ammeter = types.NamedTuple("Ammeter", [("amps", float), ("meta", tuple)])
+    types.register_decoder("/brand/ammeter", types.field_decoder(Ammeter, "amps"))
+
+    result = types.select_named_tuple(
+        "brand/ammeter", {"headers": {}, "body": {"amps": 32.0}}
+    )
+
+    assert type(result) == Ammeter
+    assert result.amps == 32.0
+    assert types.request_path("brand/ammeter?unit=a") == "brand/ammeter"
+    assert types.request_path("battery") == "request"
+    with pytest.raises(ValueError):
+        types.register_decoder("battery", types.field_decoder(Ammeter, "amps"))
+
+
+def _batch_result():
+    return types.BatchResult(
+        [
+            {
+                "path": "/odometer",
+                "code": 200,
+                "body": {"distance": 10},
+                "headers": {"sc-unit-system": "metric"},
+            },
+            {
+                "path": "/engine/oil",
+                "code": 409,
+                "body": {
+                    "type": "VEHICLE_STATE",
+                    "code": "ASLEEP",
+                    "description": "The vehicle is asleep.",
+                    "statusCode": 409,
+                },
+                "headers": {},
+            },
+        ],
+        rs.CaseInsensitiveDict({"SC-Request-Id": "batch-id"}),
+    )
+
+
+def test_batch_result_access():
+    result = _batch_result()
+
+    assert result._fields == ("odometer", "engine_oil", "meta")
+    assert result.meta.request_id == "batch-id"
+    assert result.odometer().distance == 10
+    assert result.odometer().meta.request_id == "batch-id"
+    assert result["/odometer"] is result["odometer"]
+    assert "/engine/oil" in result and "/location" not in result
+    with pytest.raises(SmartcarException) as e:
+        result["/engine/oil"]
+    assert e.value.code == "ASLEEP"
+    with pytest.raises(KeyError):
+        result["/location"]
+    with pytest.raises(AttributeError):
+        result.location
+
+
+def test_batch_result_decodes_on_first_read(monkeypatch):
+    calls = []
+    decode = types.decode_batch_response
+    monkeypatch.setattr(
+        types,
+        "decode_batch_response",
+        lambda *args: calls.append(args[0]) or decode(*args),
+    )
+    result = _batch_result()
+    assert calls == []
+
+    result.odometer()
+    result.odometer()
+    assert calls == ["odometer"]
+
+    outcomes = [(path, ok, type(value).__name__) for path, ok, value in result]
+    assert outcomes == [
+        ("/odometer", True, "Odometer"),
+        ("/engine/oil", False, "VehicleStateError"),
+    ]
+    assert calls == ["odometer", "engine/oil"]
+
+
+def test_service_history_records_are_decoded_lazily():
+    items = [
+        {
+            "serviceId": "s-1",
+            "serviceDate": "2023-06-01T00:00:00.000Z",
+            "odometerDistance": 15000,
+            "serviceTasks": [{"taskId": "t-1", "taskDescription": "Oil change"}],
+            "serviceDetails": [{"type": "dealer", "value": "Main St"}],
+            "serviceCost": {"totalCost": 89.5, "currency": "USD"},
+        },
+        {"serviceDate": "2024-01-15", "odometerDistance": 21000},
+    ]
+    history = types.select_named_tuple(
+        "service/history", {"headers": {}, "body": items}
+    )
+
+    assert len(history.items) == 2
+    assert history.items._records == [None, None]
+
+    first = history.items[0]
+    assert first is history.items[0]
+    assert first["odometerDistance"] == 15000
+    assert first.service_id == "s-1"
+    assert first.service_date == datetime.datetime(
+        2023, 6, 1, tzinfo=datetime.timezone.utc
+    )
+    assert first.service_tasks == [types.ServiceTask("t-1", "Oil change")]
+    assert first.service_details == [types.ServiceDetail("dealer", "Main St")]
+    assert first.service_cost == types.ServiceCost(89.5, "USD")
+    assert history.items._records[1] is None
+
+    second = history.items[1]
+    assert second.service_id is None
+    assert second.service_date.date() == datetime.date(2024, 1, 15)
+    assert second.service_tasks == []
+    assert second.service_cost == types.ServiceCost(None, None)
+    assert [r.odometer_distance for r in history.items[::-1]] == [21000, 15000]
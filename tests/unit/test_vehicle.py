@@ -1,4 +1,5 @@
 from smartcar import Vehicle
+from smartcar.types import BatchResult
 from smartcar.exception import SmartcarException
 
 
@@ -78,11 +79,8 @@ def test_batch_path_response():
         "headers": {"Retry-After": 999},
     }
 
-    top_response = {
-        "responses": [path_response],
-        "headers": {"Content-Type": "application/json"},
-    }
-    resulting_lambda = Vehicle._batch_path_response(path, path_response, top_response)
+    batch = BatchResult([path_response], {"Content-Type": "application/json"})
+    resulting_lambda = getattr(batch, path)
 
     try:
         resulting_lambda()
@@ -105,3 +103,64 @@ def test_batch_path_response():
         == "Your vehicle is temporarily unable to connect to Optiwatt. Please be patient while we’re working to resolve this issue."
     )
     assert path_exception.retry_after == 999
+
+
+def test_raw_getter_returns_the_undecoded_body(stand_in_server):
+    vid = "ada7207c-3c0a-4027-a47f-6215ce6f7b93"
+    token = "9ad942c6-32b8-4af2-ada6-5e8ecdbad9c2"
+    stand_in_server.add(
+        "GET",
+        f"/v2.0/vehicles/{vid}/odometer",
+        body='{"distance": 104.32}',
+        headers={"Content-Type": "application/json", "SC-Request-Id": "abc"},
+    )
+    vehicle = Vehicle(vid, token)
+
+    response = vehicle.odometer(raw=True)
+
+    assert isinstance(response.body, memoryview)
+    assert bytes(response.body) == b'{"distance": 104.32}'
+    assert response.status_code == 200
+    assert response.meta.request_id == "abc"
+    assert response.meta.retry_count == 0
+
+
+def test_raw_option_applies_to_batch_and_request(stand_in_server):
+    vid = "ada7207c-3c0a-4027-a47f-6215ce6f7b93"
+    token = "9ad942c6-32b8-4af2-ada6-5e8ecdbad9c2"
+    batch_body = '{"responses": []}'
+    stand_in_server.add("POST", f"/v2.0/vehicles/{vid}/batch", body=batch_body)
+    stand_in_server.add(
+        "GET", f"/v2.0/vehicles/{vid}/tesla/speedometer", json_body={"speed": 1}
+    )
+    vehicle = Vehicle(vid, token, options={"raw": True})
+
+    assert bytes(vehicle.batch(["/odometer"]).body) == batch_body.encode()
+    assert bytes(vehicle.request("GET", "tesla/speedometer").body) == b'{"speed": 1}'
+    assert vehicle.request("GET", "tesla/speedometer", raw=False).body == {"speed": 1}
+
+
+def test_iter_service_history_requests_one_window_at_a_time(stand_in_server):
+    vid = "ada7207c-3c0a-4027-a47f-6215ce6f7b93"
+    token = "9ad942c6-32b8-4af2-ada6-5e8ecdbad9c2"
+    path = f"/v2.0/vehicles/{vid}/service/history"
+    stand_in_server.add("GET", path, json_body=[{"serviceId": "a"}])
+    stand_in_server.add("GET", path, json_body=[])
+    stand_in_server.add("GET", path, json_body=[{"serviceId": "b"}])
+    vehicle = Vehicle(vid, token)
+
+    records = vehicle.iter_service_history("2023-01-01", "2023-01-25", window_days=10)
+    assert stand_in_server.requests == []
+    assert next(records).service_id == "a"
+    assert len(stand_in_server.requests) == 1
+    assert [record.service_id for record in records] == ["b"]
+
+    windows = [
+        (request["query"]["startDate"][0], request["query"]["endDate"][0])
+        for request in stand_in_server.requests
+    ]
+    assert windows == [
+        ("2023-01-01", "2023-01-10"),
+        ("2023-01-11", "2023-01-20"),
+        ("2023-01-21", "2023-01-25"),
+    ]